@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Throughput and accuracy of bulk answer grading
+
+Builds a synthetic database and grades batches of (clue_id, response)
+pairs with grade_responses(), which reads the normalized answers stored
+at insert time. Responses come in four kinds, in equal numbers:
+
+    question    "What is <answer>?"
+    case        the answer upper-cased
+    typo        one letter of the answer's longest word changed
+    wrong       the answer of another clue
+
+For comparison, the same pairs are graded the way it works without the
+index: load the raw answers, parse every one into its aliases, then grade.
+Accuracy is the share of pairs whose verdict matches their kind (wrong
+responses rejected, everything else accepted).
+
+Usage:
+    python benchmarks/answer_grading.py
+    python benchmarks/answer_grading.py --clues 500000 --pairs 1000,10000,100000,1000000
+"""
+
+import argparse
+import io
+import json
+import random
+import string
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import build_database
+from scraper.answers import aliases, grade, normalize
+
+KINDS = ('question', 'case', 'typo', 'wrong')
+
+
+def typo(answer: str, rng: random.Random) -> str:
+    """The answer with one letter of its longest word replaced"""
+    word = max(answer.split(), key=len)
+    position = rng.randrange(len(word))
+    letter = rng.choice([char for char in string.ascii_lowercase if char != word[position].lower()])
+    return answer.replace(word, word[:position] + letter + word[position + 1:], 1)
+
+
+def make_pairs(answers: List[Tuple[int, str]], count: int, rng: random.Random) -> List[Tuple[int, str, str]]:
+    """(clue_id, response, kind) tuples"""
+    pairs = []
+    for index in range(count):
+        clue_id, answer = rng.choice(answers)
+        kind = KINDS[index % len(KINDS)]
+        if kind == 'question':
+            response = f"What is {answer}?"
+        elif kind == 'case':
+            response = answer.upper()
+        elif kind == 'typo':
+            response = typo(answer, rng)
+        else:
+            response = rng.choice(answers)[1]
+        pairs.append((clue_id, response, kind))
+    return pairs
+
+
+def grade_without_index(db, pairs: List[Tuple[int, str]]):
+    """Grade by parsing the raw answers on every call"""
+    clue_ids = json.dumps(sorted({clue_id for clue_id, _ in pairs}))
+    answer_of = dict(db.conn.execute(
+        "SELECT id, answer FROM clues WHERE id IN (SELECT value FROM json_each(?))", (clue_ids,)
+    ).fetchall())
+    return [grade(clue_id, normalize(response), aliases(answer_of[clue_id])) for clue_id, response in pairs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk answer grading')
+    parser.add_argument('--clues', type=int, default=100_000, help='Synthetic clues (default: 100000)')
+    parser.add_argument(
+        '--pairs',
+        type=str,
+        default='1000,10000,100000',
+        help='Comma-separated batch sizes (default: 1000,10000,100000)'
+    )
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Building a database with about {args.clues} clues...")
+        with redirect_stdout(io.StringIO()):
+            db = build_database(Path(tmp) / 'grading.db', args.clues, seed=args.seed)
+
+        with db:
+            answers = [
+                (clue_id, answer) for clue_id, answer in
+                db.conn.execute("SELECT id, answer FROM clues WHERE answer <> ''").fetchall()
+            ]
+
+            print(f"\n{'pairs':>8} {'indexed':>14} {'on the fly':>14} {'speedup':>8} {'accuracy':>9}")
+            print("-" * 57)
+            for count in (int(size) for size in args.pairs.split(',')):
+                pairs = make_pairs(answers, count, rng)
+                requests = [(clue_id, response) for clue_id, response, _ in pairs]
+
+                start = time.perf_counter()
+                grades = db.grade_responses(requests)
+                indexed = time.perf_counter() - start
+
+                start = time.perf_counter()
+                baseline = grade_without_index(db, requests)
+                on_the_fly = time.perf_counter() - start
+
+                assert [result.correct for result in grades] == [result.correct for result in baseline]
+                right = sum(result.correct == (kind != 'wrong') for result, (_, _, kind) in zip(grades, pairs))
+                print(
+                    f"{count:>8} {count / indexed:>12.0f}/s {count / on_the_fly:>12.0f}/s"
+                    f" {on_the_fly / indexed:>7.1f}x {right / count:>9.1%}"
+                )
+
+            # Where the misses are
+            pairs = make_pairs(answers, 20_000, rng)
+            grades = db.grade_responses([(clue_id, response) for clue_id, response, _ in pairs])
+            print()
+            for kind in KINDS:
+                verdicts = [result.correct for result, pair in zip(grades, pairs) if pair[2] == kind]
+                print(f"{kind:<9} accepted {sum(verdicts) / len(verdicts):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Read throughput of DatabasePool as the number of serving threads grows
+
+Each thread calls get_random_clue() in a loop for a fixed time. The pool
+(one read-only connection per thread) is compared with the single shared
+connection behind a lock that a web server would otherwise need.
+
+Usage:
+    python benchmarks/concurrent_reads.py
+    python benchmarks/concurrent_reads.py --clues 1000000 --threads 1,4,16 --seconds 5
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import build_database
+from scraper.database import JeopardyDatabase
+from scraper.db_pool import DatabasePool
+
+
+def run_threads(thread_count: int, seconds: float, read) -> float:
+    """Call `read()` from `thread_count` threads for `seconds`; return reads/sec"""
+    counts = [0] * thread_count
+    start_barrier = threading.Barrier(thread_count + 1)
+    deadline = [0.0]
+
+    def worker(index: int):
+        start_barrier.wait()
+        done = 0
+        while time.perf_counter() < deadline[0]:
+            read()
+            done += 1
+        counts[index] = done
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+
+    deadline[0] = time.perf_counter() + seconds
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+
+    return sum(counts) / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent read throughput')
+    parser.add_argument('--clues', type=int, default=200000, help='Synthetic clues to load (default: 200000)')
+    parser.add_argument('--threads', type=str, default='1,2,4,8,16', help='Thread counts to test (default: 1,2,4,8,16)')
+    parser.add_argument('--seconds', type=float, default=3.0, help='Duration of each run (default: 3)')
+    args = parser.parse_args()
+
+    thread_counts = [int(count) for count in args.threads.split(',')]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        build_database(db_path, args.clues).close()
+
+        shared = JeopardyDatabase(db_path, check_same_thread=False)
+        shared_lock = threading.Lock()
+
+        def locked_read():
+            with shared_lock:
+                shared.get_random_clue()
+
+        print(f"{'threads':>7}  {'shared + lock':>15}  {'pool':>15}")
+        print("-" * 42)
+
+        with DatabasePool(db_path) as pool:
+            for count in thread_counts:
+                locked = run_threads(count, args.seconds, locked_read)
+                pooled = run_threads(count, args.seconds, lambda: pool.reader().get_random_clue())
+                print(f"{count:>7}  {locked:>10.0f} r/s  {pooled:>10.0f} r/s")
+
+        shared.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Cost and accuracy of duplicate clue detection
+
+Builds a synthetic database (its random clues have no natural repeats),
+fingerprints it from scratch, then inserts three kinds of games one at a
+time, the way the scraper does:
+
+    new         fresh synthetic games
+    rerun       exact copies of stored games under a new game id
+    reworded    copies with one word of each longer clue replaced and
+                "the" put in front of each answer
+
+and reports the insert time per game, how many of the copied clues ended
+up in their original's cluster (recall, overall and for the copies at or
+above dedup.SIMILARITY, where only the LSH index can lose them) and how
+many clusters formed that the copies don't account for (false merges). Finally it compares sampling
+with and without dedupe.
+
+Usage:
+    python benchmarks/duplicate_detection.py
+    python benchmarks/duplicate_detection.py --clues 500000 --games 100
+"""
+
+import argparse
+import copy
+import io
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import SyntheticCorpus, build_database, game_count
+from scraper.dedup import SIMILARITY, fingerprint, similarity
+
+ROUND_KEYS = ('jeopardy_round', 'double_jeopardy_round')
+
+
+def reword(game: Dict) -> Dict:
+    """A copy of a game with lightly edited clues"""
+    game = copy.deepcopy(game)
+    for key in ROUND_KEYS:
+        for clue in game[key]:
+            words = clue['clue'].split()
+            if len(words) >= 10:
+                words[len(words) // 2] = 'Reworded'
+                clue['clue'] = ' '.join(words)
+            clue['answer'] = 'the ' + clue['answer']
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark duplicate detection')
+    parser.add_argument('--clues', type=int, default=100_000, help='Synthetic clues to start from (default: 100000)')
+    parser.add_argument('--games', type=int, default=200, help='Games inserted of each kind (default: 200)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(args.seed)
+    rng = random.Random(args.seed)
+    stored = game_count(args.clues)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Building a database with about {args.clues} clues...")
+        with redirect_stdout(io.StringIO()):
+            db = build_database(Path(tmp) / 'duplicates.db', args.clues, corpus=corpus)
+
+        with db:
+            total = db.get_stats()['total_clues']
+            start = time.perf_counter()
+            db.rebuild_duplicate_index()
+            elapsed = time.perf_counter() - start
+            print(f"Full index build: {elapsed:.1f}s for {total} clues ({elapsed / total * 1e6:.0f}us per clue)")
+
+            sources = rng.sample(range(1, stored + 1), 2 * args.games)
+            next_id = stored + 1
+            copies = []
+            print(f"\n{'kind':<10} {'games':>6} {'median insert':>14}")
+            print("-" * 32)
+            for kind in ('new', 'rerun', 'reworded'):
+                timings = []
+                for index in range(args.games):
+                    if kind == 'new':
+                        game = corpus.game(next_id)
+                    else:
+                        source = sources[index if kind == 'rerun' else args.games + index]
+                        game = copy.deepcopy(corpus.game(source))
+                        if kind == 'reworded':
+                            game = reword(game)
+                        copies.append((source, next_id))
+                    game['game_id'] = game['show_number'] = next_id
+                    next_id += 1
+
+                    start = time.perf_counter()
+                    with redirect_stdout(io.StringIO()):
+                        db.insert_game(game)
+                    timings.append(time.perf_counter() - start)
+                print(f"{kind:<10} {args.games:>6} {statistics.median(timings) * 1000:>12.2f}ms")
+
+            # Every copied board clue should share its original's representative
+            source_of = {copied: source for source, copied in copies}
+            positions = {}
+            game_of = {}
+            prints = {}
+            for clue_id, game_id, round_id, row, column, text, answer in db.conn.execute("""
+                SELECT id, game_id, round_id, board_row, board_column, clue, answer FROM clues
+                WHERE game_id IN (SELECT value FROM json_each(?))
+            """, (str([game_id for pair in copies for game_id in pair]),)):
+                positions[(game_id, round_id, row, column)] = clue_id
+                game_of[clue_id] = game_id
+                prints[clue_id] = fingerprint(text, answer, lsh=False)
+            representative = dict(db.conn.execute("SELECT clue_id, representative_id FROM clue_duplicates"))
+
+            found = expected = close_found = close = 0
+            for (game_id, round_id, row, column), clue_id in positions.items():
+                original = positions.get((source_of.get(game_id), round_id, row, column))
+                if row is None or original is None:
+                    continue
+                matched = representative.get(clue_id, clue_id) == representative.get(original, original)
+                expected += 1
+                found += matched
+                if similarity(prints[clue_id].shingles, prints[original].shingles) >= SIMILARITY:
+                    close += 1
+                    close_found += matched
+            print(f"\nRecall: {found}/{expected} copied board clues matched their original ({found / expected:.1%})")
+            print(f"  at similarity >= {SIMILARITY}: {close_found}/{close} ({close_found / close:.1%})")
+
+            # Any cluster that isn't one original plus its copy is a false merge
+            clusters = {}
+            for clue_id, root in representative.items():
+                clusters.setdefault(root, {root}).add(clue_id)
+            false_merges = sum(
+                1 for members in clusters.values()
+                if len({source_of.get(game_of.get(clue_id), game_of.get(clue_id)) for clue_id in members}) != 1
+                or len(members) != 2
+            )
+            print(f"Clusters: {len(clusters)}, false merges: {false_merges}\n")
+
+            for dedupe in (False, True):
+                samples = []
+                for _ in range(200):
+                    start = time.perf_counter()
+                    db.get_random_clues(50, dedupe=dedupe)
+                    samples.append(time.perf_counter() - start)
+                print(f"get_random_clues(50, dedupe={dedupe}): {statistics.median(samples) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
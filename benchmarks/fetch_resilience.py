@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Exercise the fetcher's throttling, retries and circuit breaker against a
+local fake J-Archive
+
+A threaded HTTP server on 127.0.0.1 plays back a scenario (healthy, 429s
+with Retry-After, 5xx bursts, a latency spike, a full outage) while a
+JArchiveFetcher with an AdaptiveRateLimiter and a CircuitBreaker
+downloads a range of pages from it. For each scenario the script reports
+how many pages came through, how many requests the server saw, whether
+any request arrived while a Retry-After was still in force, and where the
+adaptive rate ended up. A plain fetcher at a fixed rate without retries
+runs the same scenario for comparison.
+
+Usage:
+    python benchmarks/fetch_resilience.py
+    python benchmarks/fetch_resilience.py --pages 100 --concurrency 4 --scenarios rate_limited,outage
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scraper.fetcher import JArchiveFetcher
+from scraper.jarchive_scraper import game_url
+from scraper.throttle import AdaptiveRateLimiter, CircuitBreaker, HostRateLimiter
+
+
+PAGE = b"<html><head><title>J! Archive - Show #1, aired 2000-01-01</title></head><body></body></html>"
+
+
+class FakeJArchive:
+    """
+    Fake J-Archive that injects errors and latency
+
+    `behaviour(index, elapsed)` decides each answer from the request number
+    and the seconds since the server started. It returns (status, latency,
+    retry_after), where retry_after may be None.
+    """
+
+    def __init__(self, behaviour):
+        self.behaviour = behaviour
+        self.requests = 0
+        self.statuses = {}
+        self.early_requests = 0
+        self._retry_from = 0.0
+        self._retry_until = 0.0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                fake.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def handle(self, handler: BaseHTTPRequestHandler):
+        """Answer one request according to the scenario"""
+        now = time.monotonic()
+        with self._lock:
+            index = self.requests
+            self.requests += 1
+            # Requests already in flight when the Retry-After went out don't count
+            if self._retry_from <= now < self._retry_until:
+                self.early_requests += 1
+
+        status, latency, retry_after = self.behaviour(index, now - self._started)
+        time.sleep(latency)
+
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if retry_after is not None:
+                # Leave a little slack for the client's clock and scheduling
+                sent = time.monotonic()
+                self._retry_from = sent + 0.1
+                self._retry_until = max(self._retry_until, sent + retry_after - 0.05)
+
+        body = PAGE if status == 200 else b""
+        handler.send_response(status)
+        if retry_after is not None:
+            handler.send_header('Retry-After', str(retry_after))
+        handler.send_header('Content-Type', 'text/html')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def scenarios(seed: int) -> dict:
+    """Scenario name -> behaviour function for FakeJArchive"""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def chance(p: float) -> bool:
+        with lock:
+            return rng.random() < p
+
+    return {
+        # Fast answers: the adaptive rate should climb
+        'healthy': lambda i, t: (200, 0.01, None),
+        # Every 10th request is rate limited with a 1 second Retry-After
+        'rate_limited': lambda i, t: (429, 0.01, 1) if i % 10 == 9 else (200, 0.01, None),
+        # 20% of answers are 502/503
+        'flaky_5xx': lambda i, t: (503 if chance(0.5) else 502, 0.01, None) if chance(0.2) else (200, 0.01, None),
+        # Latency jumps tenfold for a while; the rate should drop with it
+        'latency_spike': lambda i, t: (200, 0.2 if 1.0 <= t < 4.0 else 0.02, None),
+        # The host is down for 3 seconds; the breaker should pause the batch
+        'outage': lambda i, t: (503, 0.01, None) if 1.0 <= t < 4.0 else (200, 0.01, None),
+    }
+
+
+def run_fixed(behaviour, pages: int, concurrency: int, rate: float) -> int:
+    """Fetch with a fixed rate and no retries; return how many pages came through"""
+    fake = FakeJArchive(behaviour)
+    limiter = HostRateLimiter(rate)
+    fetcher = JArchiveFetcher(timeout=(2.0, 5.0), pool_size=concurrency, max_retries=0)
+
+    def fetch(game_id: int) -> bool:
+        url = game_url(game_id, fake.base_url)
+        limiter.acquire(url)
+        try:
+            fetcher.fetch(url)
+            return True
+        except Exception:
+            return False
+
+    with fetcher, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        fetched = sum(executor.map(fetch, range(1, pages + 1)))
+    fake.close()
+    return fetched
+
+
+def run_scenario(name: str, behaviour, pages: int, concurrency: int, rate: float, max_rate: float) -> dict:
+    """Fetch `pages` pages from a fake server playing `behaviour`"""
+    fake = FakeJArchive(behaviour)
+    limiter = AdaptiveRateLimiter(rate=rate, min_rate=min(0.5, rate), max_rate=max_rate)
+    breaker = CircuitBreaker(failure_threshold=5, cooldown=1.0, max_cooldown=4.0)
+    fetcher = JArchiveFetcher(
+        timeout=(2.0, 5.0),
+        pool_size=concurrency,
+        max_retries=4,
+        retry_base=0.1,
+        rate_limiter=limiter,
+        breaker=breaker
+    )
+
+    def fetch(game_id: int) -> bool:
+        try:
+            fetcher.fetch(game_url(game_id, fake.base_url))
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with fetcher, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        fetched = sum(executor.map(fetch, range(1, pages + 1)))
+    elapsed = time.perf_counter() - start
+    fake.close()
+
+    return {
+        'scenario': name,
+        'fetched': fetched,
+        'requests': fake.requests,
+        'errors': sum(count for status, count in fake.statuses.items() if status != 200),
+        'early': fake.early_requests,
+        'rate': limiter.rate,
+        'elapsed': elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exercise fetch throttling against a fake J-Archive')
+    parser.add_argument('--pages', type=int, default=60, help='Pages fetched per scenario (default: 60)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Fetch threads (default: 4)')
+    parser.add_argument('--rate', type=float, default=10.0, help='Starting requests per second (default: 10)')
+    parser.add_argument('--max-rate', type=float, default=40.0, help='Adaptive rate ceiling (default: 40)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for injected errors (default: 0)')
+    parser.add_argument(
+        '--scenarios',
+        type=str,
+        default=None,
+        help='Comma-separated scenarios to run (default: all)'
+    )
+    args = parser.parse_args()
+
+    names = args.scenarios.split(',') if args.scenarios else list(scenarios(args.seed))
+
+    print(
+        f"{'scenario':<14} {'fixed':>7} {'adaptive':>9} {'requests':>9} {'errors':>7} {'early':>6}"
+        f" {'final rate':>11} {'time':>7}"
+    )
+    print("-" * 78)
+    for name in names:
+        fixed = run_fixed(scenarios(args.seed)[name], args.pages, args.concurrency, args.rate)
+        result = run_scenario(
+            name, scenarios(args.seed)[name], args.pages, args.concurrency, args.rate, args.max_rate
+        )
+        print(
+            f"{result['scenario']:<14} {fixed:>7} {result['fetched']:>9} {result['requests']:>9}"
+            f" {result['errors']:>7} {result['early']:>6} {result['rate']:>9.1f}/s {result['elapsed']:>6.1f}s"
+        )
+
+    print("\n'fixed' and 'adaptive' count pages fetched successfully out of", args.pages)
+
+    print("'early' counts requests that arrived while a Retry-After was still in force (should be 0)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Effect of the JeopardyDatabase result cache on repeated lookups
+
+Replays a quiz-app-like read mix against a synthetic database: show and
+board lookups with a skewed popularity (a few recent shows get most of
+the traffic), plus get_stats() and the top-categories list. The same mix
+runs without a cache and with caches of a few sizes, and then once more
+with a game inserted every --write-every reads to show the cost of
+invalidation. Reports reads per second, median latency of each method
+and the hit rate.
+
+Usage:
+    python benchmarks/query_cache.py
+    python benchmarks/query_cache.py --clues 500000 --reads 50000 --sizes 128,1024,8192
+"""
+
+import argparse
+import io
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import SyntheticCorpus, build_database, game_count
+from scraper.database import JeopardyDatabase
+
+
+def read_mix(shows: List[int], count: int, rng: random.Random) -> List[Tuple]:
+    """(method name, args) calls; show popularity falls off like 1/rank"""
+    weights = [1 / rank for rank in range(1, len(shows) + 1)]
+    popular = rng.choices(shows, weights=weights, k=count)
+    calls = []
+    for show in popular:
+        roll = rng.random()
+        if roll < 0.45:
+            calls.append(('get_clues_by_show_number', (show,)))
+        elif roll < 0.9:
+            calls.append(('get_game_board', (show,)))
+        elif roll < 0.97:
+            calls.append(('get_stats', ()))
+        else:
+            calls.append(('get_category_counts', (20,)))
+    return calls
+
+
+def replay(db: JeopardyDatabase, calls: List[Tuple], corpus: SyntheticCorpus, write_every: int = 0,
+           next_game: int = 0) -> Tuple[float, dict]:
+    """Run the calls; return reads per second and median latency per method"""
+    samples = {}
+    elapsed = 0.0
+    for index, (name, args) in enumerate(calls, 1):
+        method = getattr(db, name)
+        start = time.perf_counter()
+        method(*args)
+        took = time.perf_counter() - start
+        elapsed += took
+        samples.setdefault(name, []).append(took)
+
+        if write_every and index % write_every == 0:
+            with redirect_stdout(io.StringIO()):
+                db.insert_game(corpus.game(next_game))
+            next_game += 1
+
+    medians = {name: statistics.median(times) * 1e6 for name, times in samples.items()}
+    return len(calls) / elapsed, medians
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the query result cache')
+    parser.add_argument('--clues', type=int, default=100_000, help='Synthetic clues (default: 100000)')
+    parser.add_argument('--reads', type=int, default=20_000, help='Reads per run (default: 20000)')
+    parser.add_argument('--sizes', type=str, default='64,512,4096', help='Cache sizes (default: 64,512,4096)')
+    parser.add_argument('--write-every', type=int, default=1000, help='Reads between inserts in the last run (default: 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = SyntheticCorpus(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'cache.db'
+        print(f"Building a database with about {args.clues} clues...")
+        with redirect_stdout(io.StringIO()):
+            build_database(path, args.clues, corpus=corpus).close()
+
+        with JeopardyDatabase(path, read_only=True) as db:
+            shows = [row[0] for row in db.conn.execute("SELECT show_number FROM games ORDER BY show_number DESC")]
+        calls = read_mix(shows, args.reads, rng)
+        methods = ['get_clues_by_show_number', 'get_game_board', 'get_stats', 'get_category_counts']
+
+        print(f"\n{'cache':<16} {'reads/s':>9} {'hit rate':>9}  " + '  '.join(f"{name[4:]:>22}" for name in methods))
+        print("-" * (38 + 24 * len(methods)))
+
+        runs = [(0, 0)] + [(int(size), 0) for size in args.sizes.split(',')]
+        runs.append((runs[-1][0], args.write_every))
+        for size, write_every in runs:
+            with JeopardyDatabase(path, cache_size=size) as db:
+                rate, medians = replay(db, calls, corpus, write_every, game_count(args.clues) + 1)
+                stats = db.cache.stats() if db.cache else None
+
+            label = 'off' if not size else f"{size}" + (f", write/{write_every}" if write_every else '')
+            hit_rate = f"{stats['hits'] / (stats['hits'] + stats['misses']):.1%}" if stats else '-'
+            print(
+                f"{label:<16} {rate:>9.0f} {hit_rate:>9}  "
+                + '  '.join(f"{medians.get(name, 0):>20.1f}us" for name in methods)
+            )
+
+
+if __name__ == "__main__":
+    main()
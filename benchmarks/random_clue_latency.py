@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for random clue sampling
+
+Builds synthetic databases of increasing size and compares the sampling
+methods on JeopardyDatabase with the ORDER BY RANDOM() queries they replaced.
+
+Usage:
+    python benchmarks/random_clue_latency.py
+    python benchmarks/random_clue_latency.py --sizes 10000,100000 --calls 500
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import build_database, date_range
+from scraper.database import CLUE_SELECT, JeopardyDatabase
+
+
+def time_calls(func, calls: int) -> dict:
+    """Run `func` repeatedly and summarize latency in milliseconds"""
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    return {
+        'median': statistics.median(samples),
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def legacy_queries(db: JeopardyDatabase, start_date: str, end_date: str) -> dict:
+    """The ORDER BY RANDOM() queries the sampling methods replaced"""
+    def random_clue():
+        db.cursor.execute(
+            CLUE_SELECT + " WHERE r.name != 'Final Jeopardy' ORDER BY RANDOM() LIMIT 1"
+        )
+        return db.cursor.fetchone()
+
+    def random_clue_by_date():
+        db.cursor.execute(
+            CLUE_SELECT + """
+            WHERE g.air_date >= ? AND g.air_date <= ? AND r.name != 'Final Jeopardy'
+            ORDER BY RANDOM() LIMIT 1
+            """,
+            (start_date, end_date)
+        )
+        return db.cursor.fetchone()
+
+    def clues_by_category():
+        db.cursor.execute(
+            CLUE_SELECT + " WHERE cat.name LIKE ? ORDER BY RANDOM() LIMIT ?",
+            ('%SCIENCE%', 10)
+        )
+        return db.cursor.fetchall()
+
+    return {
+        'get_random_clue': random_clue,
+        'get_random_clue_by_date': random_clue_by_date,
+        'get_clues_by_category': clues_by_category,
+    }
+
+
+def sampling_methods(db: JeopardyDatabase, start_date: str, end_date: str) -> dict:
+    """The current JeopardyDatabase methods, called with the same filters"""
+    return {
+        'get_random_clue': db.get_random_clue,
+        'get_random_clue_by_date': lambda: db.get_random_clue_by_date(start_date, end_date),
+        'get_clues_by_category': lambda: db.get_clues_by_category('SCIENCE', 10),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark random clue sampling latency')
+    parser.add_argument(
+        '--sizes',
+        type=str,
+        default='10000,100000,1000000',
+        help='Comma-separated clue counts to test (default: 10000,100000,1000000)'
+    )
+    parser.add_argument(
+        '--calls',
+        type=int,
+        default=200,
+        help='Calls per method for the sampling methods (default: 200)'
+    )
+    parser.add_argument(
+        '--legacy-calls',
+        type=int,
+        default=20,
+        help='Calls per method for the ORDER BY RANDOM() queries (default: 20)'
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    print(f"{'clues':>9}  {'method':<24} {'legacy median':>14} {'p95':>9} {'new median':>11} {'p95':>9}")
+    print("-" * 84)
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = build_database(Path(tmp) / "bench.db", size)
+            with db:
+                clue_total = db.get_stats()['total_clues']
+                start_date, end_date = date_range(size)
+                legacy = legacy_queries(db, start_date, end_date)
+                current = sampling_methods(db, start_date, end_date)
+
+                for name in current:
+                    old = time_calls(legacy[name], args.legacy_calls)
+                    new = time_calls(current[name], args.calls)
+                    print(
+                        f"{clue_total:>9}  {name:<24} {old['median']:>12.3f}ms {old['p95']:>7.3f}ms"
+                        f" {new['median']:>9.3f}ms {new['p95']:>7.3f}ms"
+                    )
+
+
+if __name__ == "__main__":
+    main()
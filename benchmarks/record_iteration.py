@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Memory and throughput of streaming clues as dicts, records or tuples
+
+Iterates a synthetic database (1M clues by default) through each way
+JeopardyDatabase can hand out clues:
+
+    row->dict   sqlite3.Row turned into a dict, as iter_clues used to do
+    dict        iter_clues()
+    record      iter_clue_records(), Clue NamedTuples
+    tuple       iter_clue_records(raw=True), plain tuples
+
+and reports clues per second for a full pass plus the memory each clue
+takes when a job keeps the results (measured with tracemalloc over
+--keep clues).
+
+Usage:
+    python benchmarks/record_iteration.py
+    python benchmarks/record_iteration.py --clues 100000 --keep 50000
+    python benchmarks/record_iteration.py --db data/jeopardy.db
+"""
+
+import argparse
+import gc
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import build_database
+from scraper.database import CLUE_SELECT, JeopardyDatabase
+
+
+def row_dicts(db: JeopardyDatabase) -> Iterator[Dict]:
+    """Clue dicts built from sqlite3.Row objects (the previous iter_clues)"""
+    cursor = db.conn.cursor()
+    try:
+        cursor.execute(CLUE_SELECT + " ORDER BY c.id")
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+    finally:
+        cursor.close()
+
+
+def paths(db: JeopardyDatabase) -> Dict[str, Callable[[], Iterator]]:
+    """Each way of streaming every clue, paired with how a job reads a field"""
+    return {
+        'row->dict': lambda: (clue['answer'] for clue in row_dicts(db)),
+        'dict': lambda: (clue['answer'] for clue in db.iter_clues()),
+        'record': lambda: (clue.answer for clue in db.iter_clue_records()),
+        'tuple': lambda: (clue[8] for clue in db.iter_clue_records(raw=True)),
+    }
+
+
+def containers(db: JeopardyDatabase) -> Dict[str, Callable[[], Iterator]]:
+    """The same streams, yielding the objects a job would keep"""
+    return {
+        'row->dict': lambda: row_dicts(db),
+        'dict': lambda: db.iter_clues(),
+        'record': lambda: db.iter_clue_records(),
+        'tuple': lambda: db.iter_clue_records(raw=True),
+    }
+
+
+def throughput(stream: Callable[[], Iterator]) -> Dict:
+    """Clues per second for a full pass"""
+    start = time.perf_counter()
+    count = 0
+    for _ in stream():
+        count += 1
+    elapsed = time.perf_counter() - start
+    return {'clues': count, 'seconds': elapsed, 'clues_per_second': count / elapsed}
+
+
+def retained_bytes(stream: Callable[[], Iterator], keep: int) -> float:
+    """Bytes allocated per clue while holding `keep` clues in a list"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = list(islice(stream(), keep))
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    per_clue = current / max(len(kept), 1)
+    del kept
+    return per_clue
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare dict, record and tuple clue iteration')
+    parser.add_argument('--clues', type=int, default=1_000_000, help='Synthetic clues to generate (default: 1000000)')
+    parser.add_argument('--keep', type=int, default=200_000, help='Clues held for the memory measurement (default: 200000)')
+    parser.add_argument('--db', type=str, default=None, help='Use an existing database instead of a synthetic one')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed (default: 0)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.db:
+            db = JeopardyDatabase(args.db, read_only=True)
+        else:
+            print(f"Building a database with about {args.clues} clues...")
+            with redirect_stdout(io.StringIO()):
+                build_database(Path(tmp) / 'records.db', args.clues, seed=args.seed).close()
+            db = JeopardyDatabase(Path(tmp) / 'records.db', read_only=True)
+
+        with db:
+            # A first pass warms the page cache so every path reads from memory
+            throughput(paths(db)['tuple'])
+
+            print(f"\n{'path':<10} {'clues':>9} {'seconds':>8} {'clues/s':>10} {'bytes/clue kept':>16}")
+            print("-" * 57)
+            baseline = None
+            for name, stream in paths(db).items():
+                result = throughput(stream)
+                per_clue = retained_bytes(containers(db)[name], args.keep)
+                baseline = baseline or result['seconds']
+                print(
+                    f"{name:<10} {result['clues']:>9} {result['seconds']:>8.2f}"
+                    f" {result['clues_per_second']:>10.0f} {per_clue:>16.0f}"
+                    f"  ({baseline / result['seconds']:.2f}x)"
+                )
+
+
+if __name__ == "__main__":
+    main()
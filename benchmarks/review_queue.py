@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Cost of the spaced-repetition write and read paths as history grows
+
+Simulates one user studying a synthetic database day after day: each day
+next_due_clues() hands out a session of cards (due ones first, then new
+ones), every card gets a random grade and record_reviews() stores the
+answers. At each checkpoint of review history the time per recorded
+answer and per next_due_clues() call is printed, along with the number
+of cards in rotation. Costs follow the cards in rotation (the size of
+review_state), not the length of the history in review_log.
+
+Usage:
+    python benchmarks/review_queue.py
+    python benchmarks/review_queue.py --clues 100000 --history 200000,1000000,3000000
+"""
+
+import argparse
+import io
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import build_database
+from scraper.scheduler import DAY
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark record_reviews and next_due_clues as history grows')
+    parser.add_argument('--clues', type=int, default=100_000, help='Synthetic clues (default: 100000)')
+    parser.add_argument(
+        '--history',
+        type=str,
+        default='10000,100000,1000000,2000000',
+        help='Comma-separated review counts to report at (default: 10000,100000,1000000,2000000)'
+    )
+    parser.add_argument('--session', type=int, default=1000, help='Cards per simulated day (default: 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    checkpoints = [int(count) for count in args.history.split(',')]
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Building a database with about {args.clues} clues...")
+        with redirect_stdout(io.StringIO()):
+            db = build_database(Path(tmp) / 'reviews.db', args.clues, seed=args.seed)
+
+        with db:
+            print(f"\n{'reviews':>9} {'cards':>7} {'per answer':>11} {'next_due_clues':>15} {'due in session':>15}")
+            print("-" * 62)
+
+            now = 1_700_000_000
+            reviews = 0
+            write_samples = []
+            read_samples = []
+            due_counts = []
+            for checkpoint in checkpoints:
+                while reviews < checkpoint:
+                    start = time.perf_counter()
+                    cards = db.next_due_clues('bench', args.session, now=now)
+                    read_samples.append(time.perf_counter() - start)
+                    due_counts.append(sum(card['review'] is not None for card in cards))
+
+                    # Mostly correct answers, like a real study session
+                    answers = [(card['id'], rng.choice((1, 3, 4, 4, 5, 5)), now) for card in cards]
+                    start = time.perf_counter()
+                    db.record_reviews('bench', answers)
+                    write_samples.append((time.perf_counter() - start) / len(answers))
+
+                    reviews += len(answers)
+                    now += DAY
+
+                cards = db.conn.execute("SELECT COUNT(*) FROM review_state").fetchone()[0]
+                print(
+                    f"{reviews:>9} {cards:>7} {statistics.median(write_samples) * 1e6:>9.1f}us"
+                    f" {statistics.median(read_samples) * 1000:>13.2f}ms"
+                    f" {statistics.mean(due_counts):>15.0f}"
+                )
+                write_samples, read_samples, due_counts = [], [], []
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Read latency on the live database vs. an immutable serving snapshot
+
+Builds a synthetic database the way the scraper fills it, one insert_game()
+commit per game, so the file ends up as fragmented as a real crawl's. Then
+it writes snapshots at each page size and times the serving reads on:
+
+    live        JeopardyDatabase(path, read_only=True) on the WAL database
+    snapshot    JeopardyDatabase(snapshot, immutable=True)
+
+along with the file sizes and the time snapshot() took. The WAL file is
+left as the inserts leave it (checkpointed automatically every 1000
+pages), like a live database between scrapes.
+
+Usage:
+    python benchmarks/snapshot_reads.py
+    python benchmarks/snapshot_reads.py --clues 200000 --page-sizes 4096,16384,65536
+"""
+
+import argparse
+import io
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.synthetic import SyntheticCorpus
+from scraper.database import JeopardyDatabase
+
+
+def time_calls(func, calls: int) -> float:
+    """Median latency of `func` in milliseconds"""
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def read_timings(db: JeopardyDatabase, calls: int, seed: int) -> dict:
+    """Median latency of the reads the quiz app and query CLI make"""
+    rng = random.Random(seed)
+    shows = [row[0] for row in db.conn.execute("SELECT show_number FROM games")]
+    categories = [row[0] for row in db.conn.execute("SELECT name FROM categories LIMIT 500")]
+    words = [clue['answer'].split()[0].lower() for clue in db.get_random_clues(200)]
+
+    timings = {
+        'get_random_clue': time_calls(db.get_random_clue, calls),
+        'get_random_clues(50)': time_calls(lambda: db.get_random_clues(50), calls),
+        'get_clues_by_category': time_calls(lambda: db.get_clues_by_category(rng.choice(categories)), calls),
+        'get_game_board': time_calls(lambda: db.get_game_board(rng.choice(shows)), calls),
+        'search_clues': time_calls(lambda: db.search_clues(rng.choice(words), limit=20), calls),
+    }
+    start = time.perf_counter()
+    for _ in db.iter_clue_records(raw=True):
+        pass
+    timings['iter_clue_records (all)'] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark reads on the live database vs. a snapshot')
+    parser.add_argument('--clues', type=int, default=50_000, help='Synthetic clues (default: 50000)')
+    parser.add_argument(
+        '--page-sizes',
+        type=str,
+        default='4096,16384',
+        help='Comma-separated snapshot page sizes (default: 4096,16384)'
+    )
+    parser.add_argument('--calls', type=int, default=300, help='Calls per read method (default: 300)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        live_path = Path(tmp) / 'live.db'
+        print(f"Inserting about {args.clues} clues one game at a time...")
+        with JeopardyDatabase(live_path) as db, redirect_stdout(io.StringIO()):
+            for game in corpus.games(args.clues):
+                db.insert_game(game)
+
+        columns = {'live': live_path}
+        wal = live_path.with_name(live_path.name + '-wal')
+        wal_size = wal.stat().st_size if wal.exists() else 0
+        print(f"live: {live_path.stat().st_size / 1e6:.1f} MB + {wal_size / 1e6:.1f} MB WAL")
+
+        with JeopardyDatabase(live_path) as db:
+            for page_size in (int(size) for size in args.page_sizes.split(',')):
+                path = Path(tmp) / f'snapshot-{page_size}.db'
+                start = time.perf_counter()
+                db.snapshot(path, page_size=page_size)
+                elapsed = time.perf_counter() - start
+                print(f"snapshot @{page_size}: {path.stat().st_size / 1e6:.1f} MB, built in {elapsed:.1f}s")
+                columns[f'snap@{page_size}'] = path
+
+        results = {}
+        for name, path in columns.items():
+            with JeopardyDatabase(path, read_only=True, immutable=name != 'live') as db:
+                results[name] = read_timings(db, args.calls, args.seed)
+
+        print(f"\n{'median ms':<24}" + ''.join(f"{name:>12}" for name in columns))
+        print("-" * (24 + 12 * len(columns)))
+        for method in results['live']:
+            print(f"{method:<24}" + ''.join(f"{results[name][method]:>12.3f}" for name in columns))
+
+
+if __name__ == "__main__":
+    main()
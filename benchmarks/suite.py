@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite over a synthetic corpus at archive scale
+
+Times the paths that matter as the archive grows: parsing showgame pages
+with each parser backend, insert_game and insert_games throughput, and the
+read methods (get_random_clue*, get_clues_by_category,
+get_clues_by_show_number, get_game_board, get_stats) at each corpus size. Everything is
+generated from a seed (see synthetic.py), so two runs of the same commit
+on the same machine measure the same work.
+
+Results are written as JSON together with the commit, Python and SQLite
+versions. Pass --compare with an earlier results file to flag anything
+whose median got slower than --threshold; the exit status is then 1, so
+the suite can gate a change.
+
+Usage:
+    python benchmarks/suite.py
+    python benchmarks/suite.py --sizes 100,10000,100000,1000000 --output baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.2
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.synthetic import SyntheticCorpus, date_range, game_count
+from scraper.database import JeopardyDatabase
+from scraper.game_parser import PARSER_BACKENDS, parse_game_html
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def summarize(samples: List[float], **extra) -> Dict:
+    """Median, p95 and mean of per-call timings given in seconds"""
+    samples = sorted(samples)
+    result = {
+        'calls': len(samples),
+        'median_ms': statistics.median(samples) * 1000,
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        'mean_ms': statistics.fmean(samples) * 1000,
+    }
+    result.update(extra)
+    return result
+
+
+def time_calls(func: Callable, calls: int) -> List[float]:
+    """Call `func(i)` for i in range(calls); return each call's duration"""
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_parse(corpus: SyntheticCorpus, pages: int) -> Dict[str, Dict]:
+    """Per-page parse time for each parser backend"""
+    html = [corpus.page(game_id).encode('utf-8') for game_id in range(1, pages + 1)]
+    megabytes = sum(len(page) for page in html) / 1e6
+
+    results = {}
+    for backend in PARSER_BACKENDS:
+        samples = time_calls(lambda i: parse_game_html(html[i], i + 1, backend=backend), pages)
+        results[f"parse.{backend}"] = summarize(samples, mb_per_second=megabytes / sum(samples))
+    return results
+
+
+def bench_insert_game(corpus: SyntheticCorpus, games: int, tmp: Path) -> Dict[str, Dict]:
+    """insert_game() one game at a time into a fresh database"""
+    data = [corpus.game(game_id) for game_id in range(1, games + 1)]
+    with JeopardyDatabase(tmp / 'insert_game.db') as db, redirect_stdout(io.StringIO()):
+        samples = time_calls(lambda i: db.insert_game(data[i]), games)
+    return {'insert_game': summarize(samples, games_per_second=games / sum(samples))}
+
+
+def bench_size(
+    corpus: SyntheticCorpus,
+    clue_count: int,
+    calls: int,
+    tmp: Path,
+    seed: int
+) -> Dict[str, Dict]:
+    """Bulk-load `clue_count` clues, then time the read methods against them"""
+    results = {}
+    path = tmp / f"bench_{clue_count}.db"
+
+    db = JeopardyDatabase(path)
+    start = time.perf_counter()
+    db.insert_games(corpus.games(clue_count), rebuild_indexes=True)
+    elapsed = time.perf_counter() - start
+
+    with db:
+        total = db.get_stats()['total_clues']
+        results[f"insert_games@{clue_count}"] = summarize(
+            [elapsed], clues=total, clues_per_second=total / elapsed
+        )
+
+        rng = random.Random(seed)
+        shows = [rng.randint(1, game_count(clue_count)) for _ in range(calls)]
+        start_date, end_date = date_range(clue_count)
+        methods = {
+            'get_random_clue': lambda i: db.get_random_clue(),
+            'get_random_clue_by_date': lambda i: db.get_random_clue_by_date(start_date, end_date),
+            'get_random_clues': lambda i: db.get_random_clues(20),
+            'get_clues_by_category': lambda i: db.get_clues_by_category('SCIENCE', 10),
+            'get_clues_by_show_number': lambda i: db.get_clues_by_show_number(shows[i]),
+            'get_game_board': lambda i: db.get_game_board(shows[i]),
+            'get_stats': lambda i: db.get_stats(),
+        }
+        for name, method in methods.items():
+            method(0)  # warm the page cache and statement cache
+            results[f"{name}@{clue_count}"] = summarize(time_calls(method, calls))
+
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict, previous: Dict, threshold: float) -> List[str]:
+    """
+    Print how each benchmark moved against a previous run
+
+    Returns:
+        Names of the benchmarks whose median got slower than `threshold`
+        (e.g. 0.2 = 20%)
+    """
+    regressions = []
+    print(f"\nCompared with {previous['meta'].get('commit') or 'previous run'} ({previous['meta']['timestamp']}):")
+    print(f"{'benchmark':<40} {'before':>11} {'after':>11} {'change':>8}")
+    print("-" * 73)
+    for name, result in current['results'].items():
+        before = previous['results'].get(name)
+        if before is None:
+            continue
+        change = result['median_ms'] / before['median_ms'] - 1 if before['median_ms'] else 0.0
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(
+            f"{name:<40} {before['median_ms']:>9.3f}ms {result['median_ms']:>9.3f}ms"
+            f" {change:>+7.1%}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parsing, loading and queries on a synthetic corpus')
+    parser.add_argument(
+        '--sizes',
+        type=str,
+        default='100,10000,100000',
+        help='Comma-separated clue counts to test (default: 100,10000,100000)'
+    )
+    parser.add_argument('--calls', type=int, default=200, help='Calls per read method (default: 200)')
+    parser.add_argument('--pages', type=int, default=200, help='Pages parsed per backend (default: 200)')
+    parser.add_argument('--games', type=int, default=200, help='Games for the insert_game benchmark (default: 200)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed (default: 0)')
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Results file (default: benchmarks/results/<timestamp>.json)'
+    )
+    parser.add_argument('--compare', type=str, default=None, help='Earlier results file to compare against')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.2,
+        help='Slowdown of a median that counts as a regression (default: 0.2 = 20%%)'
+    )
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    corpus = SyntheticCorpus(args.seed)
+    timestamp = datetime.now()
+
+    report = {
+        'meta': {
+            'timestamp': timestamp.isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'seed': args.seed,
+            'sizes': sizes,
+            'calls': args.calls,
+        },
+        'results': {},
+    }
+    results = report['results']
+
+    print(f"Parsing {args.pages} pages per backend...")
+    results.update(bench_parse(corpus, args.pages))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Inserting {args.games} games with insert_game()...")
+        results.update(bench_insert_game(corpus, args.games, Path(tmp)))
+
+        for size in sizes:
+            print(f"Loading {size} clues and timing queries...")
+            results.update(bench_size(corpus, size, args.calls, Path(tmp), args.seed))
+
+    print(f"\n{'benchmark':<40} {'median':>11} {'p95':>11} {'calls':>6}")
+    print("-" * 72)
+    for name, result in results.items():
+        print(f"{name:<40} {result['median_ms']:>9.3f}ms {result['p95_ms']:>9.3f}ms {result['calls']:>6}")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{timestamp:%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding='utf-8')
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)
+        regressions = compare(report, previous, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic J-Archive corpus
+
+Generates games shaped like the scraper's output, renders them as
+showgame.php-style HTML that both parser backends read back to the same
+clues, and loads them into a JeopardyDatabase. The same seed always gives
+the same corpus, so runs at any size (100 clues to 1M+) are comparable.
+
+Realism knobs follow the real archive: six categories per round, a
+category vocabulary where a few names (POTPOURRI, ...) keep recurring,
+one Daily Double in Jeopardy and two in Double Jeopardy, about 2% of
+clues left unrevealed, weekday air dates, and clue text of 8-25 words
+with the occasional quote or ampersand that needs HTML escaping.
+"""
+
+import random
+from datetime import date, timedelta
+from html import escape
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from scraper.database import GAME_TITLE_FORMAT, GAME_URL_FORMAT, JeopardyDatabase
+from scraper.board import board_values
+
+
+CLUES_PER_GAME = 61  # 30 Jeopardy + 30 Double Jeopardy + Final
+UNREVEALED_RATE = 0.02
+FIRST_AIR_DATE = date(1984, 9, 10)
+
+RECURRING_CATEGORIES = [
+    'POTPOURRI', 'SCIENCE', 'WORLD HISTORY', 'U.S. PRESIDENTS', 'BEFORE & AFTER', 'OPERA',
+    'WORLD CAPITALS', 'SHAKESPEARE', 'RHYME TIME', 'THE BIBLE', 'ANIMALS', 'WORD ORIGINS',
+    'LITERATURE', '"B" IN BIOLOGY', 'SPORTS', 'STUPID ANSWERS', 'AMERICAN HISTORY', 'FOOD & DRINK',
+]
+
+_SYLLABLES = [
+    'ka', 'lo', 'mi', 'ter', 'ran', 'vel', 'os', 'tri', 'an', 'dor', 'pe', 'su', 'bel', 'cor',
+    'ni', 'sta', 'qui', 'ver', 'am', 'hol', 'ry', 'zen', 'pha', 'lum', 'gra', 'tis', 'mon', 'el',
+]
+
+
+def _vocabulary(rng: random.Random, size: int) -> List[str]:
+    """Pseudo-words built from syllables"""
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 4))))
+    return sorted(words)
+
+
+class SyntheticCorpus:
+    """Generates the same games for the same seed"""
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        rng = random.Random(seed)
+        self.words = _vocabulary(rng, 5000)
+        # Most categories are one-offs; a Zipf-like pool supplies the repeats
+        self.category_pool = RECURRING_CATEGORIES + [
+            ' '.join(rng.choice(self.words) for _ in range(rng.randint(1, 3))).upper()
+            for _ in range(3000)
+        ]
+
+    def _text(self, rng: random.Random, low: int, high: int) -> str:
+        words = [rng.choice(self.words) for _ in range(rng.randint(low, high))]
+        if rng.random() < 0.15:
+            words.insert(rng.randrange(len(words)), '&')
+        if rng.random() < 0.15:
+            index = rng.randrange(len(words))
+            words[index] = f'"{words[index]}"'
+        text = ' '.join(words)
+        return text[0].upper() + text[1:]
+
+    def _category(self, rng: random.Random) -> str:
+        if rng.random() < 0.4:
+            # Low indexes (the recurring names) come up far more often
+            return self.category_pool[min(int(rng.paretovariate(1.2)) - 1, len(self.category_pool) - 1)]
+        return ' '.join(rng.choice(self.words) for _ in range(rng.randint(1, 4))).upper()
+
+    def game(self, game_id: int) -> Dict:
+        """Game `game_id` (1-based) as the scraper would return it"""
+        return self._generate(game_id)[0]
+
+    def page(self, game_id: int) -> str:
+        """Game `game_id` as a J-Archive showgame.php page"""
+        game, boards = self._generate(game_id)
+        return _render_page(game, boards)
+
+    def _generate(self, game_id: int) -> Tuple[Dict, Dict]:
+        """
+        Build a game plus the board layout of each round
+
+        The layout maps each (row, column) cell to its clue, which is what
+        rendering the page needs.
+        """
+        rng = random.Random(self.seed * 1_000_003 + game_id)
+        aired = air_date(game_id).isoformat()
+        boards = {}
+        categories_by_round = {}
+
+        def make_round(round_key: str, daily_doubles: int) -> List[Dict]:
+            categories = []
+            while len(categories) < 6:
+                category = self._category(rng)
+                if category not in categories:
+                    categories.append(category)
+
+            values = board_values(round_key, aired)
+            cells = [(row, col) for row in range(len(values)) for col in range(6)]
+            doubles = set(rng.sample(cells[6:], daily_doubles))
+            board = {}
+            for row, col in cells:
+                if rng.random() < UNREVEALED_RATE:
+                    continue
+                board[(row, col)] = {
+                    'category': categories[col],
+                    'value': values[row],
+                    'clue': self._text(rng, 8, 25),
+                    'answer': self._text(rng, 1, 4),
+                    'daily_double': (row, col) in doubles,
+                    'row': row,
+                    'column': col,
+                }
+
+            boards[round_key] = (categories, board)
+            categories_by_round[round_key] = categories
+            return list(board.values())
+
+        game = {
+            'game_id': game_id,
+            'show_number': game_id,
+            'title': GAME_TITLE_FORMAT.format(show_number=game_id, air_date=aired),
+            'url': GAME_URL_FORMAT.format(game_id=game_id),
+            'air_date': aired,
+            'jeopardy_round': make_round('jeopardy_round', 1),
+            'double_jeopardy_round': make_round('double_jeopardy_round', 2),
+            'final_jeopardy': {
+                'category': self._category(rng),
+                'clue': self._text(rng, 8, 25),
+                'answer': self._text(rng, 1, 4),
+            },
+        }
+        game['categories'] = categories_by_round
+        return game, boards
+
+    def games(self, clue_count: int) -> Iterator[Dict]:
+        """Enough games for roughly `clue_count` clues"""
+        for game_id in range(1, game_count(clue_count) + 1):
+            yield self.game(game_id)
+
+
+def game_count(clue_count: int) -> int:
+    """Games needed for roughly `clue_count` clues"""
+    return max(1, round(clue_count / (CLUES_PER_GAME * (1 - UNREVEALED_RATE))))
+
+
+def air_date(game_id: int) -> date:
+    """Air date of game `game_id`; shows air on weekdays"""
+    days = game_id - 1
+    return FIRST_AIR_DATE + timedelta(weeks=days // 5, days=days % 5)
+
+
+def date_range(clue_count: int) -> Tuple[str, str]:
+    """The middle half of the air dates in a corpus of `clue_count` clues"""
+    games = game_count(clue_count)
+    return air_date(games // 4 + 1).isoformat(), air_date(games * 3 // 4 + 1).isoformat()
+
+
+def _render_page(game: Dict, boards: Dict) -> str:
+    """Render a game and its board layouts as a J-Archive showgame.php page"""
+    parts = [
+        '<!DOCTYPE html>\n<html><head><meta charset="utf-8">',
+        f"<title>{escape(game['title'])}</title></head><body><div id=\"content\">",
+        f"<div id=\"game_title\"><h1>{escape(game['title'])}</h1></div>",
+    ]
+
+    for round_key, prefix in (('jeopardy_round', 'J'), ('double_jeopardy_round', 'DJ')):
+        categories, by_cell = boards[round_key]
+
+        parts.append(f'<div id="{round_key}"><table class="round"><tr>')
+        for category in categories:
+            parts.append(
+                '<td class="category"><table><tr>'
+                f'<td class="category_name">{escape(category)}</td></tr>'
+                '<tr><td class="category_comments"></td></tr></table></td>'
+            )
+        parts.append('</tr>')
+
+        for row in range(5):
+            parts.append('<tr>')
+            for col in range(len(categories)):
+                clue = by_cell.get((row, col))
+                if clue is None:
+                    parts.append('<td class="clue"></td>')
+                    continue
+
+                value_class = 'clue_value_daily_double' if clue['daily_double'] else 'clue_value'
+                shown_value = 'DD: ' + clue['value'] if clue['daily_double'] else clue['value']
+                cell_id = f"clue_{prefix}_{col + 1}_{row + 1}"
+                parts.append(
+                    '<td class="clue"><table>'
+                    '<tr><td><table class="clue_header"><tr>'
+                    f'<td class="{value_class}">{shown_value}</td>'
+                    f'<td class="clue_order_number">{row * 6 + col + 1}</td>'
+                    '</tr></table></td></tr>'
+                    f'<tr><td id="{cell_id}" class="clue_text">{escape(clue["clue"])}</td>'
+                    f'<td id="{cell_id}_r" class="clue_text" style="display:none;">'
+                    f'<em class="correct_response">{escape(clue["answer"])}</em></td></tr>'
+                    '</table></td>'
+                )
+            parts.append('</tr>')
+        parts.append('</table></div>')
+
+    final = game['final_jeopardy']
+    if final:
+        response = f'<em class="correct_response">{final["answer"]}</em>'
+        parts.append(
+            '<div id="final_jeopardy_round"><table class="final_round"><tr><td class="category">'
+            f'<div onmouseover="{escape(response)}"><table><tr><td>'
+            f'<div class="category_name">{escape(final["category"])}</div>'
+            '</td></tr></table></div></td></tr>'
+            f'<tr><td class="clue"><table><tr><td id="clue_FJ" class="clue_text">{escape(final["clue"])}</td>'
+            '</tr></table></td></tr></table></div>'
+        )
+
+    parts.append('</div></body></html>\n')
+    return ''.join(parts)
+
+
+def synthetic_game(game_id: int, seed: int = 0) -> Dict:
+    """A single game from the corpus for `seed`"""
+    return SyntheticCorpus(seed).game(game_id)
+
+
+def build_database(
+    path: Path,
+    clue_count: int,
+    seed: int = 0,
+    corpus: Optional[SyntheticCorpus] = None
+) -> JeopardyDatabase:
+    """Create a database holding roughly `clue_count` synthetic clues"""
+    corpus = corpus or SyntheticCorpus(seed)
+    db = JeopardyDatabase(path)
+    db.insert_games(corpus.games(clue_count), rebuild_indexes=True)
+    return db
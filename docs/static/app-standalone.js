@@ -1,7 +1,8 @@
 // Standalone Flashcard App - Works without server (GitHub Pages compatible)
-// Data loaded from flashcards-data.js
+// Data comes from the sharded bundle in flashcards/ (one chunk per category,
+// fetched on demand) or, when opened from disk, from flashcards-data.js
 
-let flashcardsData = FLASHCARD_DATA; // Loaded from flashcards-data.js
+let flashcardsData = null; // Set by loadFlashcardData()
 let allFlashcards = [];
 let currentFlashcards = [];
 let currentIndex = 0;
@@ -10,6 +11,10 @@ let isFlipped = false;
 // Storage keys
 const MASTERED_CARDS_STORAGE_KEY = 'jeopardy-mastered-cards';
 
+// Sharded bundle written by `run_scraper.py bundle`
+const BUNDLE_DIR = 'flashcards/';
+const MONOLITHIC_DATA_URL = 'flashcards-data.js';
+
 // DOM Elements
 const flashcard = document.getElementById('flashcard');
 const questionEl = document.getElementById('question');
@@ -44,13 +49,69 @@ const aiError = document.getElementById('ai-error');
 const masteredStatusEl = document.getElementById('mastered-status');
 const resetProgressBtn = document.getElementById('reset-progress-btn');
 
+// Load the bundle manifest, falling back to the single data file.
+// fetch() is not available for file:// pages, so those go straight to it
+async function loadFlashcardData() {
+    if (location.protocol !== 'file:') {
+        try {
+            // The manifest is tiny and must be fresh; chunk names change with their content
+            const response = await fetch(BUNDLE_DIR + 'manifest.json', { cache: 'no-cache' });
+            if (response.ok) {
+                const manifest = await response.json();
+                return {
+                    metadata: manifest.metadata,
+                    categories: manifest.categories.map(entry => ({
+                        name: entry.name,
+                        count: entry.count,
+                        file: entry.file,
+                        flashcards: null // fetched by ensureCategoryLoaded()
+                    }))
+                };
+            }
+        } catch (error) {
+            console.warn('Flashcard bundle unavailable, loading the single data file', error);
+        }
+    }
+
+    await new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = MONOLITHIC_DATA_URL;
+        script.onload = resolve;
+        script.onerror = reject;
+        document.head.appendChild(script);
+    });
+    return FLASHCARD_DATA;
+}
+
+// Fetch a category's chunk the first time it is needed
+async function ensureCategoryLoaded(category) {
+    if (category.flashcards) {
+        return;
+    }
+    const response = await fetch(BUNDLE_DIR + category.file);
+    if (!response.ok) {
+        throw new Error(`Could not load ${category.file} (${response.status})`);
+    }
+    category.flashcards = (await response.json()).flashcards;
+}
+
 // Initialize the app
-function initApp() {
+async function initApp() {
+    flashcardsData = await loadFlashcardData();
+
     // Populate category dropdown
     populateCategories();
 
-    // Load all flashcards
-    loadAllFlashcards();
+    // ?category=<name> opens one category, so only its chunk is fetched
+    const requested = new URLSearchParams(location.search).get('category');
+    const requestedIndex = flashcardsData.categories.findIndex(category => category.name === requested);
+    if (requestedIndex >= 0) {
+        categorySelect.value = String(requestedIndex);
+        await loadCategoryFlashcards(requestedIndex);
+    } else {
+        // Load all flashcards
+        await loadAllFlashcards();
+    }
 
     // Check if all cards are mastered on load
     if (currentFlashcards.length === 0) {
@@ -67,13 +128,15 @@ function populateCategories() {
     flashcardsData.categories.forEach((category, index) => {
         const option = document.createElement('option');
         option.value = index;
-        option.textContent = `${category.name} (${category.flashcards.length} cards)`;
+        const count = category.flashcards ? category.flashcards.length : category.count;
+        option.textContent = `${category.name} (${count} cards)`;
         categorySelect.appendChild(option);
     });
 }
 
 // Load all flashcards (mixed mode)
-function loadAllFlashcards() {
+async function loadAllFlashcards() {
+    await Promise.all(flashcardsData.categories.map(ensureCategoryLoaded));
     allFlashcards = [];
     flashcardsData.categories.forEach(category => {
         category.flashcards.forEach(card => {
@@ -90,8 +153,9 @@ function loadAllFlashcards() {
 }
 
 // Load flashcards for specific category
-function loadCategoryFlashcards(categoryIndex) {
+async function loadCategoryFlashcards(categoryIndex) {
     const category = flashcardsData.categories[categoryIndex];
+    await ensureCategoryLoaded(category);
     const cardsWithMeta = category.flashcards.map(card => {
         const cardWithMeta = {
             ...card,
@@ -215,14 +279,14 @@ function shuffleCards() {
 }
 
 // Handle category change
-function handleCategoryChange() {
+async function handleCategoryChange() {
     const selectedValue = categorySelect.value;
     currentIndex = 0;
 
     if (selectedValue === 'all') {
-        loadAllFlashcards();
+        await loadAllFlashcards();
     } else {
-        loadCategoryFlashcards(parseInt(selectedValue));
+        await loadCategoryFlashcards(parseInt(selectedValue));
     }
 
     // Check if all cards in this category are mastered
@@ -404,16 +468,16 @@ function markCurrentCardAsMastered(event) {
     }, 200);
 }
 
-function handleAllCardsMastered() {
+async function handleAllCardsMastered() {
     showToast('All mastered! Deck reset.');
     resetMasteredCards();
 
     // Reload based on current category selection
     const selectedValue = categorySelect.value;
     if (selectedValue === 'all') {
-        loadAllFlashcards();
+        await loadAllFlashcards();
     } else {
-        loadCategoryFlashcards(parseInt(selectedValue));
+        await loadCategoryFlashcards(parseInt(selectedValue));
     }
 
     currentIndex = 0;
@@ -532,7 +596,7 @@ function handleClearAPIKey() {
     }
 }
 
-function handleResetProgress() {
+async function handleResetProgress() {
     const masteredCount = getMasteredCount();
     if (masteredCount === 0) {
         showToast('No mastered cards to reset');
@@ -545,9 +609,9 @@ function handleResetProgress() {
         // Reload current deck
         const selectedValue = categorySelect.value;
         if (selectedValue === 'all') {
-            loadAllFlashcards();
+            await loadAllFlashcards();
         } else {
-            loadCategoryFlashcards(parseInt(selectedValue));
+            await loadCategoryFlashcards(parseInt(selectedValue));
         }
 
         currentIndex = 0;
@@ -3,9 +3,37 @@ Jeopardy Scraper Module
 
 This module provides functionality to scrape Jeopardy games from J-Archive
 and store them in a SQLite database.
+
+Names are imported from their submodules on first use, so database-only
+code (`from scraper import JeopardyDatabase`) doesn't load requests and the
+rest of the scraping stack.
 """
 
-from .jarchive_scraper import scrape_jarchive_game, save_to_json
-from .database import JeopardyDatabase
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'scrape_jarchive_game': 'jarchive_scraper',
+    'save_to_json': 'jarchive_scraper',
+    'parse_game_html': 'game_parser',
+    'JArchiveFetcher': 'fetcher',
+    'JeopardyDatabase': 'database',
+    'DatabasePool': 'db_pool',
+    'Clue': 'records',
+    'Game': 'records',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    # Cache it so later lookups don't come back here
+    globals()[name] = value
+    return value
+
 
-__all__ = ['scrape_jarchive_game', 'save_to_json', 'JeopardyDatabase']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Answer normalization and grading
+
+A typed response and a stored J-Archive answer only compare well once both
+are normalized: HTML remnants, accents, punctuation and case go, and so do
+the "What is ..." question form and leading articles. J-Archive answers
+also carry alternates in parentheses: an optional part ("(George)
+Washington": "Washington" or "George Washington") or an explicit
+alternative ("Burma (or Myanmar)"). `aliases` turns an answer into every
+normalized form that counts as correct; JeopardyDatabase stores them per
+clue at insert time, so grading a response is a set lookup plus, for near
+misses, an edit distance that gives up as soon as it exceeds the typo
+budget (see JeopardyDatabase.grade_responses).
+"""
+
+import html
+import re
+import unicodedata
+from typing import Iterable, List, NamedTuple, Optional
+
+
+_TAG = re.compile(r"<[^>]*>")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_QUESTION = re.compile(r"^(?:(?:what|who|where|when|which)(?:s| (?:is|are|was|were)) )")
+_ARTICLE = re.compile(r"^(?:the|a|an) ")
+_GROUP = re.compile(r"[(\[]([^)\]]*)[)\]]")
+# Parenthesized text that introduces an alternative rather than an optional part
+_ALTERNATIVE = re.compile(r"^\s*(?:or|accept(?:ed)?:?|also)\s+", re.IGNORECASE)
+
+
+class Grade(NamedTuple):
+    """How one response fared against a clue's answer"""
+    clue_id: int
+    correct: bool
+    score: float            # 1.0 exact; 1 - edits/length for an accepted typo; 0.0 otherwise
+    alias: Optional[str]    # The normalized form that matched
+
+
+def normalize(text: Optional[str]) -> str:
+    """
+    Normalized form of an answer or a response
+
+    "What is <i>the</i> Café Procope?" -> "cafe procope"
+    """
+    text = html.unescape(_TAG.sub(' ', text or ''))
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    text = text.replace('&', ' and ').replace("'", '').replace('’', '')
+    text = _NON_WORD.sub(' ', text).strip()
+    text = _QUESTION.sub('', text)
+    return _ARTICLE.sub('', text)
+
+
+def aliases(answer: Optional[str]) -> List[str]:
+    """
+    Every normalized form of an answer that counts as correct, primary first
+
+    The primary form drops all parenthesized text. Optional parts are also
+    accepted written out, and "(or X)" / "(accept X)" alternatives on
+    their own.
+    """
+    answer = html.unescape(_TAG.sub(' ', answer or ''))
+    forms = [normalize(_GROUP.sub(' ', answer))]
+
+    written_out = answer
+    for group in _GROUP.finditer(answer):
+        content = group.group(1)
+        if _ALTERNATIVE.match(content):
+            forms.append(normalize(_ALTERNATIVE.sub('', content)))
+            written_out = written_out.replace(group.group(0), ' ')
+    forms.append(normalize(_GROUP.sub(lambda group: f" {group.group(1)} ", written_out)))
+
+    return [form for form in dict.fromkeys(forms) if form]
+
+
+def typo_budget(alias: str) -> int:
+    """Edits a response may be away from an alias: none up to 4 letters, 1 up to 9, then 2"""
+    length = len(alias.replace(' ', ''))
+    if length <= 4:
+        return 0
+    return 1 if length <= 9 else 2
+
+
+def edit_distance(first: str, second: str, limit: int) -> Optional[int]:
+    """
+    Levenshtein distance, or None once it is certain to exceed `limit`
+
+    A common prefix and suffix are skipped (a typo leaves most of the
+    string alone), only the diagonal band of width 2 * limit + 1 is
+    computed, and the scan stops at the first row whose band is entirely
+    over the limit, so a clearly wrong response costs a few cells rather
+    than a full table.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return None
+    if first == second:
+        return 0
+
+    start = 0
+    while start < len(first) and start < len(second) and first[start] == second[start]:
+        start += 1
+    end = 0
+    while end < len(first) - start and end < len(second) - start and first[-1 - end] == second[-1 - end]:
+        end += 1
+    first = first[start:len(first) - end]
+    second = second[start:len(second) - end]
+
+    over = limit + 1
+    previous = [column if column <= limit else over for column in range(len(second) + 1)]
+    for row, char in enumerate(first, 1):
+        current = [over] * (len(second) + 1)
+        if row <= limit:
+            current[0] = row
+        low = max(1, row - limit)
+        high = min(len(second), row + limit)
+        for column in range(low, high + 1):
+            current[column] = min(
+                previous[column - 1] + (char != second[column - 1]),
+                previous[column] + 1,
+                current[column - 1] + 1,
+                over
+            )
+        if min(current[low - 1:high + 1]) > limit:
+            return None
+        previous = current
+
+    return previous[-1] if previous[-1] <= limit else None
+
+
+def grade(clue_id: int, response: str, forms: Iterable[str]) -> Grade:
+    """
+    Grade a normalized response against a clue's normalized aliases
+
+    Args:
+        clue_id: Clue being answered (copied into the Grade)
+        response: normalize()d response
+        forms: The clue's aliases()
+
+    Returns:
+        Grade
+    """
+    forms = list(forms)
+    if response in forms:
+        return Grade(clue_id, True, 1.0, response)
+
+    best = Grade(clue_id, False, 0.0, None)
+    if not response:
+        return best
+    for form in forms:
+        distance = edit_distance(response, form, typo_budget(form))
+        if distance is not None:
+            score = 1 - distance / max(len(response), len(form))
+            if score > best.score:
+                best = Grade(clue_id, True, round(score, 4), form)
+    return best
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Jeopardy board layout: dollar values by round and air date
+
+Kept apart from game_parser so the database can use it without loading
+the HTML parser.
+"""
+
+from typing import List, Optional
+
+
+# Board values by row. Both rounds were doubled for games aired from
+# VALUES_DOUBLED_ON; earlier games used half these amounts
+ROUND_VALUES = ['$200', '$400', '$600', '$800', '$1000']
+DOUBLE_JEOPARDY_VALUES = ['$400', '$800', '$1200', '$1600', '$2000']
+VALUES_DOUBLED_ON = '2001-11-26'
+
+
+def board_values(round_name: str, air_date: Optional[str] = None) -> List[str]:
+    """
+    Dollar values of a round's five rows, top to bottom
+
+    Args:
+        round_name: 'jeopardy_round' or 'double_jeopardy_round'
+        air_date: Air date (YYYY-MM-DD); games before VALUES_DOUBLED_ON
+            used half the current values. Unknown dates get current values
+    """
+    values = DOUBLE_JEOPARDY_VALUES if round_name == 'double_jeopardy_round' else ROUND_VALUES
+    if air_date and air_date < VALUES_DOUBLED_ON:
+        return [f"${int(value[1:]) // 2}" for value in values]
+    return values
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Streaming bulk export and import of games as NDJSON
+
+An export is one game per line (the scraper's game dictionary, compact
+JSON with sorted keys), optionally gzip- or zstd-compressed, plus a
+`<file>.manifest.json` sidecar with the game/clue counts and the SHA-256
+of the uncompressed lines. Games are written in game_id order from a
+streaming query, so memory use is constant and the same database always
+produces the same checksum whatever the compression. Exporting a database
+rebuilt from an export must give the checksum in its manifest, which is
+how round trips are verified.
+
+Imports read either an export or a directory of per-game JSON files
+(data/json), decode them on a process pool and load them into the
+database through insert_games' batched transactions.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from .database import SCHEMA_VERSION, JeopardyDatabase
+except ImportError:
+    # Imported as a top-level module (e.g. from run_scraper.py)
+    from database import SCHEMA_VERSION, JeopardyDatabase
+
+
+FORMAT = 'jeopardy-games-ndjson'
+FORMAT_VERSION = 2
+
+# File suffix -> compression name
+COMPRESSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+
+MANIFEST_SUFFIX = '.manifest.json'
+
+# Lines (or JSON files) handed to a decoder process at a time
+DECODE_BATCH = 200
+
+
+def compression_for(path: Path) -> Optional[str]:
+    """Compression implied by a file name ('gzip', 'zstd' or None)"""
+    return COMPRESSIONS.get(Path(path).suffix)
+
+
+def _require_zstd():
+    if zstandard is None:
+        raise RuntimeError("zstd compression needs the 'zstandard' package (pip install zstandard)")
+
+
+def open_stream(path: Path, mode: str, compression: Optional[str] = None) -> io.TextIOBase:
+    """
+    Open an export for reading ('r') or writing ('w') as UTF-8 text
+
+    Args:
+        path: File path
+        mode: 'r' or 'w'
+        compression: 'gzip', 'zstd' or None (default: from the file suffix)
+    """
+    compression = compression if compression is not None else compression_for(path)
+
+    if compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=6)
+
+    if compression == 'zstd':
+        _require_zstd()
+        raw = open(path, mode + 'b')
+        if mode == 'w':
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding='utf-8', newline='\n')
+
+    return open(path, mode, encoding='utf-8', newline='\n')
+
+
+def game_line(game: Dict) -> str:
+    """The canonical NDJSON line for a game (no trailing newline)"""
+    return json.dumps(game, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+
+def manifest_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + MANIFEST_SUFFIX)
+
+
+def _clue_count(game: Dict) -> int:
+    return (
+        len(game.get('jeopardy_round') or [])
+        + len(game.get('double_jeopardy_round') or [])
+        + (1 if game.get('final_jeopardy') else 0)
+    )
+
+
+def export_games(
+    db: JeopardyDatabase,
+    path: Path,
+    start_date: str = None,
+    end_date: str = None,
+    game_ids: Optional[Iterable[int]] = None,
+    compression: Optional[str] = None
+) -> Dict:
+    """
+    Stream the database (or a slice of it) to an NDJSON export
+
+    The data is written to a temporary file that replaces `path` only once
+    it is complete; the manifest is written last.
+
+    Args:
+        db: Database to export
+        path: Output file; a .gz or .zst suffix selects the compression
+        start_date: Only games aired on or after this date
+        end_date: Only games aired on or before this date
+        game_ids: Only these games
+        compression: Override the compression implied by the suffix
+
+    Returns:
+        The manifest dictionary
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    game_ids = sorted(set(game_ids)) if game_ids is not None else None
+    compression = compression if compression is not None else compression_for(path)
+    tmp = path.with_name(path.name + '.tmp')
+
+    digest = hashlib.sha256()
+    games = clues = 0
+    with open_stream(tmp, 'w', compression) as f:
+        for game in db.iter_games(start_date=start_date, end_date=end_date, game_ids=game_ids):
+            line = game_line(game) + '\n'
+            digest.update(line.encode('utf-8'))
+            f.write(line)
+            games += 1
+            clues += _clue_count(game)
+    os.replace(tmp, path)
+
+    manifest = {
+        'format': FORMAT,
+        'format_version': FORMAT_VERSION,
+        'schema_version': SCHEMA_VERSION,
+        'compression': compression,
+        'games': games,
+        'clues': clues,
+        'sha256': digest.hexdigest(),
+        'filters': {
+            'start_date': start_date,
+            'end_date': end_date,
+            'game_ids': len(game_ids) if game_ids is not None else None,
+        },
+        'exported_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    manifest_path(path).write_text(json.dumps(manifest, indent=2) + "\n", encoding='utf-8')
+    return manifest
+
+
+def read_manifest(path: Path) -> Optional[Dict]:
+    """The manifest next to an export, or None if there isn't one"""
+    sidecar = manifest_path(path)
+    if not sidecar.exists():
+        return None
+    with open(sidecar, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def verify_export(path: Path) -> Dict:
+    """
+    Re-read an export and check it against its manifest
+
+    Returns:
+        Dictionary with games, clues and sha256 as read from the file, the
+        manifest (None if missing) and 'ok'
+    """
+    digest = hashlib.sha256()
+    games = clues = 0
+    with open_stream(path, 'r') as f:
+        for line in f:
+            digest.update(line.encode('utf-8'))
+            games += 1
+            clues += _clue_count(json.loads(line))
+
+    manifest = read_manifest(path)
+    result = {'games': games, 'clues': clues, 'sha256': digest.hexdigest(), 'manifest': manifest}
+    result['ok'] = manifest is not None and all(
+        manifest[key] == result[key] for key in ('games', 'clues', 'sha256')
+    )
+    return result
+
+
+def database_checksum(db: JeopardyDatabase, game_ids: Optional[Iterable[int]] = None) -> Dict:
+    """
+    Games, clues and SHA-256 an export of the database would have
+
+    Comparing this with an export's manifest verifies a round trip
+    without writing anything.
+    """
+    digest = hashlib.sha256()
+    games = clues = 0
+    for game in db.iter_games(game_ids=game_ids):
+        digest.update((game_line(game) + '\n').encode('utf-8'))
+        games += 1
+        clues += _clue_count(game)
+    return {'games': games, 'clues': clues, 'sha256': digest.hexdigest()}
+
+
+def _decode_lines(lines: List[str]) -> List[Dict]:
+    """Decode a batch of NDJSON lines (runs in a worker process)"""
+    return [json.loads(line) for line in lines]
+
+
+def _load_files(paths: List[str]) -> List[Dict]:
+    """Read a batch of per-game JSON files (runs in a worker process)"""
+    games = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            games.append(json.load(f))
+    return games
+
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _bounded_map(executor: Optional[Executor], func: Callable, items: Iterable, window: int) -> Iterator:
+    """
+    Like executor.map, but with at most `window` tasks in flight
+
+    executor.map submits everything up front, which would read a whole
+    export into memory. None runs func in this process.
+    """
+    if executor is None:
+        yield from map(func, items)
+        return
+
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def json_dir_files(directory: Path) -> List[Path]:
+    """Per-game JSON files written by save_to_json, in game_id order"""
+    def game_id(path: Path) -> int:
+        suffix = path.stem.rsplit('_', 1)[-1]
+        return int(suffix) if suffix.isdigit() else -1
+
+    return sorted(Path(directory).glob('jeopardy_game_*.json'), key=game_id)
+
+
+def import_games(
+    db: JeopardyDatabase,
+    source: Path,
+    workers: Optional[int] = None,
+    batch_size: int = 500,
+    replace: bool = False,
+    verify: bool = False
+) -> Dict:
+    """
+    Load an export or a directory of per-game JSON files into a database
+
+    Decoding runs on `workers` processes while this process writes
+    batches of `batch_size` games per transaction. Large loads drop and
+    rebuild the secondary indexes (see insert_games).
+
+    Args:
+        db: Database to load into
+        source: An NDJSON export (.ndjson, .ndjson.gz, .ndjson.zst) or a
+            directory of jeopardy_game_*.json files
+        workers: Decoder processes (default: CPU count; 1 decodes in this
+            process)
+        batch_size: Games per transaction
+        replace: Replace games that are already stored instead of
+            skipping them
+        verify: For exports, re-read the imported games from the
+            database afterwards and compare their checksum with the
+            manifest ('round_trip_ok')
+
+    Returns:
+        Dictionary with games read, games inserted and, for exports,
+        whether the file matched the manifest ('checksum_ok') and, with
+        verify, whether the database now holds the same data
+        ('round_trip_ok'). Both are None when there is nothing to check
+    """
+    source = Path(source)
+    workers = workers or os.cpu_count() or 1
+    stats = {'read': 0, 'inserted': 0, 'checksum_ok': None, 'round_trip_ok': None}
+    game_ids = []
+
+    if source.is_dir():
+        files = json_dir_files(source)
+        expected = len(files)
+        batches = _batches((str(path) for path in files), DECODE_BATCH)
+        decode = _load_files
+        digest = None
+        manifest = None
+    else:
+        manifest = read_manifest(source)
+        expected = manifest['games'] if manifest else None
+        digest = hashlib.sha256()
+
+        def lines():
+            with open_stream(source, 'r') as f:
+                for line in f:
+                    digest.update(line.encode('utf-8'))
+                    yield line
+
+        batches = _batches(lines(), DECODE_BATCH)
+        decode = _decode_lines
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        def decoded_games():
+            for games in _bounded_map(executor, decode, batches, window=workers * 2):
+                for game in games:
+                    stats['read'] += 1
+                    game_ids.append(game['game_id'])
+                    yield game
+                if stats['read'] % 5000 < len(games):
+                    print(f"  {stats['read']} games read")
+
+        stats['inserted'] = db.insert_games(
+            decoded_games(),
+            batch_size=batch_size,
+            replace=replace,
+            rebuild_indexes=expected is None or expected >= 1000
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if manifest is not None:
+        stats['checksum_ok'] = (
+            digest.hexdigest() == manifest['sha256'] and stats['read'] == manifest['games']
+        )
+        if verify:
+            result = database_checksum(db, game_ids=game_ids)
+            stats['round_trip_ok'] = all(result[key] == manifest[key] for key in ('games', 'clues', 'sha256'))
+    return stats
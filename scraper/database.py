@@ -3,21 +3,313 @@
 Database module for storing Jeopardy game data in SQLite
 """
 
+import os
+import random
+import re
 import sqlite3
 import json
+import time
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .answers import Grade, aliases, grade, normalize
+    from .board import VALUES_DOUBLED_ON, board_values
+    from .dedup import fingerprint, is_duplicate
+    from .query_cache import QueryCache, cached
+    from .records import CLUE_FIELDS, Clue, Game
+    from .scheduler import ReviewState, sm2
+except ImportError:
+    # Imported as a top-level module (e.g. from run_scraper.py)
+    from answers import Grade, aliases, grade, normalize
+    from board import VALUES_DOUBLED_ON, board_values
+    from dedup import fingerprint, is_duplicate
+    from query_cache import QueryCache, cached
+    from records import CLUE_FIELDS, Clue, Game
+    from scheduler import ReviewState, sm2
+
+
+# Schema revision, kept in PRAGMA user_version. Revision 0 stored round,
+# category and value as text on every clue row; revision 1 had no board
+# positions and Double Jeopardy values at Jeopardy amounts
+SCHEMA_VERSION = 2
+
+# Lookup ids of the standard rounds; any other round name gets the next free id
+ROUND_IDS = {'Jeopardy': 1, 'Double Jeopardy': 2, 'Final Jeopardy': 3}
+
+# Game dictionary keys of the two board rounds and their round names
+BOARD_ROUNDS = (('jeopardy_round', 'Jeopardy'), ('double_jeopardy_round', 'Double Jeopardy'))
+
+# Titles and URLs in these forms are rebuilt on read instead of being stored
+GAME_TITLE_FORMAT = "J! Archive - Show #{show_number}, aired {air_date}"
+GAME_TITLE_PATTERN = re.compile(r"Show #(\d+), aired (\d{4}-\d{2}-\d{2})")
+GAME_URL_FORMAT = "https://j-archive.com/showgame.php?game_id={game_id}"
+
+# Secondary indexes that only serve reads; bulk loads may drop and rebuild them
+SECONDARY_INDEXES = {
+    'idx_clues_round': "CREATE INDEX IF NOT EXISTS idx_clues_round ON clues(round_id)",
+    'idx_clues_category': "CREATE INDEX IF NOT EXISTS idx_clues_category ON clues(category_id)",
+}
+
+# Page size of serving snapshots. Larger pages mean shallower b-trees and
+# fewer reads from a cold file; the write amplification they cost the
+# scraper doesn't matter for a file that is never written again. (With the
+# file in the page cache, 4-16 KB pages measure the same.)
+SNAPSHOT_PAGE_SIZE = 16384
+
+# Largest memory map SQLite accepts by default (SQLITE_MAX_MMAP_SIZE)
+MAX_MMAP_SIZE = 0x7fff0000
+
+# A clue's value as the scraper wrote it ("$400", "" for Final Jeopardy)
+VALUE_TEXT = """
+        CASE
+            WHEN c.value IS NOT NULL THEN '$' || c.value
+            WHEN c.round_id = 3 THEN ''
+            ELSE 'Unknown'
+        END"""
+
+# Column list shared by every query that returns clue dictionaries. The
+# lookups and CASE/COALESCE turn the compact columns back into the strings
+# the scraper produced, so callers get the same dictionaries as before.
+# The columns are in the order of records.Clue's fields
+CLUE_SELECT = """
+    SELECT
+        c.id,
+        c.game_id,
+        g.show_number,
+        g.air_date,
+        r.name as round,
+        cat.name as category,""" + VALUE_TEXT + """ as value,
+        c.clue,
+        c.answer,
+        c.daily_double,
+        COALESCE(g.title, 'J! Archive - Show #' || g.show_number || ', aired ' || g.air_date) as game_title
+    FROM clues c
+    JOIN games g ON c.game_id = g.game_id
+    JOIN rounds r ON r.round_id = c.round_id
+    JOIN categories cat ON cat.category_id = c.category_id
+"""
+
+# Full-text index over clue text. It is an external-content table reading
+# from the clue_text view, so the text lives only in `clues`; the triggers
+# below keep the index in step with it
+SEARCH_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS clues_fts USING fts5(
+        category,
+        clue,
+        answer,
+        content='clue_text',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+SEARCH_TRIGGERS = {
+    'clues_fts_insert': """
+        CREATE TRIGGER IF NOT EXISTS clues_fts_insert AFTER INSERT ON clues BEGIN
+            INSERT INTO clues_fts(rowid, category, clue, answer)
+            VALUES (
+                new.id,
+                (SELECT name FROM categories WHERE category_id = new.category_id),
+                new.clue,
+                new.answer
+            );
+        END
+    """,
+    'clues_fts_delete': """
+        CREATE TRIGGER IF NOT EXISTS clues_fts_delete AFTER DELETE ON clues BEGIN
+            INSERT INTO clues_fts(clues_fts, rowid, category, clue, answer)
+            VALUES (
+                'delete',
+                old.id,
+                (SELECT name FROM categories WHERE category_id = old.category_id),
+                old.clue,
+                old.answer
+            );
+        END
+    """,
+    'clues_fts_update': """
+        CREATE TRIGGER IF NOT EXISTS clues_fts_update AFTER UPDATE OF category_id, clue, answer ON clues BEGIN
+            INSERT INTO clues_fts(clues_fts, rowid, category, clue, answer)
+            VALUES (
+                'delete',
+                old.id,
+                (SELECT name FROM categories WHERE category_id = old.category_id),
+                old.clue,
+                old.answer
+            );
+            INSERT INTO clues_fts(rowid, category, clue, answer)
+            VALUES (
+                new.id,
+                (SELECT name FROM categories WHERE category_id = new.category_id),
+                new.clue,
+                new.answer
+            );
+        END
+    """,
+}
+
+SEARCH_FIELDS = ('category', 'clue', 'answer')
+
+# Counters kept current by triggers so get_stats never scans the clues table
+STATS_COUNTERS = ('total_games', 'total_clues', 'unique_categories')
+
+STATS_TRIGGERS = {
+    'stats_game_insert': """
+        CREATE TRIGGER IF NOT EXISTS stats_game_insert AFTER INSERT ON games BEGIN
+            UPDATE stats SET value = value + 1 WHERE name = 'total_games';
+        END
+    """,
+    'stats_game_delete': """
+        CREATE TRIGGER IF NOT EXISTS stats_game_delete AFTER DELETE ON games BEGIN
+            UPDATE stats SET value = value - 1 WHERE name = 'total_games';
+        END
+    """,
+    'stats_clue_insert': """
+        CREATE TRIGGER IF NOT EXISTS stats_clue_insert AFTER INSERT ON clues BEGIN
+            INSERT INTO category_counts (category_id, clue_count) VALUES (new.category_id, 1)
+                ON CONFLICT(category_id) DO UPDATE SET clue_count = clue_count + 1;
+            UPDATE stats SET value = value + 1 WHERE name = 'total_clues';
+        END
+    """,
+    'stats_clue_delete': """
+        CREATE TRIGGER IF NOT EXISTS stats_clue_delete AFTER DELETE ON clues BEGIN
+            UPDATE category_counts SET clue_count = clue_count - 1 WHERE category_id = old.category_id;
+            DELETE FROM category_counts WHERE category_id = old.category_id AND clue_count <= 0;
+            UPDATE stats SET value = value - 1 WHERE name = 'total_clues';
+        END
+    """,
+    'stats_clue_update': """
+        CREATE TRIGGER IF NOT EXISTS stats_clue_update AFTER UPDATE OF category_id ON clues
+        WHEN old.category_id IS NOT new.category_id BEGIN
+            UPDATE category_counts SET clue_count = clue_count - 1 WHERE category_id = old.category_id;
+            DELETE FROM category_counts WHERE category_id = old.category_id AND clue_count <= 0;
+            INSERT INTO category_counts (category_id, clue_count) VALUES (new.category_id, 1)
+                ON CONFLICT(category_id) DO UPDATE SET clue_count = clue_count + 1;
+        END
+    """,
+    'stats_category_insert': """
+        CREATE TRIGGER IF NOT EXISTS stats_category_insert AFTER INSERT ON category_counts BEGIN
+            UPDATE stats SET value = value + 1 WHERE name = 'unique_categories';
+        END
+    """,
+    'stats_category_delete': """
+        CREATE TRIGGER IF NOT EXISTS stats_category_delete AFTER DELETE ON category_counts BEGIN
+            UPDATE stats SET value = value - 1 WHERE name = 'unique_categories';
+        END
+    """,
+}
+
+# Per-game progress of a crawl: queued, stored (or unchanged), failed with an
+# error, or fetched but without any clues (no such game on J-Archive yet)
+CRAWL_STATUSES = ('pending', 'done', 'failed', 'empty')
+
+# Random ids probed before sampling falls back to enumerating the matching
+# ids (i.e. when the filters are very selective)
+PROBE_LIMIT = 8192
+
+
+def value_to_int(value: Optional[str]) -> Optional[int]:
+    """Convert a clue value like "$1,000" to 1000 (None if it isn't a dollar amount)"""
+    match = re.fullmatch(r'\$([\d,]+)', (value or '').strip())
+    return int(match.group(1).replace(',', '')) if match else None
+
+
+def _stored_title(title: str, show_number: Optional[int], air_date: Optional[str]) -> Optional[str]:
+    """The title to store: None when it can be rebuilt from show number and air date"""
+    if show_number is not None and air_date:
+        if title == GAME_TITLE_FORMAT.format(show_number=show_number, air_date=air_date):
+            return None
+    return title
+
+
+def _stored_url(url: str, game_id: int) -> Optional[str]:
+    """The URL to store: None when it is the game's J-Archive URL"""
+    return None if url == GAME_URL_FORMAT.format(game_id=game_id) else url
+
+
+def _with_board_positions(game: Dict) -> Dict:
+    """
+    Fill in what game dictionaries from older parsers lack
+
+    Before board positions were scraped (e.g. older data/json files),
+    games had no show number or air date outside the title, no row or
+    column per clue, and $200-$1000 values in both rounds. The same rules
+    _migrate_board_positions applies to stored games fill them in here:
+    the row follows from the value, the value is then corrected for the
+    round and air date (board_values), and the columns follow the order in
+    which categories first appear. Double Jeopardy rounds that already
+    have amounts over $1000 keep their values. Games with positions are
+    returned unchanged.
+    """
+    board_keys = [key for key, _ in BOARD_ROUNDS if game.get(key)]
+    if not board_keys or any('row' in clue for key in board_keys for clue in game[key]):
+        return game
+
+    game = dict(game)
+    title = GAME_TITLE_PATTERN.search(game.get('title') or '')
+    if title:
+        if game.get('show_number') is None:
+            game['show_number'] = int(title.group(1))
+        if not game.get('air_date'):
+            game['air_date'] = title.group(2)
+
+    for key in board_keys:
+        clues = game[key]
+        values = board_values(key, game.get('air_date'))
+        stored = [value_to_int(clue.get('value')) for clue in clues]
+        doubled = key == 'double_jeopardy_round' and any(value and value > 1000 for value in stored)
+        step = 400 if doubled else 200
+        names = (game.get('categories') or {}).get(key) or list(
+            dict.fromkeys(clue.get('category', '') for clue in clues)
+        )
+        columns = {name: position for position, name in enumerate(names)}
+
+        game[key] = []
+        for clue, value in zip(clues, stored):
+            clue = dict(clue, row=None, column=columns.get(clue.get('category', '')))
+            if value in range(step, 5 * step + 1, step):
+                clue['row'] = value // step - 1
+                if not doubled:
+                    clue['value'] = values[clue['row']]
+            game[key].append(clue)
+    return game
 
 
 class JeopardyDatabase:
     """Handles all database operations for Jeopardy data"""
 
-    def __init__(self, db_path: str = None):
+    def __init__(
+        self,
+        db_path: str = None,
+        read_only: bool = False,
+        check_same_thread: bool = True,
+        immutable: bool = False,
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None
+    ):
         """
         Initialize database connection
 
         Args:
             db_path: Path to SQLite database file. Defaults to data/jeopardy.db
+            read_only: Open an existing database for reading only. Skips
+                schema setup, refuses writes and memory-maps the file
+            check_same_thread: Passed to sqlite3.connect. Set to False when
+                the handle is shared between threads under an external lock
+            immutable: Open a snapshot (see snapshot()) that nothing writes
+                to; implies read_only. SQLite skips file locking and change
+                detection and the whole file is memory-mapped. Don't use it
+                on the scraper's live database
+            cache_size: Keep up to this many results of the repeatable
+                lookups (get_clues_by_show_number, get_game_board,
+                get_stats, get_category_counts) in an in-process LRU; 0
+                disables it. Any committed change to the database, through
+                this handle or another connection, empties it. The cache
+                belongs to this handle; callers get copies of its results
+            cache_ttl: Seconds a cached result stays valid (default: until
+                the next write)
         """
         if db_path is None:
             # Default to data/jeopardy.db relative to project root
@@ -25,318 +317,2503 @@ class JeopardyDatabase:
             db_path = project_root / "data" / "jeopardy.db"
 
         self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.read_only = read_only or immutable
+        self.immutable = immutable
+
+        if self.read_only:
+            flags = "mode=ro&immutable=1" if immutable else "mode=ro"
+            self.conn = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?{flags}",
+                uri=True,
+                check_same_thread=check_same_thread
+            )
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.db_path), check_same_thread=check_same_thread)
 
-        self.conn = sqlite3.connect(str(self.db_path))
         self.conn.row_factory = sqlite3.Row  # Enable column access by name
         self.cursor = self.conn.cursor()
+        self.has_search = False
+        self.has_stats = False
+        self.has_duplicates = False
+        self.cache = QueryCache(cache_size, cache_ttl) if cache_size else None
+
+        if self.read_only:
+            self._configure_reader()
+        else:
+            self._configure_connection()
+            self._create_tables()
+
+    def _configure_reader(self):
+        """Set up a read-only handle; the schema is left to the writer"""
+        self.cursor.execute("PRAGMA query_only = ON")
+        # Serve reads straight from the OS page cache (256 MB window). A
+        # snapshot can't change underneath the map, so all of it is mapped
+        mmap_size = 268435456
+        if self.immutable:
+            mmap_size = min(max(mmap_size, self.db_path.stat().st_size), MAX_MMAP_SIZE)
+        self.cursor.execute(f"PRAGMA mmap_size = {mmap_size}")
+        self.cursor.execute("PRAGMA cache_size = -16384")
+        self.cursor.execute("PRAGMA temp_store = MEMORY")
+
+        if self._needs_migration():
+            raise RuntimeError(
+                f"{self.db_path} uses an older schema; open it read-write once "
+                "(or run `run_scraper.py migrate`) to upgrade it"
+            )
+
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'clues_fts'")
+        self.has_search = self.cursor.fetchone() is not None
 
-        self._create_tables()
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'stats'")
+        self.has_stats = self.cursor.fetchone() is not None
+
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'clue_duplicates'")
+        self.has_duplicates = self.cursor.fetchone() is not None
+
+    def _data_version(self) -> Tuple[int, int]:
+        """
+        Changes whenever the database does: rows changed through this
+        connection, and SQLite's counter of commits by other connections
+        """
+        if self.immutable:
+            return (0, 0)
+        return self.conn.total_changes, self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _configure_connection(self):
+        """Tune SQLite for a write-heavy scraper with concurrent readers"""
+        # WAL lets the quiz app read while the scraper writes, and with WAL
+        # synchronous=NORMAL only fsyncs at checkpoints instead of every commit
+        self.cursor.execute("PRAGMA journal_mode = WAL")
+        self.cursor.execute("PRAGMA synchronous = NORMAL")
+        # 64 MB page cache (negative values are in KiB)
+        self.cursor.execute("PRAGMA cache_size = -65536")
+        self.cursor.execute("PRAGMA temp_store = MEMORY")
 
     def _create_tables(self):
         """Create database schema if it doesn't exist"""
 
-        # Games table
+        migrate = self._needs_migration()
+        if migrate:
+            self.cursor.execute("PRAGMA user_version")
+            if self.cursor.fetchone()[0] < 1:
+                # Add show_number column if it doesn't exist (for existing databases)
+                try:
+                    self.cursor.execute("SELECT show_number FROM games LIMIT 1")
+                except sqlite3.OperationalError:
+                    print("Adding show_number column to existing database...")
+                    self.cursor.execute("ALTER TABLE games ADD COLUMN show_number INTEGER")
+                    self.conn.commit()
+
+                self._migrate_schema()
+            self._migrate_board_positions()
+        else:
+            self._create_core_tables()
+            self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        # Create indices for better query performance
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_clues_game_id
+            ON clues(game_id)
+        """)
+
+        for index_sql in SECONDARY_INDEXES.values():
+            self.cursor.execute(index_sql)
+
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_games_show_number
+            ON games(show_number)
+        """)
+
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_games_air_date
+            ON games(air_date)
+        """)
+
+        # ETag/Last-Modified of each stored game's page, for conditional re-scrapes
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS page_validators (
+                game_id INTEGER PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT
+            )
+        """)
+
+        # Clues as the scraper returns them, for ad-hoc SQL against the database
+        self.cursor.execute("CREATE VIEW IF NOT EXISTS clue_details AS" + CLUE_SELECT)
+
+        # Checkpoints for resumable crawls
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_state (
+                game_id INTEGER PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        self._create_review_tables()
+        self._create_duplicate_index()
+        self._create_answer_index()
+        self._create_search_index()
+        self._create_stats_tables()
+
+        self.conn.commit()
+
+        if migrate:
+            self.analyze()
+
+    def _create_core_tables(self):
+        """Create the games, clues and lookup tables"""
+
+        # Games table. title and url are NULL when they follow
+        # GAME_TITLE_FORMAT / GAME_URL_FORMAT
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS games (
                 game_id INTEGER PRIMARY KEY,
                 show_number INTEGER,
-                title TEXT NOT NULL,
-                url TEXT NOT NULL,
+                title TEXT,
+                url TEXT,
                 air_date TEXT,
                 scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
-        # Add show_number column if it doesn't exist (for existing databases)
-        try:
-            self.cursor.execute("SELECT show_number FROM games LIMIT 1")
-        except sqlite3.OperationalError:
-            print("Adding show_number column to existing database...")
-            self.cursor.execute("ALTER TABLE games ADD COLUMN show_number INTEGER")
-            self.conn.commit()
+        # Lookup tables for the strings every clue used to repeat
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS rounds (
+                round_id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+        """)
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO rounds (round_id, name) VALUES (?, ?)",
+            [(round_id, name) for name, round_id in ROUND_IDS.items()]
+        )
+
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS categories (
+                category_id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+        """)
 
-        # Clues table
+        # Clues table. value is in dollars, NULL when the board shows none.
+        # board_row (0-4, top to bottom) and board_column (0-5, left to
+        # right) place the clue on its board; NULL for Final Jeopardy
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS clues (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 game_id INTEGER NOT NULL,
-                round TEXT NOT NULL,
-                category TEXT NOT NULL,
-                value TEXT NOT NULL,
+                round_id INTEGER NOT NULL,
+                category_id INTEGER NOT NULL,
+                value INTEGER,
                 clue TEXT NOT NULL,
                 answer TEXT,
                 daily_double BOOLEAN DEFAULT 0,
-                FOREIGN KEY (game_id) REFERENCES games(game_id)
+                board_row INTEGER,
+                board_column INTEGER,
+                FOREIGN KEY (game_id) REFERENCES games(game_id),
+                FOREIGN KEY (round_id) REFERENCES rounds(round_id),
+                FOREIGN KEY (category_id) REFERENCES categories(category_id)
             )
         """)
 
-        # Create indices for better query performance
+        # Category order of each board as broadcast, including categories
+        # whose clues all went unrevealed
         self.cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_clues_game_id
-            ON clues(game_id)
+            CREATE TABLE IF NOT EXISTS board_categories (
+                game_id INTEGER NOT NULL,
+                round_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                category_id INTEGER NOT NULL,
+                PRIMARY KEY (game_id, round_id, position)
+            ) WITHOUT ROWID
         """)
 
+    def _create_review_tables(self):
+        """Create the spaced-repetition tables (see record_reviews)"""
         self.cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_clues_round
-            ON clues(round)
+            CREATE TABLE IF NOT EXISTS users (
+                user_id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
         """)
 
+        # Current SM-2 state of every card a user has seen. Keyed by clue
+        # first so a game's review rows can be found from its clue ids;
+        # idx_review_due (which also holds clue_id, the rest of the key)
+        # answers "what is due for this user" with an index seek
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS review_state (
+                clue_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                due INTEGER NOT NULL,
+                interval REAL NOT NULL,
+                ease REAL NOT NULL,
+                repetitions INTEGER NOT NULL,
+                lapses INTEGER NOT NULL,
+                last_review INTEGER NOT NULL,
+                PRIMARY KEY (clue_id, user_id)
+            ) WITHOUT ROWID
+        """)
         self.cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_clues_category
-            ON clues(category)
+            CREATE INDEX IF NOT EXISTS idx_review_due
+            ON review_state(user_id, due)
         """)
 
+        # Every answer, appended in order
         self.cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_games_show_number
-            ON games(show_number)
+            CREATE TABLE IF NOT EXISTS review_log (
+                id INTEGER PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                clue_id INTEGER NOT NULL,
+                reviewed_at INTEGER NOT NULL,
+                grade INTEGER NOT NULL,
+                interval REAL NOT NULL,
+                ease REAL NOT NULL
+            )
+        """)
+        # Lets a refresh move a game's history to its new clue ids without
+        # scanning everyone's reviews (also created on older databases here)
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_review_log_clue
+            ON review_log(clue_id)
         """)
 
-        self.conn.commit()
+    def _create_duplicate_index(self):
+        """Create the duplicate detection tables (see dedup.py), backfilling older databases"""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'clue_duplicates'")
+        existed = self.cursor.fetchone() is not None
 
-    def game_exists(self, game_id: int) -> bool:
-        """Check if a game already exists in the database"""
-        self.cursor.execute(
-            "SELECT 1 FROM games WHERE game_id = ?",
-            (game_id,)
-        )
-        return self.cursor.fetchone() is not None
+        # Content hash of every fingerprinted clue, for exact repeats
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS clue_fingerprints (
+                clue_id INTEGER PRIMARY KEY,
+                content_hash INTEGER NOT NULL
+            )
+        """)
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_fingerprints_hash
+            ON clue_fingerprints(content_hash)
+        """)
 
-    def insert_game(self, game_data: Dict) -> bool:
-        """
-        Insert a complete game into the database
+        # One row per clue and LSH band, looked up by bucket key
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                bucket INTEGER NOT NULL,
+                clue_id INTEGER NOT NULL,
+                PRIMARY KEY (bucket, clue_id)
+            ) WITHOUT ROWID
+        """)
 
-        Args:
-            game_data: Dictionary containing game data from scraper
+        # Every clue that repeats an earlier one points at its cluster's
+        # representative, the cluster's lowest clue id. Representatives
+        # and clues without duplicates have no row
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS clue_duplicates (
+                clue_id INTEGER PRIMARY KEY,
+                representative_id INTEGER NOT NULL
+            )
+        """)
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_duplicates_representative
+            ON clue_duplicates(representative_id)
+        """)
 
-        Returns:
-            True if successful, False if game already exists
-        """
-        game_id = game_data['game_id']
+        self.has_duplicates = True
+        if not existed:
+            self.cursor.execute("SELECT 1 FROM clues LIMIT 1")
+            if self.cursor.fetchone():
+                print("Finding duplicate clues in existing games...")
+                self.rebuild_duplicate_index()
 
-        # Check if game already exists
-        if self.game_exists(game_id):
-            print(f"Game {game_id} already exists in database. Skipping.")
-            return False
+    def _create_answer_index(self):
+        """Create the normalized answer table used for grading, backfilling older databases"""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'answer_index'")
+        existed = self.cursor.fetchone() is not None
 
-        # Insert game metadata
+        # answers.aliases() of every clue with an answer: the primary form,
+        # and any other accepted forms joined with '|' (normalized text has
+        # no punctuation, so it can't contain one)
         self.cursor.execute("""
-            INSERT INTO games (game_id, show_number, title, url, air_date)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            game_id,
-            game_data.get('show_number'),
-            game_data['title'],
-            game_data['url'],
-            game_data.get('air_date')
-        ))
+            CREATE TABLE IF NOT EXISTS answer_index (
+                clue_id INTEGER PRIMARY KEY,
+                normalized TEXT NOT NULL,
+                aliases TEXT NOT NULL DEFAULT ''
+            )
+        """)
 
-        # Insert Jeopardy Round clues
-        for clue in game_data.get('jeopardy_round', []):
-            self._insert_clue(game_id, 'Jeopardy', clue)
+        if not existed:
+            self.cursor.execute("SELECT 1 FROM clues LIMIT 1")
+            if self.cursor.fetchone():
+                print("Normalizing answers of existing clues...")
+                self.rebuild_answer_index()
 
-        # Insert Double Jeopardy Round clues
-        for clue in game_data.get('double_jeopardy_round', []):
-            self._insert_clue(game_id, 'Double Jeopardy', clue)
+    def _needs_migration(self) -> bool:
+        """True if this database has clue data in an older schema revision"""
+        self.cursor.execute("PRAGMA user_version")
+        if self.cursor.fetchone()[0] >= SCHEMA_VERSION:
+            return False
 
-        # Insert Final Jeopardy
-        if game_data.get('final_jeopardy'):
-            self._insert_clue(game_id, 'Final Jeopardy', game_data['final_jeopardy'])
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'clues'")
+        return self.cursor.fetchone() is not None
+
+    def _migrate_schema(self):
+        """
+        Convert a text-column database to the compact schema in one transaction
+
+        Readers on other connections keep seeing the old tables until the
+        commit. The search index and cached statistics are dropped here and
+        rebuilt by _create_tables afterwards.
+        """
+        print("Migrating database to the compact schema...")
+
+        self.conn.create_function('value_to_int', 1, value_to_int, deterministic=True)
+        self.conn.create_function('stored_title', 3, _stored_title, deterministic=True)
+        self.conn.create_function('stored_url', 2, _stored_url, deterministic=True)
 
         self.conn.commit()
-        print(f"✓ Game {game_id} inserted into database")
-        return True
+        self.cursor.execute("BEGIN")
+        try:
+            # Triggers, views and indexes that name the old columns
+            for name in list(SEARCH_TRIGGERS) + list(STATS_TRIGGERS):
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            self.cursor.execute("DROP TABLE IF EXISTS clues_fts")
+            self.cursor.execute("DROP TABLE IF EXISTS category_counts")
+            self.cursor.execute("DROP TABLE IF EXISTS stats")
+            for name in ['idx_clues_game_id', 'idx_games_show_number', 'idx_games_air_date'] + list(SECONDARY_INDEXES):
+                self.cursor.execute(f"DROP INDEX IF EXISTS {name}")
 
-    def _insert_clue(self, game_id: int, round_name: str, clue: Dict):
-        """Insert a single clue into the database"""
-        self.cursor.execute("""
-            INSERT INTO clues (game_id, round, category, value, clue, answer, daily_double)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            game_id,
-            round_name,
-            clue.get('category', ''),
-            clue.get('value', ''),
-            clue.get('clue', ''),
-            clue.get('answer'),
-            clue.get('daily_double', False)
-        ))
+            self.cursor.execute("ALTER TABLE games RENAME TO games_v0")
+            self.cursor.execute("ALTER TABLE clues RENAME TO clues_v0")
+            self._create_core_tables()
 
-    def get_random_clue(self, exclude_final: bool = True) -> Optional[Dict]:
-        """
-        Get a random clue from the database
+            self.cursor.execute("INSERT OR IGNORE INTO rounds (name) SELECT DISTINCT round FROM clues_v0")
+            self.cursor.execute("INSERT OR IGNORE INTO categories (name) SELECT DISTINCT category FROM clues_v0")
 
-        Args:
-            exclude_final: If True, exclude Final Jeopardy clues
+            self.cursor.execute("""
+                INSERT INTO games (game_id, show_number, title, url, air_date, scraped_at)
+                SELECT
+                    game_id,
+                    show_number,
+                    stored_title(title, show_number, air_date),
+                    stored_url(url, game_id),
+                    air_date,
+                    scraped_at
+                FROM games_v0
+            """)
 
-        Returns:
-            Dictionary with clue data or None if no clues found
+            self.cursor.execute("""
+                INSERT INTO clues (id, game_id, round_id, category_id, value, clue, answer, daily_double)
+                SELECT
+                    c.id,
+                    c.game_id,
+                    r.round_id,
+                    cat.category_id,
+                    value_to_int(c.value),
+                    c.clue,
+                    c.answer,
+                    c.daily_double
+                FROM clues_v0 c
+                JOIN rounds r ON r.name = c.round
+                JOIN categories cat ON cat.name = c.category
+            """)
+
+            self.cursor.execute("DROP TABLE clues_v0")
+            self.cursor.execute("DROP TABLE games_v0")
+            self.cursor.execute("PRAGMA user_version = 1")
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+        print("Migration complete")
+
+    def _migrate_board_positions(self):
         """
-        query = """
-            SELECT
-                c.id,
-                c.game_id,
-                g.show_number,
-                g.air_date,
-                c.round,
-                c.category,
-                c.value,
-                c.clue,
-                c.answer,
-                c.daily_double,
-                g.title as game_title
-            FROM clues c
-            JOIN games g ON c.game_id = g.game_id
+        Add board positions to a revision 1 database in one transaction
+
+        Earlier parsers gave both rounds the $200-$1000 values, so a clue's
+        row follows from its value, and the values are then corrected for
+        the round and air date (see board_values). Column order is
+        recovered from the order categories first appear on the board,
+        which is exact whenever a category's top clue was revealed;
+        `run_scraper.py reparse` restores it exactly from archived pages.
         """
+        print("Adding board positions...")
 
-        if exclude_final:
-            query += " WHERE c.round != 'Final Jeopardy'"
+        self.conn.commit()
+        self.cursor.execute("BEGIN")
+        try:
+            # Only text changes need to reach the search index
+            self.cursor.execute("DROP TRIGGER IF EXISTS clues_fts_update")
 
-        query += " ORDER BY RANDOM() LIMIT 1"
+            self.cursor.execute("PRAGMA table_info(clues)")
+            columns = {row['name'] for row in self.cursor.fetchall()}
+            for column in ('board_row', 'board_column'):
+                if column not in columns:
+                    self.cursor.execute(f"ALTER TABLE clues ADD COLUMN {column} INTEGER")
+            self._create_core_tables()
 
-        self.cursor.execute(query)
-        row = self.cursor.fetchone()
+            # Games loaded from elsewhere may already have $400-$2000 in
+            # Double Jeopardy; those are left as they are
+            self.cursor.execute("""
+                CREATE TEMP TABLE doubled AS
+                SELECT DISTINCT game_id FROM clues WHERE round_id = 2 AND value > 1000
+            """)
+            self.cursor.execute("""
+                UPDATE clues SET board_row = value / 200 - 1
+                WHERE round_id IN (1, 2) AND value IN (200, 400, 600, 800, 1000)
+                    AND NOT (round_id = 2 AND game_id IN (SELECT game_id FROM temp.doubled))
+            """)
+            self.cursor.execute("""
+                UPDATE clues SET value = value * 2
+                WHERE round_id = 2 AND board_row IS NOT NULL
+                    AND game_id NOT IN (SELECT game_id FROM games WHERE air_date < ?)
+            """, (VALUES_DOUBLED_ON,))
+            self.cursor.execute("""
+                UPDATE clues SET board_row = value / 400 - 1
+                WHERE round_id = 2 AND value IN (400, 800, 1200, 1600, 2000)
+                    AND game_id IN (SELECT game_id FROM temp.doubled)
+            """)
+            self.cursor.execute("DROP TABLE temp.doubled")
+            self.cursor.execute("""
+                UPDATE clues SET value = value / 2
+                WHERE round_id = 1 AND board_row IS NOT NULL
+                    AND game_id IN (SELECT game_id FROM games WHERE air_date < ?)
+            """, (VALUES_DOUBLED_ON,))
 
-        if row:
-            return dict(row)
-        return None
+            # Clues were stored in board order (row by row), so the first
+            # clue of each category gives the column order
+            self.cursor.execute("""
+                CREATE TEMP TABLE board_order AS
+                SELECT
+                    game_id,
+                    round_id,
+                    category_id,
+                    ROW_NUMBER() OVER (PARTITION BY game_id, round_id ORDER BY first_id) - 1 AS position
+                FROM (
+                    SELECT game_id, round_id, category_id, MIN(id) AS first_id
+                    FROM clues
+                    WHERE round_id IN (1, 2)
+                    GROUP BY game_id, round_id, category_id
+                )
+            """)
+            self.cursor.execute("CREATE INDEX temp.board_order_key ON board_order(game_id, round_id, category_id)")
+            self.cursor.execute("""
+                INSERT OR IGNORE INTO board_categories (game_id, round_id, position, category_id)
+                SELECT game_id, round_id, position, category_id FROM board_order
+            """)
+            self.cursor.execute("""
+                UPDATE clues SET board_column = (
+                    SELECT position FROM board_order b
+                    WHERE b.game_id = clues.game_id
+                        AND b.round_id = clues.round_id
+                        AND b.category_id = clues.category_id
+                )
+                WHERE round_id IN (1, 2)
+            """)
+            self.cursor.execute("DROP TABLE temp.board_order")
+
+            self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+        print("Board positions added")
+
+    def _create_search_index(self):
+        """Create the FTS5 index and its triggers, backfilling older databases"""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'clues_fts'")
+        existed = self.cursor.fetchone() is not None
 
-    def get_clues_by_category(self, category: str, limit: int = 10) -> List[Dict]:
-        """Get clues from a specific category"""
         self.cursor.execute("""
-            SELECT
-                c.id,
-                c.game_id,
-                g.show_number,
-                g.air_date,
-                c.round,
-                c.category,
-                c.value,
-                c.clue,
-                c.answer,
-                c.daily_double,
-                g.title as game_title
+            CREATE VIEW IF NOT EXISTS clue_text AS
+            SELECT c.id, cat.name AS category, c.clue, c.answer
             FROM clues c
-            JOIN games g ON c.game_id = g.game_id
-            WHERE c.category LIKE ?
-            ORDER BY RANDOM()
-            LIMIT ?
-        """, (f"%{category}%", limit))
+            JOIN categories cat ON cat.category_id = c.category_id
+        """)
 
-        return [dict(row) for row in self.cursor.fetchall()]
+        try:
+            self.cursor.execute(SEARCH_TABLE)
+        except sqlite3.OperationalError:
+            print("Warning: SQLite was built without FTS5; full-text search is disabled")
+            return
 
-    def get_clues_by_show_number(self, show_number: int) -> List[Dict]:
-        """
-        Get all clues from a specific show number
+        self.has_search = True
+        for trigger_sql in SEARCH_TRIGGERS.values():
+            self.cursor.execute(trigger_sql)
 
-        Args:
-            show_number: The Jeopardy show number (e.g., 9426)
+        if not existed:
+            self.cursor.execute("SELECT 1 FROM clues LIMIT 1")
+            if self.cursor.fetchone():
+                print("Building full-text search index for existing clues...")
+                self.rebuild_search_index()
+
+    def _create_stats_tables(self):
+        """Create the cached statistics tables and triggers, backfilling older databases"""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'stats'")
+        existed = self.cursor.fetchone() is not None
 
-        Returns:
-            List of clue dictionaries, or empty list if show not found
-        """
         self.cursor.execute("""
-            SELECT
-                c.id,
-                c.game_id,
-                g.show_number,
-                g.air_date,
-                c.round,
-                c.category,
-                c.value,
-                c.clue,
-                c.answer,
-                c.daily_double,
-                g.title as game_title
-            FROM clues c
-            JOIN games g ON c.game_id = g.game_id
-            WHERE g.show_number = ?
-            ORDER BY c.round, c.category
-        """, (show_number,))
+            CREATE TABLE IF NOT EXISTS stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
 
-        return [dict(row) for row in self.cursor.fetchall()]
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS category_counts (
+                category_id INTEGER PRIMARY KEY,
+                clue_count INTEGER NOT NULL
+            )
+        """)
 
-    def get_random_clue_by_date(self, start_date: str = None, end_date: str = None, exclude_final: bool = True) -> Optional[Dict]:
-        """
-        Get a random clue from the database filtered by date range
+        for trigger_sql in STATS_TRIGGERS.values():
+            self.cursor.execute(trigger_sql)
 
-        Args:
-            start_date: Start date in YYYY-MM-DD format (inclusive)
-            end_date: End date in YYYY-MM-DD format (inclusive)
-            exclude_final: If True, exclude Final Jeopardy clues
+        self.has_stats = True
+        if not existed:
+            self.rebuild_stats()
 
-        Returns:
-            Dictionary with clue data or None if no clues found
+    def rebuild_stats(self):
+        """Recompute the cached statistics from the games and clues tables"""
+        self.cursor.execute("DELETE FROM stats")
+        self.cursor.executemany(
+            "INSERT INTO stats (name, value) VALUES (?, 0)",
+            [(name,) for name in STATS_COUNTERS]
+        )
+
+        # Counters are set after category_counts is refilled, overriding
+        # whatever its insert/delete triggers did to unique_categories
+        self.cursor.execute("DELETE FROM category_counts")
+        self.cursor.execute("""
+            INSERT INTO category_counts (category_id, clue_count)
+            SELECT category_id, COUNT(*) FROM clues GROUP BY category_id
+        """)
+
+        for name, value in self._count_stats().items():
+            self.cursor.execute("UPDATE stats SET value = ? WHERE name = ?", (value, name))
+
+        self.conn.commit()
+
+    def check_stats(self) -> Dict:
         """
-        query = """
-            SELECT
-                c.id,
-                c.game_id,
-                g.show_number,
-                g.air_date,
-                c.round,
-                c.category,
-                c.value,
-                c.clue,
-                c.answer,
-                c.daily_double,
-                g.title as game_title
-            FROM clues c
-            JOIN games g ON c.game_id = g.game_id
-            WHERE 1=1
+        Compare the cached statistics with a full recount
+
+        Returns:
+            Dictionary of mismatches, empty if the cache is consistent. Counter
+            mismatches map name -> {'cached', 'actual'}; per-category
+            mismatches are listed under 'categories'
         """
-        params = []
+        self.cursor.execute("SELECT name, value FROM stats")
+        cached = {row[0]: row[1] for row in self.cursor.fetchall()}
 
-        if start_date:
-            query += " AND g.air_date >= ?"
-            params.append(start_date)
+        mismatches = {}
+        for name, actual in self._count_stats().items():
+            if cached.get(name) != actual:
+                mismatches[name] = {'cached': cached.get(name), 'actual': actual}
 
-        if end_date:
-            query += " AND g.air_date <= ?"
-            params.append(end_date)
+        self.cursor.execute("""
+            SELECT cat.name, SUM(counts.cached), SUM(counts.actual) FROM (
+                SELECT category_id, clue_count AS cached, 0 AS actual FROM category_counts
+                UNION ALL
+                SELECT category_id, 0, COUNT(*) FROM clues GROUP BY category_id
+            ) counts
+            LEFT JOIN categories cat ON cat.category_id = counts.category_id
+            GROUP BY counts.category_id
+            HAVING SUM(counts.cached) != SUM(counts.actual)
+        """)
+        categories = {
+            row[0]: {'cached': row[1], 'actual': row[2]}
+            for row in self.cursor.fetchall()
+        }
+        if categories:
+            mismatches['categories'] = categories
 
-        if exclude_final:
-            query += " AND c.round != 'Final Jeopardy'"
+        return mismatches
 
-        query += " ORDER BY RANDOM() LIMIT 1"
+    def _count_stats(self) -> Dict:
+        """Count the cached statistics the slow way"""
+        self.cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM games),
+                (SELECT COUNT(*) FROM clues),
+                (SELECT COUNT(DISTINCT category_id) FROM clues)
+        """)
+        return dict(zip(STATS_COUNTERS, self.cursor.fetchone()))
 
-        self.cursor.execute(query, params)
-        row = self.cursor.fetchone()
+    def rebuild_search_index(self):
+        """Re-index every clue from scratch (e.g. after a bulk load)"""
+        if not self.has_search:
+            raise RuntimeError("Full-text search needs SQLite with FTS5")
 
-        if row:
-            return dict(row)
-        return None
+        self.cursor.execute("INSERT INTO clues_fts(clues_fts) VALUES ('rebuild')")
+        self.cursor.execute("INSERT INTO clues_fts(clues_fts) VALUES ('optimize')")
+        self.conn.commit()
 
-    def get_stats(self) -> Dict:
-        """Get database statistics"""
-        self.cursor.execute("SELECT COUNT(*) FROM games")
-        game_count = self.cursor.fetchone()[0]
+    def rebuild_duplicate_index(self, chunk_size: int = 20000):
+        """
+        Fingerprint every clue and recompute the duplicate clusters from scratch
 
-        self.cursor.execute("SELECT COUNT(*) FROM clues")
-        clue_count = self.cursor.fetchone()[0]
+        Incremental updates only ever merge clusters; a rebuild also splits
+        ones that were held together by clues that have since been deleted.
 
-        self.cursor.execute("SELECT COUNT(DISTINCT category) FROM clues")
-        category_count = self.cursor.fetchone()[0]
+        Args:
+            chunk_size: Clues fingerprinted per pass
+        """
+        self.cursor.execute("DELETE FROM clue_fingerprints")
+        self.cursor.execute("DELETE FROM lsh_buckets")
+        self.cursor.execute("DELETE FROM clue_duplicates")
 
-        self.cursor.execute("SELECT MIN(show_number), MAX(show_number) FROM games WHERE show_number IS NOT NULL")
-        show_range = self.cursor.fetchone()
+        last_id = 0
+        while True:
+            self.cursor.execute(
+                "SELECT id, clue, answer FROM clues WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, chunk_size)
+            )
+            rows = self.cursor.fetchall()
+            if not rows:
+                break
+            self._index_duplicates(rows)
+            last_id = rows[-1][0]
 
-        self.cursor.execute("SELECT MIN(air_date), MAX(air_date) FROM games WHERE air_date IS NOT NULL")
-        date_range = self.cursor.fetchone()
+        self.conn.commit()
 
-        return {
-            'total_games': game_count,
-            'total_clues': clue_count,
-            'unique_categories': category_count,
-            'show_number_range': {
-                'min': show_range[0],
-                'max': show_range[1]
-            } if show_range[0] else None,
-            'date_range': {
-                'min': date_range[0],
-                'max': date_range[1]
-            } if date_range[0] else None
-        }
+    def rebuild_answer_index(self, chunk_size: int = 20000):
+        """
+        Recompute every clue's normalized answer and aliases
+
+        Needed after changes to the normalization rules in answers.py or
+        manual edits to the clues table.
+
+        Args:
+            chunk_size: Clues read per pass
+        """
+        self.cursor.execute("DELETE FROM answer_index")
+
+        last_id = 0
+        while True:
+            self.cursor.execute(
+                "SELECT id, clue, answer FROM clues WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, chunk_size)
+            )
+            rows = self.cursor.fetchall()
+            if not rows:
+                break
+            self._index_answers(rows)
+            last_id = rows[-1][0]
+
+        self.conn.commit()
+
+    def _index_clues_after(self, last_id: int, chunk_size: int = 20000):
+        """
+        Add the clues with ids above `last_id` to the answer and duplicate indexes
+
+        Args:
+            last_id: Highest id already indexed
+            chunk_size: Clues read per pass
+        """
+        while True:
+            self.cursor.execute(
+                "SELECT id, clue, answer FROM clues WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, chunk_size)
+            )
+            rows = self.cursor.fetchall()
+            if not rows:
+                break
+            self._index_answers(rows)
+            self._index_duplicates(rows)
+            last_id = rows[-1][0]
+
+        self.conn.commit()
+
+    def analyze(self):
+        """
+        Refresh the planner's table statistics
+
+        Without them SQLite can't tell a selective category filter from a
+        round filter that matches a third of the table.
+        """
+        self.cursor.execute("ANALYZE")
+        self.conn.commit()
+
+    def vacuum(self):
+        """Rewrite the database file to release free pages (e.g. after a migration)"""
+        self.conn.commit()
+        self.cursor.execute("VACUUM")
+        self.cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def snapshot(self, path: str = None, page_size: int = SNAPSHOT_PAGE_SIZE) -> Path:
+        """
+        Write a compacted, read-optimized copy of the database for serving
+
+        The copy is taken with VACUUM INTO (a consistent view, even while
+        the scraper keeps writing through other connections), rewritten at
+        `page_size` in rollback-journal mode, with the full-text index
+        merged into one segment, every serving index present and fresh
+        ANALYZE statistics. It is built next to `path` and renamed over it
+        only once complete, so a reader opening `path` always gets a whole
+        snapshot; handles still open on the previous one keep reading it
+        (see DatabasePool's snapshot mode for picking up the new file).
+
+        Open the result with JeopardyDatabase(path, immutable=True).
+
+        Args:
+            path: Where to put the snapshot. Defaults to
+                <database>-snapshot.db next to the database
+            page_size: Page size in bytes (a power of two, 512-65536)
+
+        Returns:
+            The snapshot's path
+        """
+        if self.read_only:
+            raise RuntimeError("snapshot() needs a read-write JeopardyDatabase")
+        path = Path(path) if path else self.db_path.with_name(f"{self.db_path.stem}-snapshot.db")
+        if path.resolve() == self.db_path.resolve():
+            raise ValueError("a snapshot can't replace the database it is taken from")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        building = path.with_name(path.name + '.tmp')
+        building.unlink(missing_ok=True)
+        self.conn.commit()
+        self.cursor.execute("VACUUM INTO ?", (str(building),))
+
+        try:
+            conn = sqlite3.connect(str(building))
+            try:
+                conn.execute("PRAGMA journal_mode = DELETE")
+                for index_sql in SECONDARY_INDEXES.values():
+                    conn.execute(index_sql)
+                if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'clues_fts'").fetchone():
+                    conn.execute("INSERT INTO clues_fts(clues_fts) VALUES ('optimize')")
+                conn.commit()
+
+                conn.execute(f"PRAGMA page_size = {int(page_size)}")
+                conn.execute("VACUUM")
+                conn.execute("ANALYZE")
+                conn.commit()
+
+                check = conn.execute("PRAGMA quick_check").fetchone()[0]
+                if check != 'ok':
+                    raise RuntimeError(f"snapshot failed its integrity check: {check}")
+            finally:
+                conn.close()
+
+            # On disk before the rename makes it visible
+            with open(building, 'rb') as snapshot_file:
+                os.fsync(snapshot_file.fileno())
+            os.replace(building, path)
+        except BaseException:
+            building.unlink(missing_ok=True)
+            raise
+
+        return path
+
+    def game_exists(self, game_id: int) -> bool:
+        """Check if a game already exists in the database"""
+        self.cursor.execute(
+            "SELECT 1 FROM games WHERE game_id = ?",
+            (game_id,)
+        )
+        return self.cursor.fetchone() is not None
+
+    def insert_game(self, game_data: Dict) -> bool:
+        """
+        Insert a complete game into the database
+
+        Args:
+            game_data: Dictionary containing game data from scraper
+
+        Returns:
+            True if successful, False if game already exists
+        """
+        game_id = game_data['game_id']
+
+        # Check if game already exists
+        if self.game_exists(game_id):
+            print(f"Game {game_id} already exists in database. Skipping.")
+            return False
+
+        self._write_games([game_data])
+        self.conn.commit()
+        print(f"✓ Game {game_id} inserted into database")
+        return True
+
+    def replace_game(self, game_data: Dict):
+        """
+        Swap in a new copy of a stored game (or insert it if it is new)
+
+        The old rows are deleted and the new ones inserted in a single
+        transaction, so if the insert fails the stored copy is kept.
+        Review state and history move to the new clues by board position.
+        """
+        self.insert_games([game_data], replace=True)
+        print(f"✓ Game {game_data['game_id']} replaced in database")
+
+    def insert_games(
+        self,
+        games: Iterable[Dict],
+        batch_size: int = 500,
+        replace: bool = False,
+        rebuild_indexes: bool = False
+    ) -> int:
+        """
+        Bulk-insert many games, committing once per batch
+
+        Args:
+            games: Iterable of game dictionaries from the scraper. It is
+                consumed lazily, so a generator works for large loads
+            batch_size: Number of games written per transaction
+            replace: Replace games that are already stored instead of
+                skipping them
+            rebuild_indexes: Drop the secondary clue indexes and the
+                search/statistics triggers for the duration of the load and
+                rebuild everything at the end. The new clues are added to
+                the duplicate and answer indexes in one pass at the end.
+                Worth it when loading many thousands of games. If the load
+                fails, the indexes and triggers are restored but nothing is
+                rebuilt: batches committed before the error are missing
+                from the search, answer and duplicate indexes and the
+                statistics until `reindex` (search and answers),
+                `--rebuild-stats` and `duplicates --rebuild` are run
+
+        Returns:
+            Number of games inserted
+        """
+        if rebuild_indexes:
+            for name in SECONDARY_INDEXES:
+                self.cursor.execute(f"DROP INDEX IF EXISTS {name}")
+            if self.has_search:
+                for name in SEARCH_TRIGGERS:
+                    self.cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            for name in STATS_TRIGGERS:
+                self.cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+        # Clue ids are AUTOINCREMENT, so every clue this load writes gets a higher id
+        self.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM clues")
+        last_old_id = self.cursor.fetchone()[0]
+
+        inserted = 0
+        try:
+            games = iter(games)
+            while True:
+                batch = list(islice(games, batch_size))
+                if not batch:
+                    break
+
+                # Later copies of a game within the batch win
+                batch = list({game['game_id']: game for game in batch}.values())
+                game_ids = [game['game_id'] for game in batch]
+
+                reviews = []
+                if replace:
+                    reviews = self._detach_reviews(game_ids)
+                    self._forget_duplicates(game_ids)
+                    self._delete_games(game_ids)
+                else:
+                    existing = self.existing_game_ids(game_ids)
+                    batch = [game for game in batch if game['game_id'] not in existing]
+
+                self._write_games(batch, index_clues=not rebuild_indexes)
+                if reviews:
+                    self._reattach_reviews(reviews)
+                self.conn.commit()
+                inserted += len(batch)
+        except BaseException:
+            self.conn.rollback()
+            if rebuild_indexes:
+                self._restore_load_indexes()
+            raise
+
+        if rebuild_indexes:
+            self._restore_load_indexes()
+            if self.has_search:
+                self.rebuild_search_index()
+            self.rebuild_stats()
+            self._index_clues_after(last_old_id)
+            self.analyze()
+
+        return inserted
+
+    def _restore_load_indexes(self):
+        """Re-create the indexes and triggers that insert_games(rebuild_indexes=True) drops"""
+        for index_sql in SECONDARY_INDEXES.values():
+            self.cursor.execute(index_sql)
+        if self.has_search:
+            for trigger_sql in SEARCH_TRIGGERS.values():
+                self.cursor.execute(trigger_sql)
+        for trigger_sql in STATS_TRIGGERS.values():
+            self.cursor.execute(trigger_sql)
+        self.conn.commit()
+
+    def existing_game_ids(self, game_ids: Iterable[int]) -> set:
+        """Return which of the given game IDs are already stored (one query for any number of IDs)"""
+        # The IDs travel as a single JSON array, so there is no bound-parameter limit
+        self.cursor.execute(
+            "SELECT game_id FROM games WHERE game_id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(game_ids)),)
+        )
+        return {row[0] for row in self.cursor.fetchall()}
+
+    def set_crawl_status(self, game_ids: Iterable[int], status: str):
+        """
+        Set the crawl status of many games at once, without counting an attempt
+
+        Used to queue a crawl plan ('pending') and to mark games that were
+        found already stored ('done').
+        """
+        if status not in CRAWL_STATUSES:
+            raise ValueError(f"Unknown crawl status '{status}'. Choose from: {', '.join(CRAWL_STATUSES)}")
+
+        # WHERE true tells the parser the upsert clause belongs to the INSERT
+        self.cursor.execute("""
+            INSERT INTO crawl_state (game_id, status)
+            SELECT value, ? FROM json_each(?) WHERE true
+            ON CONFLICT(game_id) DO UPDATE SET
+                status = excluded.status,
+                updated_at = CURRENT_TIMESTAMP
+        """, (status, json.dumps(list(game_ids))))
+        self.conn.commit()
+
+    def record_crawl_attempt(self, game_id: int, status: str, error: Optional[str] = None):
+        """Record the outcome of fetching one game (counts as an attempt)"""
+        if status not in CRAWL_STATUSES:
+            raise ValueError(f"Unknown crawl status '{status}'. Choose from: {', '.join(CRAWL_STATUSES)}")
+
+        self.cursor.execute("""
+            INSERT INTO crawl_state (game_id, status, attempts, last_error)
+            VALUES (?, ?, 1, ?)
+            ON CONFLICT(game_id) DO UPDATE SET
+                status = excluded.status,
+                attempts = attempts + 1,
+                last_error = excluded.last_error,
+                updated_at = CURRENT_TIMESTAMP
+        """, (game_id, status, error))
+        self.conn.commit()
+
+    def crawl_state_ids(self, statuses: Iterable[str], game_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        IDs of games whose crawl status is one of `statuses`, in ascending order
+
+        Args:
+            statuses: Crawl statuses to match (see CRAWL_STATUSES)
+            game_ids: Only consider these games (default: every tracked game)
+        """
+        query = "SELECT game_id FROM crawl_state WHERE status IN (SELECT value FROM json_each(?))"
+        params = [json.dumps(list(statuses))]
+
+        if game_ids is not None:
+            query += " AND game_id IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(list(game_ids)))
+
+        self.cursor.execute(query + " ORDER BY game_id", params)
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def get_crawl_counts(self) -> Dict[str, int]:
+        """Number of tracked games in each crawl status"""
+        self.cursor.execute("SELECT status, COUNT(*) FROM crawl_state GROUP BY status")
+        counts = dict.fromkeys(CRAWL_STATUSES, 0)
+        counts.update((row[0], row[1]) for row in self.cursor.fetchall())
+        return counts
+
+    def _delete_games(self, game_ids: List[int]):
+        """Delete games and their clues without committing"""
+        rows = [(game_id,) for game_id in game_ids]
+        self.cursor.executemany(
+            "DELETE FROM answer_index WHERE clue_id IN (SELECT id FROM clues WHERE game_id = ?)", rows
+        )
+        self.cursor.executemany("DELETE FROM clues WHERE game_id = ?", rows)
+        self.cursor.executemany("DELETE FROM board_categories WHERE game_id = ?", rows)
+        self.cursor.executemany("DELETE FROM games WHERE game_id = ?", rows)
+
+    def _detach_reviews(self, game_ids: List[int]) -> List[Tuple]:
+        """
+        Take out the review rows of games about to be replaced (no commit)
+
+        Rewritten clues get new ids, so each row comes back with its clue's
+        game, round, board position and text for _reattach_reviews.
+        """
+        self.cursor.execute("SELECT 1 FROM review_state LIMIT 1")
+        if self.cursor.fetchone() is None:
+            return []
+
+        self.cursor.execute("""
+            SELECT
+                c.game_id, c.round_id, c.board_row, c.board_column, c.clue,
+                rs.clue_id, rs.user_id, rs.due, rs.interval, rs.ease, rs.repetitions, rs.lapses, rs.last_review
+            FROM clues c
+            JOIN review_state rs ON rs.clue_id = c.id
+            WHERE c.game_id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(game_ids),))
+        reviews = [tuple(row) for row in self.cursor.fetchall()]
+
+        self.cursor.executemany(
+            "DELETE FROM review_state WHERE clue_id = ?",
+            sorted({(row[5],) for row in reviews})
+        )
+        return reviews
+
+    def _reattach_reviews(self, reviews: List[Tuple]):
+        """
+        Move detached review rows (and their history) to the rewritten clues
+
+        A clue is matched by its board position, or by its text where it
+        has none (Final Jeopardy, older data). Rows whose clue is gone are
+        dropped; their history stays under the old id.
+        """
+        self.cursor.execute("""
+            SELECT id, game_id, round_id, board_row, board_column, clue
+            FROM clues
+            WHERE game_id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(sorted({row[0] for row in reviews})),))
+        by_position = {}
+        by_text = {}
+        for clue_id, game_id, round_id, board_row, board_column, clue in self.cursor.fetchall():
+            if board_row is not None and board_column is not None:
+                by_position[(game_id, round_id, board_row, board_column)] = clue_id
+            by_text[(game_id, round_id, clue)] = clue_id
+
+        states = []
+        moved = {}
+        for game_id, round_id, board_row, board_column, clue, old_id, user_id, *state in reviews:
+            new_id = by_position.get((game_id, round_id, board_row, board_column))
+            if new_id is None:
+                new_id = by_text.get((game_id, round_id, clue))
+            if new_id is None:
+                continue
+            moved[old_id] = new_id
+            states.append((new_id, user_id, *state))
+
+        self.cursor.executemany("""
+            INSERT OR REPLACE INTO review_state
+                (clue_id, user_id, due, interval, ease, repetitions, lapses, last_review)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, states)
+
+        if moved:
+            # One statement per replaced batch; idx_review_log_clue finds the rows
+            self.cursor.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS moved_clues (old_id INTEGER PRIMARY KEY, new_id INTEGER NOT NULL)"
+            )
+            self.cursor.execute("DELETE FROM temp.moved_clues")
+            self.cursor.executemany("INSERT INTO temp.moved_clues VALUES (?, ?)", moved.items())
+            self.cursor.execute("""
+                UPDATE review_log
+                SET clue_id = (SELECT new_id FROM temp.moved_clues WHERE old_id = review_log.clue_id)
+                WHERE clue_id IN (SELECT old_id FROM temp.moved_clues)
+            """)
+
+    def _write_games(self, games: List[Dict], index_clues: bool = True):
+        """
+        Insert game and clue rows with one executemany per table (no commit)
+
+        Args:
+            games: Game dictionaries from the scraper
+            index_clues: Store the new clues' normalized answers and add
+                them to the duplicate clusters (bulk loads index the new
+                clues afterwards)
+        """
+        games = [_with_board_positions(game) for game in games]
+        self.cursor.executemany("""
+            INSERT INTO games (game_id, show_number, title, url, air_date)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            (
+                game['game_id'],
+                game.get('show_number'),
+                _stored_title(game['title'], game.get('show_number'), game.get('air_date')),
+                _stored_url(game['url'], game['game_id']),
+                game.get('air_date')
+            )
+            for game in games
+        ])
+
+        rows = [row for game in games for row in self._clue_rows(game)]
+        board = [row for game in games for row in self._board_category_rows(game)]
+        category_ids = self._category_ids({row[2] for row in rows} | {row[3] for row in board})
+
+        self.cursor.executemany("""
+            INSERT INTO clues (game_id, round_id, category_id, value, clue, answer, daily_double, board_row, board_column)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                game_id,
+                ROUND_IDS[round_name],
+                category_ids[category],
+                value_to_int(value),
+                clue,
+                answer,
+                daily_double,
+                board_row,
+                board_column
+            )
+            for game_id, round_name, category, value, clue, answer, daily_double, board_row, board_column in rows
+        ])
+
+        self.cursor.executemany("""
+            INSERT INTO board_categories (game_id, round_id, position, category_id)
+            VALUES (?, ?, ?, ?)
+        """, [
+            (game_id, ROUND_IDS[round_name], position, category_ids[category])
+            for game_id, round_name, position, category in board
+        ])
+
+        if index_clues and rows:
+            self.cursor.execute(
+                "SELECT id, clue, answer FROM clues WHERE game_id IN (SELECT value FROM json_each(?)) ORDER BY id",
+                (json.dumps([game['game_id'] for game in games]),)
+            )
+            new_clues = self.cursor.fetchall()
+            self._index_answers(new_clues)
+            self._index_duplicates(new_clues)
+
+    def _index_answers(self, rows: List[Tuple]):
+        """
+        Store the normalized answer and aliases of new clues (no commit)
+
+        Args:
+            rows: (id, clue, answer) of the clues
+        """
+        # Answers repeat a lot ("Paris"), so each distinct one is parsed once
+        forms_of = {}
+        index_rows = []
+        for clue_id, _, answer in rows:
+            forms = forms_of.get(answer)
+            if forms is None:
+                forms = forms_of[answer] = aliases(answer)
+            if forms:
+                index_rows.append((clue_id, forms[0], '|'.join(forms[1:])))
+
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO answer_index (clue_id, normalized, aliases) VALUES (?, ?, ?)",
+            index_rows
+        )
+
+    def _index_duplicates(self, rows: List[Tuple]):
+        """
+        Fingerprint new clues and merge them into the duplicate clusters (no commit)
+
+        One query finds every stored clue that shares a content hash or an
+        LSH bucket with the batch; the candidates are then verified in
+        memory, in id order, so clues within the batch match each other too.
+
+        Args:
+            rows: (id, clue, answer) of clues not indexed yet, in id order
+        """
+        prints = {}
+        for clue_id, clue, answer in rows:
+            fp = fingerprint(clue, answer)
+            if fp is not None:
+                prints[clue_id] = fp
+        if not prints:
+            return
+
+        by_hash = {}
+        by_bucket = {}
+        self.cursor.execute("""
+            SELECT 0, content_hash, clue_id FROM clue_fingerprints
+            WHERE content_hash IN (SELECT value FROM json_each(?))
+            UNION ALL
+            SELECT 1, bucket, clue_id FROM lsh_buckets
+            WHERE bucket IN (SELECT value FROM json_each(?))
+        """, (
+            json.dumps(sorted({fp.content_hash for fp in prints.values()})),
+            json.dumps(sorted({bucket for fp in prints.values() for bucket in fp.buckets}))
+        ))
+        for is_bucket, key, clue_id in self.cursor.fetchall():
+            (by_bucket if is_bucket else by_hash).setdefault(key, []).append(clue_id)
+
+        known = {}
+        candidates = {clue_id for ids in (*by_hash.values(), *by_bucket.values()) for clue_id in ids}
+        if candidates:
+            self.cursor.execute(
+                "SELECT id, clue, answer FROM clues WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(sorted(candidates)),)
+            )
+            known = {row[0]: fingerprint(row[1], row[2], lsh=False) for row in self.cursor.fetchall()}
+
+        links = []
+        for clue_id, fp in prints.items():
+            candidates = set(by_hash.get(fp.content_hash, ()))
+            for bucket in fp.buckets:
+                candidates.update(by_bucket.get(bucket, ()))
+            # .get: a bucket row can outlive a clue deleted by hand
+            matches = [other for other in candidates if known.get(other) and is_duplicate(fp, known[other])]
+            if matches:
+                links.append((clue_id, matches))
+
+            known[clue_id] = fp
+            by_hash.setdefault(fp.content_hash, []).append(clue_id)
+            for bucket in fp.buckets:
+                by_bucket.setdefault(bucket, []).append(clue_id)
+
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO clue_fingerprints (clue_id, content_hash) VALUES (?, ?)",
+            [(clue_id, fp.content_hash) for clue_id, fp in prints.items()]
+        )
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO lsh_buckets (bucket, clue_id) VALUES (?, ?)",
+            [(bucket, clue_id) for clue_id, fp in prints.items() for bucket in fp.buckets]
+        )
+        if links:
+            self._merge_duplicates(links)
+
+    def _merge_duplicates(self, links: List[Tuple]):
+        """
+        Join clusters along (clue_id, [matching clue ids]) links (no commit)
+
+        A union-find over the clues involved picks each merged cluster's
+        lowest id as its representative; stored clusters that lose theirs
+        are repointed with one UPDATE each.
+        """
+        linked = sorted({other for _, matches in links for other in matches})
+        self.cursor.execute(
+            "SELECT clue_id, representative_id FROM clue_duplicates WHERE clue_id IN (SELECT value FROM json_each(?))",
+            (json.dumps(linked),)
+        )
+        parent = {row[0]: row[1] for row in self.cursor.fetchall()}
+        # Clusters as stored before this batch, by representative
+        stored = {parent.get(clue_id, clue_id) for clue_id in linked}
+
+        def find(clue_id):
+            root = clue_id
+            while parent.get(root, root) != root:
+                root = parent[root]
+            parent[clue_id] = root
+            return root
+
+        for clue_id, matches in links:
+            for other in matches:
+                first, second = sorted((find(clue_id), find(other)))
+                if first != second:
+                    parent[second] = first
+
+        for old in sorted(stored):
+            new = find(old)
+            if new != old:
+                self.cursor.execute(
+                    "UPDATE clue_duplicates SET representative_id = ? WHERE representative_id = ?",
+                    (new, old)
+                )
+                self.cursor.execute(
+                    "INSERT OR REPLACE INTO clue_duplicates (clue_id, representative_id) VALUES (?, ?)",
+                    (old, new)
+                )
+
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO clue_duplicates (clue_id, representative_id) VALUES (?, ?)",
+            [(clue_id, find(clue_id)) for clue_id, _ in links if find(clue_id) != clue_id]
+        )
+
+    def _forget_duplicates(self, game_ids: List[int]):
+        """
+        Take games' clues out of the duplicate index before they are deleted (no commit)
+
+        A cluster whose representative goes promotes its lowest remaining clue.
+        """
+        self.cursor.execute(
+            "SELECT id, clue, answer FROM clues WHERE game_id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(game_ids)),)
+        )
+        rows = self.cursor.fetchall()
+        if not rows:
+            return
+
+        # Bucket rows are keyed by bucket, so recompute which ones each clue has
+        buckets = []
+        for clue_id, clue, answer in rows:
+            fp = fingerprint(clue, answer)
+            if fp is not None:
+                buckets.extend((bucket, clue_id) for bucket in fp.buckets)
+        self.cursor.executemany("DELETE FROM lsh_buckets WHERE bucket = ? AND clue_id = ?", buckets)
+
+        clue_ids = json.dumps([row[0] for row in rows])
+        self.cursor.execute(
+            "DELETE FROM clue_fingerprints WHERE clue_id IN (SELECT value FROM json_each(?))", (clue_ids,)
+        )
+        self.cursor.execute(
+            "DELETE FROM clue_duplicates WHERE clue_id IN (SELECT value FROM json_each(?))", (clue_ids,)
+        )
+
+        self.cursor.execute("""
+            SELECT representative_id, MIN(clue_id) FROM clue_duplicates
+            WHERE representative_id IN (SELECT value FROM json_each(?))
+            GROUP BY representative_id
+        """, (clue_ids,))
+        for old, new in self.cursor.fetchall():
+            self.cursor.execute("DELETE FROM clue_duplicates WHERE clue_id = ?", (new,))
+            self.cursor.execute(
+                "UPDATE clue_duplicates SET representative_id = ? WHERE representative_id = ?",
+                (new, old)
+            )
+
+    def _category_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Look up category ids, adding any categories not seen before"""
+        names = list(names)
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO categories (name) VALUES (?)",
+            [(name,) for name in names]
+        )
+
+        ids = {}
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            self.cursor.execute(
+                f"SELECT name, category_id FROM categories WHERE name IN ({placeholders})",
+                chunk
+            )
+            ids.update((row[0], row[1]) for row in self.cursor.fetchall())
+        return ids
+
+    def delete_game(self, game_id: int) -> bool:
+        """
+        Delete a game and all of its clues, including their review state
+
+        To swap in a new copy of a game and keep its reviews, use
+        replace_game() instead.
+
+        Returns:
+            True if the game existed
+        """
+        self.cursor.execute("""
+            DELETE FROM review_state WHERE clue_id IN (SELECT id FROM clues WHERE game_id = ?)
+        """, (game_id,))
+        self._forget_duplicates([game_id])
+        self.cursor.execute("""
+            DELETE FROM answer_index WHERE clue_id IN (SELECT id FROM clues WHERE game_id = ?)
+        """, (game_id,))
+        self.cursor.execute("DELETE FROM clues WHERE game_id = ?", (game_id,))
+        self.cursor.execute("DELETE FROM page_validators WHERE game_id = ?", (game_id,))
+        self.cursor.execute("DELETE FROM board_categories WHERE game_id = ?", (game_id,))
+        self.cursor.execute("DELETE FROM games WHERE game_id = ?", (game_id,))
+        deleted = self.cursor.rowcount > 0
+        self.conn.commit()
+        return deleted
+
+    @staticmethod
+    def _clue_rows(game_data: Dict) -> Iterator[Tuple]:
+        """Yield clue rows for a game in board order: J, DJ, then Final"""
+        game_id = game_data['game_id']
+
+        rounds = [
+            ('Jeopardy', game_data.get('jeopardy_round', [])),
+            ('Double Jeopardy', game_data.get('double_jeopardy_round', [])),
+        ]
+        if game_data.get('final_jeopardy'):
+            rounds.append(('Final Jeopardy', [game_data['final_jeopardy']]))
+
+        for round_name, clues in rounds:
+            for clue in clues:
+                yield (
+                    game_id,
+                    round_name,
+                    clue.get('category', ''),
+                    clue.get('value', ''),
+                    clue.get('clue', ''),
+                    clue.get('answer'),
+                    clue.get('daily_double', False),
+                    clue.get('row'),
+                    clue.get('column')
+                )
+
+    @staticmethod
+    def _board_category_rows(game_data: Dict) -> Iterator[Tuple]:
+        """Yield (game_id, round name, position, category) for both boards"""
+        board = game_data.get('categories') or {}
+        for key, round_name in BOARD_ROUNDS:
+            names = board.get(key)
+            if not names:
+                # Game dictionaries from older parsers: order of first appearance
+                names = dict.fromkeys(clue.get('category', '') for clue in game_data.get(key) or [])
+            for position, name in enumerate(names):
+                yield game_data['game_id'], round_name, position, name
+
+    def get_random_clue(self, exclude_final: bool = True, dedupe: bool = False) -> Optional[Dict]:
+        """
+        Get a random clue from the database
+
+        Args:
+            exclude_final: If True, exclude Final Jeopardy clues
+            dedupe: If True, draw only one clue per cluster of duplicates
+
+        Returns:
+            Dictionary with clue data or None if no clues found
+        """
+        clues = self.get_random_clues(1, exclude_final=exclude_final, dedupe=dedupe)
+        return clues[0] if clues else None
+
+    def get_clues_by_category(self, category: str, limit: int = 10) -> List[Dict]:
+        """Get clues from a specific category"""
+        return self.get_random_clues(limit, exclude_final=False, category=category)
+
+    @cached
+    def get_clues_by_show_number(self, show_number: int) -> List[Dict]:
+        """
+        Get all clues from a specific show number
+
+        Args:
+            show_number: The Jeopardy show number (e.g., 9426)
+
+        Returns:
+            List of clue dictionaries, or empty list if show not found
+        """
+        self.cursor.execute(CLUE_SELECT + """
+            WHERE g.show_number = ?
+            ORDER BY round, c.board_column, c.board_row, category
+        """, (show_number,))
+
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    @cached
+    def get_game_board(self, show_number: int) -> Optional[Dict]:
+        """
+        Lay out a whole game as it was played, for replaying it
+
+        One query fetches the board categories and every clue of the show
+        (through the show_number, board_categories and clues game_id
+        indexes).
+
+        Args:
+            show_number: The Jeopardy show number (e.g., 9426)
+
+        Returns:
+            None if the show isn't stored, otherwise a dictionary with the
+            game's game_id, show_number, air_date and title, a
+            'jeopardy_round' and a 'double_jeopardy_round' entry, each
+            {'categories': [6 names], 'values': [5 row values],
+            'clues': 5 rows x 6 columns of clue dictionaries, None where a
+            clue went unrevealed}, and 'final_jeopardy' (or None)
+        """
+        self.cursor.execute("""
+            WITH game AS (
+                SELECT
+                    game_id,
+                    show_number,
+                    air_date,
+                    COALESCE(title, 'J! Archive - Show #' || show_number || ', aired ' || air_date) as title
+                FROM games
+                WHERE show_number = ?
+                ORDER BY game_id
+                LIMIT 1
+            )
+            SELECT game.*, entry.*
+            FROM game
+            LEFT JOIN (
+                SELECT
+                    0 AS is_clue,
+                    bc.round_id,
+                    bc.position AS board_column,
+                    NULL AS board_row,
+                    cat.name AS category,
+                    NULL AS value,
+                    NULL AS clue,
+                    NULL AS answer,
+                    NULL AS daily_double,
+                    bc.position AS sort_key
+                FROM board_categories bc
+                JOIN categories cat ON cat.category_id = bc.category_id
+                WHERE bc.game_id = (SELECT game_id FROM game)
+                UNION ALL
+                SELECT
+                    1,
+                    c.round_id,
+                    c.board_column,
+                    c.board_row,
+                    cat.name,""" + VALUE_TEXT + """,
+                    c.clue,
+                    c.answer,
+                    c.daily_double,
+                    c.id
+                FROM clues c
+                JOIN categories cat ON cat.category_id = c.category_id
+                WHERE c.game_id = (SELECT game_id FROM game)
+            ) AS entry
+            ORDER BY entry.is_clue, entry.round_id, entry.sort_key
+        """, (show_number,))
+        rows = self.cursor.fetchall()
+        if not rows:
+            return None
+
+        game = rows[0]
+        board = {key: game[key] for key in ('game_id', 'show_number', 'air_date', 'title')}
+        rounds = {}
+        for key, round_name in BOARD_ROUNDS:
+            values = board_values(key, board['air_date'])
+            rounds[ROUND_IDS[round_name]] = board[key] = {
+                'categories': [],
+                'values': list(values),
+                'clues': [[None] * 6 for _ in values],
+            }
+        board['final_jeopardy'] = None
+
+        for row in rows:
+            if row['is_clue'] is None:
+                continue
+            if row['is_clue'] == 0:
+                rounds[row['round_id']]['categories'].append(row['category'])
+            elif row['is_clue'] == 1:
+                if row['round_id'] == ROUND_IDS['Final Jeopardy']:
+                    board['final_jeopardy'] = {
+                        'category': row['category'],
+                        'clue': row['clue'],
+                        'answer': row['answer'],
+                    }
+                elif row['round_id'] in rounds:
+                    self._place_clue(rounds[row['round_id']], row)
+
+        return board
+
+    @staticmethod
+    def _place_clue(board_round: Dict, row: sqlite3.Row):
+        """Put a clue row on its round's board"""
+        categories = board_round['categories']
+        column = row['board_column']
+        line = row['board_row']
+
+        # Clues stored without a position (e.g. loaded from old JSON files)
+        # are placed by category and value
+        if column is None:
+            if row['category'] not in categories:
+                categories.append(row['category'])
+            column = categories.index(row['category'])
+        if line is None and row['value'] in board_round['values']:
+            line = board_round['values'].index(row['value'])
+
+        grid = board_round['clues']
+        while column >= len(grid[0]):
+            for cells in grid:
+                cells.append(None)
+        if line is None or line >= len(grid) or grid[line][column] is not None:
+            free = [index for index, cells in enumerate(grid) if cells[column] is None]
+            if not free:
+                return
+            line = free[0]
+
+        grid[line][column] = {
+            'category': row['category'],
+            'value': row['value'],
+            'clue': row['clue'],
+            'answer': row['answer'],
+            'daily_double': bool(row['daily_double']),
+            'row': line,
+            'column': column,
+        }
+
+    def get_random_clue_by_date(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        exclude_final: bool = True,
+        dedupe: bool = False
+    ) -> Optional[Dict]:
+        """
+        Get a random clue from the database filtered by date range
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format (inclusive)
+            end_date: End date in YYYY-MM-DD format (inclusive)
+            exclude_final: If True, exclude Final Jeopardy clues
+            dedupe: If True, draw only one clue per cluster of duplicates
+
+        Returns:
+            Dictionary with clue data or None if no clues found
+        """
+        clues = self.get_random_clues(
+            1, exclude_final=exclude_final, start_date=start_date, end_date=end_date, dedupe=dedupe
+        )
+        return clues[0] if clues else None
+
+    def get_random_clues(
+        self,
+        n: int,
+        exclude_final: bool = True,
+        start_date: str = None,
+        end_date: str = None,
+        category: str = None,
+        round: str = None,
+        show_number: int = None,
+        dedupe: bool = False
+    ) -> List[Dict]:
+        """
+        Get n distinct random clues in one call (e.g. a whole study session)
+
+        Args:
+            n: Number of clues wanted
+            exclude_final: If True, exclude Final Jeopardy clues
+            start_date: Start air date in YYYY-MM-DD format (inclusive)
+            end_date: End air date in YYYY-MM-DD format (inclusive)
+            category: Only clues whose category contains this text
+            round: Only clues from this round (e.g. 'Jeopardy')
+            show_number: Only clues from this show
+            dedupe: Leave out clues that repeat another stored clue (reruns,
+                recycled clues), keeping each cluster's representative (its
+                first stored copy; see find_duplicates)
+
+        Returns:
+            Up to n clue dictionaries in random order (fewer if not enough
+            clues match)
+        """
+        conditions, params = self._filter_conditions(
+            exclude_final, start_date, end_date, category, round, show_number, dedupe
+        )
+        return self._fetch_clues(self._sample_clue_ids(conditions, params, n))
+
+    def iter_clues(self, filters: Optional[Dict] = None, chunk_size: int = 1000) -> Iterator[Dict]:
+        """
+        Stream clues in id order without loading them all into memory
+
+        Args:
+            filters: Optional filters, using the keyword arguments of
+                `get_random_clues` (exclude_final, start_date, end_date,
+                category, round, show_number, dedupe). Final Jeopardy clues
+                are included unless exclude_final is set
+            chunk_size: Rows fetched from SQLite per round trip
+
+        Yields:
+            Clue dictionaries
+        """
+        for row in self.iter_clue_records(filters, chunk_size, raw=True):
+            yield dict(zip(CLUE_FIELDS, row))
+
+    def iter_clue_records(
+        self,
+        filters: Optional[Dict] = None,
+        chunk_size: int = 1000,
+        raw: bool = False
+    ) -> Iterator[Clue]:
+        """
+        Stream clues in id order as Clue records
+
+        The fast path for jobs that walk large parts of the archive: rows
+        come from SQLite as plain tuples and become NamedTuples, with no
+        sqlite3.Row or dict built per clue.
+
+        Args:
+            filters: Same as for iter_clues
+            chunk_size: Rows fetched from SQLite per round trip
+            raw: Yield the plain tuples (in Clue field order) instead
+
+        Yields:
+            Clue records (or tuples with raw)
+        """
+        filters = dict(filters or {})
+        filters.setdefault('exclude_final', False)
+        conditions, params = self._filter_conditions(**filters)
+
+        query = CLUE_SELECT
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY c.id"
+
+        # A cursor of its own, so other queries can run while this one
+        # streams, returning tuples rather than sqlite3.Row objects
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if raw:
+                    yield from rows
+                else:
+                    yield from map(Clue._make, rows)
+        finally:
+            cursor.close()
+
+    def iter_games(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        game_ids: Optional[Iterable[int]] = None,
+        chunk_size: int = 200
+    ) -> Iterator[Dict]:
+        """
+        Stream whole games in game_id order, shaped like the scraper's output
+
+        Games are read `chunk_size` at a time, so memory use does not grow
+        with the size of the database. Values come back in normalized form
+        ("$1000" rather than "$1,000").
+
+        Args:
+            start_date: Only games aired on or after this date (YYYY-MM-DD)
+            end_date: Only games aired on or before this date (YYYY-MM-DD)
+            game_ids: Only these games
+            chunk_size: Games fetched per round trip
+
+        Yields:
+            Game dictionaries as accepted by insert_game/insert_games
+        """
+        cursor = self.conn.cursor()
+        try:
+            for page in self._game_record_pages(cursor, start_date, end_date, game_ids, chunk_size):
+                games = {game.game_id: game._asdict() for game in page}
+
+                for game in games.values():
+                    game.update(
+                        categories={'jeopardy_round': [], 'double_jeopardy_round': []},
+                        jeopardy_round=[],
+                        double_jeopardy_round=[],
+                        final_jeopardy=None
+                    )
+                chunk_ids = json.dumps(list(games))
+
+                cursor.execute("""
+                    SELECT bc.game_id, bc.round_id, cat.name
+                    FROM board_categories bc
+                    JOIN categories cat ON cat.category_id = bc.category_id
+                    WHERE bc.game_id IN (SELECT value FROM json_each(?))
+                    ORDER BY bc.game_id, bc.round_id, bc.position
+                """, (chunk_ids,))
+                for game_id, round_id, name in cursor.fetchall():
+                    key = 'jeopardy_round' if round_id == ROUND_IDS['Jeopardy'] else 'double_jeopardy_round'
+                    games[game_id]['categories'][key].append(name)
+
+                cursor.execute("""
+                    SELECT
+                        c.game_id,
+                        c.round_id,
+                        cat.name as category,""" + VALUE_TEXT + """ as value,
+                        c.clue,
+                        c.answer,
+                        c.daily_double,
+                        c.board_row,
+                        c.board_column
+                    FROM clues c
+                    JOIN categories cat ON cat.category_id = c.category_id
+                    WHERE c.game_id IN (SELECT value FROM json_each(?))
+                    ORDER BY c.game_id, c.id
+                """, (chunk_ids,))
+                for row in cursor.fetchall():
+                    game = games[row['game_id']]
+                    if row['round_id'] == ROUND_IDS['Final Jeopardy']:
+                        game['final_jeopardy'] = {
+                            'category': row['category'],
+                            'clue': row['clue'],
+                            'answer': row['answer'],
+                        }
+                        continue
+                    key = 'jeopardy_round' if row['round_id'] == ROUND_IDS['Jeopardy'] else 'double_jeopardy_round'
+                    game[key].append({
+                        'category': row['category'],
+                        'value': row['value'],
+                        'clue': row['clue'],
+                        'answer': row['answer'],
+                        'daily_double': bool(row['daily_double']),
+                        'row': row['board_row'],
+                        'column': row['board_column'],
+                    })
+
+                yield from games.values()
+        finally:
+            cursor.close()
+
+    def iter_game_records(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        game_ids: Optional[Iterable[int]] = None,
+        chunk_size: int = 1000,
+        raw: bool = False
+    ) -> Iterator[Game]:
+        """
+        Stream game metadata (without clues) in game_id order as Game records
+
+        Args:
+            start_date: Only games aired on or after this date (YYYY-MM-DD)
+            end_date: Only games aired on or before this date (YYYY-MM-DD)
+            game_ids: Only these games
+            chunk_size: Games fetched per round trip
+            raw: Yield the plain tuples (in Game field order) instead
+
+        Yields:
+            Game records (or tuples with raw)
+        """
+        cursor = self.conn.cursor()
+        try:
+            for page in self._game_record_pages(cursor, start_date, end_date, game_ids, chunk_size, raw):
+                yield from page
+        finally:
+            cursor.close()
+
+    def _game_record_pages(
+        self,
+        cursor: sqlite3.Cursor,
+        start_date: str = None,
+        end_date: str = None,
+        game_ids: Optional[Iterable[int]] = None,
+        chunk_size: int = 200,
+        raw: bool = False
+    ) -> Iterator[List[Game]]:
+        """Pages of up to chunk_size Game records, read on `cursor`"""
+        conditions = []
+        params = []
+        if start_date:
+            conditions.append("g.air_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("g.air_date <= ?")
+            params.append(end_date)
+        if game_ids is not None:
+            conditions.append("g.game_id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(sorted(set(game_ids))))
+
+        # Keyset pagination on game_id
+        query = """
+            SELECT
+                g.game_id,
+                g.show_number,
+                COALESCE(g.title, 'J! Archive - Show #' || g.show_number || ', aired ' || g.air_date) as title,
+                COALESCE(g.url, 'https://j-archive.com/showgame.php?game_id=' || g.game_id) as url,
+                g.air_date
+            FROM games g
+            WHERE g.game_id > ?
+        """ + "".join(f" AND {condition}" for condition in conditions) + " ORDER BY g.game_id LIMIT ?"
+
+        last_id = -1
+        while True:
+            cursor.execute(query, [last_id] + params + [chunk_size])
+            rows = [tuple(row) for row in cursor.fetchall()]
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            yield rows if raw else [Game._make(row) for row in rows]
+
+    def _filter_conditions(
+        self,
+        exclude_final: bool = True,
+        start_date: str = None,
+        end_date: str = None,
+        category: str = None,
+        round: str = None,
+        show_number: int = None,
+        dedupe: bool = False
+    ) -> Tuple[List[str], List]:
+        """Build SQL conditions (over `clues c` / `games g`) for the clue filters"""
+        conditions = []
+        params = []
+
+        if start_date:
+            conditions.append("g.air_date >= ?")
+            params.append(start_date)
+
+        if end_date:
+            conditions.append("g.air_date <= ?")
+            params.append(end_date)
+
+        # Text filters are resolved against the lookup tables up front, so
+        # the clues themselves are only compared by integer id
+        if category:
+            self.cursor.execute(
+                "SELECT category_id FROM categories WHERE name LIKE ?",
+                (f"%{category}%",)
+            )
+            category_ids = ','.join(str(row[0]) for row in self.cursor.fetchall())
+            conditions.append(f"c.category_id IN ({category_ids})")
+
+        if round:
+            conditions.append("c.round_id = ?")
+            params.append(self._round_id(round))
+
+        if show_number is not None:
+            conditions.append("g.show_number = ?")
+            params.append(show_number)
+
+        if exclude_final:
+            conditions.append(f"c.round_id != {ROUND_IDS['Final Jeopardy']}")
+
+        if dedupe:
+            if not self.has_duplicates:
+                raise RuntimeError(
+                    f"{self.db_path} has no duplicate index yet; open it read-write once to build it"
+                )
+            # Representatives (and clues without duplicates) have no row
+            conditions.append("NOT EXISTS (SELECT 1 FROM clue_duplicates d WHERE d.clue_id = c.id)")
+
+        return conditions, params
+
+    def _round_id(self, name: str) -> Optional[int]:
+        """Id of a round by name (None if there is no such round)"""
+        if name in ROUND_IDS:
+            return ROUND_IDS[name]
+        self.cursor.execute("SELECT round_id FROM rounds WHERE name = ?", (name,))
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def search_clues(
+        self,
+        query: str,
+        fields: Optional[List[str]] = None,
+        limit: int = 20,
+        round: Optional[str] = None,
+        date_range: Optional[Tuple[Optional[str], Optional[str]]] = None,
+        highlight: Tuple[str, str] = ('<mark>', '</mark>')
+    ) -> List[Dict]:
+        """
+        Full-text search over categories, clues and answers
+
+        Args:
+            query: Words to search for. All words must match; a trailing *
+                makes a word a prefix (e.g. "shakesp*")
+            fields: Subset of 'category', 'clue', 'answer' to search
+                (default: all three)
+            limit: Maximum number of results
+            round: Only return clues from this round (e.g. 'Double Jeopardy')
+            date_range: (start, end) air dates in YYYY-MM-DD format, either
+                of which may be None
+            highlight: Markup placed around matched words in the snippet
+
+        Returns:
+            Clue dictionaries, best match first, each with an extra
+            'snippet' (matched text with highlighting) and 'score'
+            (BM25 relevance, higher is better)
+        """
+        if not self.has_search:
+            raise RuntimeError("Full-text search needs SQLite with FTS5")
+
+        match = self._search_expression(query, fields)
+        if match is None:
+            return []
+
+        conditions = ["clues_fts MATCH ?"]
+        params = [match]
+
+        if round:
+            conditions.append("c.round_id = ?")
+            params.append(self._round_id(round))
+
+        start_date, end_date = date_range or (None, None)
+        if start_date:
+            conditions.append("g.air_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("g.air_date <= ?")
+            params.append(end_date)
+
+        # Category hits weigh more than incidental words in the clue text
+        self.cursor.execute(
+            CLUE_SELECT.replace("FROM clues c", """,
+                snippet(clues_fts, -1, ?, ?, '...', 16) as snippet,
+                -bm25(clues_fts, 2.0, 1.0, 1.0) as score
+            FROM clues_fts
+            JOIN clues c ON c.id = clues_fts.rowid""")
+            + " WHERE " + " AND ".join(conditions)
+            + " ORDER BY bm25(clues_fts, 2.0, 1.0, 1.0) LIMIT ?",
+            [highlight[0], highlight[1]] + params + [limit]
+        )
+
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    @staticmethod
+    def _search_expression(query: str, fields: Optional[List[str]]) -> Optional[str]:
+        """Turn plain search words into an FTS5 MATCH expression"""
+        terms = []
+        for word in re.findall(r'\w+\*?', query):
+            prefix = word.endswith('*')
+            term = '"' + word.rstrip('*') + '"'
+            terms.append(term + '*' if prefix else term)
+
+        if not terms:
+            return None
+
+        expression = ' '.join(terms)
+        if fields:
+            unknown = set(fields) - set(SEARCH_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown search fields: {', '.join(sorted(unknown))}")
+            expression = '{' + ' '.join(fields) + '} : (' + expression + ')'
+
+        return expression
+
+    def _sample_clue_ids(self, conditions: List[str], params: List, n: int) -> List[int]:
+        """
+        Pick up to n distinct clue ids uniformly at random among matching clues
+
+        Draws random ids between MIN(id) and MAX(id) and keeps the ones that
+        exist and pass the filters (rejection sampling), so the cost is a
+        handful of primary key lookups instead of a sort over the whole
+        table. Probes are checked in batches that grow while the filters keep
+        rejecting them; past PROBE_LIMIT the remaining picks are made from
+        the full list of matching ids.
+
+        Args:
+            conditions: SQL conditions over `clues c` / `games g`, ANDed together
+            params: Parameters for the conditions
+            n: Number of clues wanted
+
+        Returns:
+            Clue ids in random order (fewer than n if not enough clues match)
+        """
+        if n <= 0:
+            return []
+
+        # Separate subqueries: SQLite only answers a lone MIN()/MAX() from the index
+        self.cursor.execute("SELECT (SELECT MIN(id) FROM clues), (SELECT MAX(id) FROM clues)")
+        low, high = self.cursor.fetchone()
+        if low is None:
+            return []
+
+        filters = "".join(f" AND {condition}" for condition in conditions)
+        chosen = []
+        seen = set()
+        batch_size = max(8, 4 * n)
+
+        while len(seen) < max(PROBE_LIMIT, 64 * n):
+            if len(seen) > high - low:
+                # Every id in range has been checked
+                return chosen
+
+            candidates = {random.randint(low, high) for _ in range(batch_size)} - seen
+            seen.update(candidates)
+
+            matches = []
+            candidates = list(candidates)
+            for start in range(0, len(candidates), 500):
+                chunk = candidates[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                # NOT INDEXED keeps the lookups on the primary key; otherwise a
+                # category filter can lead SQLite to cross every matching
+                # category_id with every probed id
+                self.cursor.execute(
+                    "SELECT c.id FROM clues c NOT INDEXED JOIN games g ON c.game_id = g.game_id"
+                    f" WHERE c.id IN ({placeholders}){filters}",
+                    chunk + params
+                )
+                matches.extend(row[0] for row in self.cursor.fetchall())
+
+            random.shuffle(matches)
+            chosen.extend(matches[:n - len(chosen)])
+            if len(chosen) == n:
+                return chosen
+
+            batch_size = min(batch_size * 8, 2000)
+
+        # Filters are too selective for probing; enumerate the matches
+        query = "SELECT c.id FROM clues c JOIN games g ON c.game_id = g.game_id"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        self.cursor.execute(query, params)
+
+        picked = set(chosen)
+        remaining = [row[0] for row in self.cursor.fetchall() if row[0] not in picked]
+        chosen.extend(random.sample(remaining, min(n - len(chosen), len(remaining))))
+        return chosen
+
+    def _fetch_clues(self, clue_ids: List[int]) -> List[Dict]:
+        """Load clue dictionaries for the given ids, preserving their order"""
+        return [clue._asdict() for clue in self._fetch_clue_records(clue_ids)]
+
+    def _fetch_clue_records(self, clue_ids: List[int]) -> List[Clue]:
+        """Load Clue records for the given ids, preserving their order"""
+        if not clue_ids:
+            return []
+
+        records = {}
+        for start in range(0, len(clue_ids), 500):
+            chunk = clue_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            self.cursor.execute(CLUE_SELECT + f" WHERE c.id IN ({placeholders})", chunk)
+            records.update((row[0], Clue._make(row)) for row in self.cursor.fetchall())
+
+        return [records[clue_id] for clue_id in clue_ids if clue_id in records]
+
+    def get_page_validators(self, game_ids: Iterable[int]) -> Dict[int, Dict[str, str]]:
+        """
+        Stored ETag/Last-Modified values of many games in one query
+
+        Returns:
+            Dictionary mapping game_id to {'etag': ..., 'last_modified': ...}
+            (keys without a value are left out). Games without validators
+            are missing
+        """
+        self.cursor.execute("""
+            SELECT game_id, etag, last_modified FROM page_validators
+            WHERE game_id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(game_ids)),))
+
+        validators = {}
+        for game_id, etag, last_modified in self.cursor.fetchall():
+            stored = {'etag': etag, 'last_modified': last_modified}
+            validators[game_id] = {key: value for key, value in stored.items() if value}
+        return validators
+
+    def save_page_validators(self, game_id: int, validators: Dict[str, str]):
+        """
+        Remember the validators of the page a stored game was parsed from
+
+        Call this only once the game itself is stored: a later conditional
+        request that gets 304 Not Modified skips the page.
+        """
+        if validators:
+            self.cursor.execute("""
+                INSERT OR REPLACE INTO page_validators (game_id, etag, last_modified)
+                VALUES (?, ?, ?)
+            """, (game_id, validators.get('etag'), validators.get('last_modified')))
+        else:
+            self.cursor.execute("DELETE FROM page_validators WHERE game_id = ?", (game_id,))
+        self.conn.commit()
+
+    @cached
+    def get_stats(self) -> Dict:
+        """Get database statistics"""
+        if self.has_stats:
+            self.cursor.execute("SELECT name, value FROM stats")
+            counters = {row[0]: row[1] for row in self.cursor.fetchall()}
+        else:
+            # Read-only handle on a database that predates the stats table
+            counters = self._count_stats()
+
+        # Each MIN/MAX is answered from its index
+        self.cursor.execute("""
+            SELECT
+                (SELECT MIN(show_number) FROM games),
+                (SELECT MAX(show_number) FROM games),
+                (SELECT MIN(air_date) FROM games),
+                (SELECT MAX(air_date) FROM games)
+        """)
+        show_min, show_max, date_min, date_max = self.cursor.fetchone()
+
+        return {
+            'total_games': counters['total_games'],
+            'total_clues': counters['total_clues'],
+            'unique_categories': counters['unique_categories'],
+            'show_number_range': {
+                'min': show_min,
+                'max': show_max
+            } if show_min else None,
+            'date_range': {
+                'min': date_min,
+                'max': date_max
+            } if date_min else None
+        }
+
+    @cached
+    def get_category_counts(self, limit: int = None) -> List[Dict]:
+        """
+        Get clue counts per category, largest first
+
+        Args:
+            limit: Maximum number of categories to return (default: all)
+
+        Returns:
+            List of {'category', 'clue_count'} dictionaries
+        """
+        query = """
+            SELECT cat.name as category, counts.clue_count
+            FROM category_counts counts
+            JOIN categories cat ON cat.category_id = counts.category_id
+            ORDER BY counts.clue_count DESC, cat.name
+        """
+        params = []
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        self.cursor.execute(query, params)
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def find_duplicates(self, clue_id: int) -> List[Dict]:
+        """
+        Other stored copies of a clue: exact repeats and rewordings
+
+        Args:
+            clue_id: Id of a stored clue
+
+        Returns:
+            The rest of the clue's cluster as clue dictionaries, in id order
+            (the representative first), each with an extra 'exact' entry:
+            True if text and answer match the given clue's after
+            normalization. Empty if the clue has no duplicates
+        """
+        self.cursor.execute("""
+            WITH cluster AS (
+                SELECT COALESCE(
+                    (SELECT representative_id FROM clue_duplicates WHERE clue_id = ?), ?
+                ) AS representative_id
+            )
+            SELECT representative_id FROM cluster
+            UNION
+            SELECT d.clue_id FROM clue_duplicates d JOIN cluster USING (representative_id)
+        """, (clue_id, clue_id))
+        members = sorted(row[0] for row in self.cursor.fetchall())
+        if len(members) < 2:
+            return []
+
+        self.cursor.execute(
+            "SELECT clue_id, content_hash FROM clue_fingerprints WHERE clue_id IN (SELECT value FROM json_each(?))",
+            (json.dumps(members),)
+        )
+        hashes = {row[0]: row[1] for row in self.cursor.fetchall()}
+
+        clues = self._fetch_clues([member for member in members if member != clue_id])
+        for clue in clues:
+            clue['exact'] = hashes.get(clue['id']) == hashes.get(clue_id)
+        return clues
+
+    def get_duplicate_counts(self) -> Dict[str, int]:
+        """Number of duplicate clusters and of clues that repeat a representative"""
+        self.cursor.execute("SELECT COUNT(DISTINCT representative_id), COUNT(*) FROM clue_duplicates")
+        clusters, duplicates = self.cursor.fetchone()
+        return {'clusters': clusters, 'duplicate_clues': duplicates}
+
+    def get_duplicate_clusters(self, min_size: int = 2, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Groups of clues that repeat each other, largest first
+
+        Args:
+            min_size: Smallest cluster to return (clues per cluster)
+            limit: Maximum number of clusters to return (default: all)
+
+        Returns:
+            List of {'representative_id', 'size', 'clues'} dictionaries;
+            'clues' holds clue dictionaries in id order, the representative
+            first
+        """
+        query = """
+            SELECT representative_id, COUNT(*) + 1 AS size
+            FROM clue_duplicates
+            GROUP BY representative_id
+            HAVING size >= ?
+            ORDER BY size DESC, representative_id
+        """
+        params = [min_size]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        self.cursor.execute(query, params)
+        clusters = [
+            {'representative_id': row[0], 'size': row[1], 'clues': []}
+            for row in self.cursor.fetchall()
+        ]
+        if not clusters:
+            return []
+
+        by_id = {cluster['representative_id']: cluster for cluster in clusters}
+        self.cursor.execute("""
+            SELECT clue_id, representative_id FROM clue_duplicates
+            WHERE representative_id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(by_id)),))
+        owner = {representative: representative for representative in by_id}
+        owner.update((row[0], row[1]) for row in self.cursor.fetchall())
+
+        for clue in self._fetch_clues(sorted(owner)):
+            by_id[owner[clue['id']]]['clues'].append(clue)
+        return clusters
+
+    def grade_responses(self, pairs: Iterable[Tuple[int, str]]) -> List[Grade]:
+        """
+        Grade typed responses against the stored answers, many at a time
+
+        The answers were normalized and split into aliases when their clues
+        were stored (answer_index), so one query loads them for every clue
+        in the call. Each distinct response is normalized once; it then
+        needs a set lookup, or for a near miss an edit distance that stops
+        at the alias's typo budget (see answers.grade).
+
+        Args:
+            pairs: (clue_id, response) tuples. Responses may be phrased as
+                questions ("What is the Nile?")
+
+        Returns:
+            One answers.Grade (clue_id, correct, score, alias) per pair,
+            in order. Clues stored without an answer grade as incorrect
+
+        Raises:
+            ValueError: For a clue id that isn't stored
+        """
+        pairs = list(pairs)
+        clue_ids = json.dumps(sorted({clue_id for clue_id, _ in pairs}))
+
+        self.cursor.execute("""
+            SELECT c.id, a.normalized, a.aliases
+            FROM clues c
+            LEFT JOIN answer_index a ON a.clue_id = c.id
+            WHERE c.id IN (SELECT value FROM json_each(?))
+        """, (clue_ids,))
+        forms = {}
+        for clue_id, normalized, others in self.cursor.fetchall():
+            if normalized is None:
+                forms[clue_id] = ()
+            else:
+                forms[clue_id] = (normalized, *others.split('|')) if others else (normalized,)
+
+        normalized = {}
+        grades = []
+        for clue_id, response in pairs:
+            if clue_id not in forms:
+                raise ValueError(f"grade_responses got clue id {clue_id}, which is not in the database")
+            key = normalized.get(response)
+            if key is None:
+                key = normalized[response] = normalize(response)
+            grades.append(grade(clue_id, key, forms[clue_id]))
+        return grades
+
+    def record_reviews(self, user: str, reviews: Iterable[Tuple], batch_size: int = 1000) -> int:
+        """
+        Record answers and reschedule the cards (SM-2, see scheduler.sm2)
+
+        Each batch is one transaction. One query reads the current states
+        of the batch's cards, and one executemany each writes the new states
+        and appends the history. An answer therefore costs a few B-tree
+        operations, however long the history grows.
+
+        Args:
+            user: Name of the person studying (created on first use)
+            reviews: (clue_id, grade) or (clue_id, grade, reviewed_at)
+                tuples. grade is 0-5; reviewed_at is a Unix time (default:
+                now). Several answers to the same clue are applied in order
+            batch_size: Answers written per transaction
+
+        Returns:
+            Number of answers recorded
+
+        Raises:
+            ValueError: For a grade outside 0-5 or a clue id that isn't
+                stored. Earlier batches stay recorded
+        """
+        recorded = 0
+        user_id = None
+        reviews = iter(reviews)
+        try:
+            while True:
+                batch = list(islice(reviews, batch_size))
+                if not batch:
+                    break
+                if user_id is None:
+                    user_id = self._user_id(user, create=True)
+
+                now = time.time()
+                distinct_ids = {review[0] for review in batch}
+                clue_ids = json.dumps(sorted(distinct_ids))
+
+                self.cursor.execute(
+                    "SELECT COUNT(*) FROM clues WHERE id IN (SELECT value FROM json_each(?))", (clue_ids,)
+                )
+                if self.cursor.fetchone()[0] != len(distinct_ids):
+                    raise ValueError("record_reviews got a clue id that is not in the database")
+
+                self.cursor.execute("""
+                    SELECT clue_id, due, interval, ease, repetitions, lapses, last_review
+                    FROM review_state
+                    WHERE user_id = ? AND clue_id IN (SELECT value FROM json_each(?))
+                """, (user_id, clue_ids))
+                states = {row[0]: ReviewState._make(row[1:]) for row in self.cursor.fetchall()}
+
+                log = []
+                changed = {}
+                for review in batch:
+                    clue_id, grade = review[0], review[1]
+                    reviewed_at = review[2] if len(review) > 2 and review[2] is not None else now
+                    state = changed[clue_id] = states[clue_id] = sm2(states.get(clue_id), grade, reviewed_at)
+                    log.append((user_id, clue_id, state.last_review, grade, state.interval, state.ease))
+
+                self.cursor.executemany("""
+                    INSERT OR REPLACE INTO review_state
+                        (clue_id, user_id, due, interval, ease, repetitions, lapses, last_review)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, [(clue_id, user_id, *state) for clue_id, state in changed.items()])
+                self.cursor.executemany("""
+                    INSERT INTO review_log (user_id, clue_id, reviewed_at, grade, interval, ease)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, log)
+
+                self.conn.commit()
+                recorded += len(batch)
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+        return recorded
+
+    def next_due_clues(
+        self,
+        user: str,
+        n: int = 20,
+        filters: Optional[Dict] = None,
+        now: Optional[float] = None,
+        include_new: bool = True
+    ) -> List[Dict]:
+        """
+        The next cards for a user to study: due reviews first, then new clues
+
+        Due cards come most overdue first, read from idx_review_due with an
+        index seek on (user, due) rather than a scan of the review table.
+        If fewer than n are due, the rest are random clues the user has
+        never reviewed.
+
+        Args:
+            user: Name of the person studying
+            n: Number of cards wanted
+            filters: Optional filters, using the keyword arguments of
+                `get_random_clues` (exclude_final, start_date, end_date,
+                category, round, show_number, dedupe)
+            now: Unix time to schedule against (default: now)
+            include_new: Fill up with never-reviewed clues
+
+        Returns:
+            Up to n clue dictionaries, each with an extra 'review' entry:
+            the card's state (due, interval, ease, repetitions, lapses,
+            last_review) or None for a new card
+        """
+        now = int(time.time() if now is None else now)
+        conditions, params = self._filter_conditions(**(filters or {}))
+        user_id = self._user_id(user)
+
+        due_ids = []
+        if user_id is not None and n > 0:
+            if conditions:
+                query = """
+                    SELECT rs.clue_id
+                    FROM review_state rs
+                    JOIN clues c ON c.id = rs.clue_id
+                    JOIN games g ON g.game_id = c.game_id
+                    WHERE rs.user_id = ? AND rs.due <= ?
+                """ + "".join(f" AND {condition}" for condition in conditions)
+            else:
+                query = "SELECT rs.clue_id FROM review_state rs WHERE rs.user_id = ? AND rs.due <= ?"
+            self.cursor.execute(query + " ORDER BY rs.due LIMIT ?", [user_id, now] + params + [n])
+            due_ids = [row[0] for row in self.cursor.fetchall()]
+
+        new_ids = []
+        if include_new and len(due_ids) < n:
+            if user_id is not None:
+                conditions = conditions + [
+                    "NOT EXISTS (SELECT 1 FROM review_state rs WHERE rs.clue_id = c.id AND rs.user_id = ?)"
+                ]
+                params = params + [user_id]
+            new_ids = self._sample_clue_ids(conditions, params, n - len(due_ids))
+
+        clues = self._fetch_clues(due_ids + new_ids)
+
+        states = {}
+        if due_ids:
+            self.cursor.execute("""
+                SELECT clue_id, due, interval, ease, repetitions, lapses, last_review
+                FROM review_state
+                WHERE user_id = ? AND clue_id IN (SELECT value FROM json_each(?))
+            """, (user_id, json.dumps(due_ids)))
+            states = {row[0]: ReviewState._make(row[1:])._asdict() for row in self.cursor.fetchall()}
+        for clue in clues:
+            clue['review'] = states.get(clue['id'])
+
+        return clues
+
+    def _user_id(self, name: str, create: bool = False) -> Optional[int]:
+        """Id of a studying user by name (None if unknown and not created)"""
+        self.cursor.execute("SELECT user_id FROM users WHERE name = ?", (name,))
+        row = self.cursor.fetchone()
+        if row:
+            return row[0]
+        if not create:
+            return None
+        self.cursor.execute("INSERT INTO users (name) VALUES (?)", (name,))
+        return self.cursor.lastrowid
 
     def close(self):
         """Close database connection"""
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Connection pool for serving JeopardyDatabase to multi-threaded web servers
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+try:
+    from .database import JeopardyDatabase
+except ImportError:
+    # Imported as a top-level module (e.g. from run_scraper.py)
+    from database import JeopardyDatabase
+
+
+class DatabasePool:
+    """
+    One read-only connection per thread plus a single shared writer
+
+    The writer is opened first, so the schema is created (and WAL enabled)
+    once for the pool. Every thread that reads gets its own `mode=ro`
+    connection on first use; with WAL, readers never block the writer or
+    each other. Writes are serialized through `writer()`.
+
+    With `snapshot`, readers serve from an immutable snapshot file (see
+    JeopardyDatabase.snapshot) instead, so they don't touch the file the
+    scraper writes to at all. `publish_snapshot()` rebuilds it from the
+    writer and swaps it in atomically; each thread moves to the new file
+    on its next `reader()` call, and a request already running finishes on
+    the old one.
+
+    Example:
+        pool = DatabasePool("data/jeopardy.db")
+
+        # In a request handler
+        clue = pool.reader().get_random_clue()
+
+        with pool.writer() as db:
+            db.insert_game(game_data)
+
+        pool.close()
+
+        # Serving from a snapshot, refreshed after a scrape
+        pool = DatabasePool("data/jeopardy.db", snapshot="data/jeopardy-snapshot.db")
+        ...
+        pool.publish_snapshot()
+    """
+
+    def __init__(
+        self,
+        db_path: str = None,
+        snapshot: Optional[str] = None,
+        cache_size: int = 0,
+        cache_ttl: Optional[float] = None
+    ):
+        """
+        Args:
+            db_path: Path to SQLite database file. Defaults to data/jeopardy.db
+            snapshot: Serve reads from this snapshot file, built from the
+                database first if it doesn't exist yet
+            cache_size: Result cache size of each reader (see
+                JeopardyDatabase); 0 disables it. Caches are per handle,
+                not shared: every thread warms its own, and the pool can
+                hold up to cache_size results per reading thread
+            cache_ttl: Seconds a cached result stays valid (default: until
+                the next write)
+        """
+        self._writer = JeopardyDatabase(db_path, check_same_thread=False)
+        self.db_path = self._writer.db_path
+        self._cache = {'cache_size': cache_size, 'cache_ttl': cache_ttl}
+        self.snapshot_path = Path(snapshot) if snapshot else None
+        if self.snapshot_path and not self.snapshot_path.exists():
+            self._writer.snapshot(self.snapshot_path)
+
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._readers: List[JeopardyDatabase] = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+
+    def reader(self) -> JeopardyDatabase:
+        """Return the calling thread's read-only database handle"""
+        if self._closed:
+            raise RuntimeError("DatabasePool is closed")
+
+        db = getattr(self._local, 'db', None)
+        if db is not None and self.snapshot_path and self._local.file != self._snapshot_file():
+            # A new snapshot was swapped in since this thread's handle opened
+            with self._readers_lock:
+                self._readers.remove(db)
+            db.close()
+            db = None
+
+        if db is None:
+            # Closed by close() from whichever thread shuts the pool down
+            if self.snapshot_path:
+                self._local.file = self._snapshot_file()
+                db = JeopardyDatabase(self.snapshot_path, immutable=True, check_same_thread=False, **self._cache)
+            else:
+                db = JeopardyDatabase(self.db_path, read_only=True, check_same_thread=False, **self._cache)
+            self._local.db = db
+            with self._readers_lock:
+                self._readers.append(db)
+        return db
+
+    def _snapshot_file(self):
+        """Identity of the file now at the snapshot path (changes when one is swapped in)"""
+        stat = os.stat(self.snapshot_path)
+        return stat.st_dev, stat.st_ino
+
+    def publish_snapshot(self) -> Path:
+        """
+        Rebuild the serving snapshot from the writer and swap it in
+
+        Returns:
+            The snapshot's path
+        """
+        if self.snapshot_path is None:
+            raise RuntimeError("DatabasePool was created without a snapshot path")
+
+        with self.writer() as db:
+            return db.snapshot(self.snapshot_path)
+
+    @contextmanager
+    def writer(self) -> Iterator[JeopardyDatabase]:
+        """Hold the single writer connection for the duration of the block"""
+        if self._closed:
+            raise RuntimeError("DatabasePool is closed")
+
+        with self._write_lock:
+            yield self._writer
+
+    def close(self):
+        """Close the writer and every reader handed out so far"""
+        self._closed = True
+        with self._readers_lock:
+            for db in self._readers:
+                db.close()
+            self._readers = []
+        with self._write_lock:
+            self._writer.close()
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
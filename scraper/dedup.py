@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Duplicate and near-duplicate clue detection
+
+J-Archive repeats itself: reruns air whole games again and writers recycle
+clues with small edits. Every clue gets two fingerprints:
+
+- a content hash of its normalized text and answer, so an exact repeat is
+  found with one index lookup, and
+- a MinHash signature over the clue's word pairs, cut into LSH bands. Two
+  clues whose word pairs largely overlap almost surely agree on at least
+  one band, so near-duplicate candidates come from a handful of bucket
+  lookups instead of a comparison with every other clue.
+
+Candidates are then confirmed with the exact Jaccard similarity of the two
+word-pair sets and an equal normalized answer, so the LSH index only has
+to be good at not missing pairs. JeopardyDatabase keeps the fingerprints
+and the resulting clusters up to date as games are inserted (see
+find_duplicates).
+"""
+
+import re
+import zlib
+from hashlib import blake2b
+from typing import FrozenSet, List, NamedTuple, Optional
+
+try:
+    from .answers import normalize as _normalize_answer
+except ImportError:
+    # Imported as a top-level module (e.g. from run_scraper.py)
+    from answers import normalize as _normalize_answer
+
+
+# 8 bands of 4 rows: pairs with a Jaccard similarity of 0.7 share a band
+# 89% of the time, at 0.8 98.5%; at 0.3 only 6% become candidates
+BANDS = 8
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+
+# Word-pair Jaccard similarity at which two clues count as duplicates.
+# Swapping one word in the middle of a 16-word clue leaves 13/17 = 0.76
+SIMILARITY = 0.7
+
+# Lanes of a packed signature (see minhash): 15 value bits and a guard bit
+_VALUES = int.from_bytes(b'\xff\x7f' * NUM_PERM, 'little')
+_GUARDS = int.from_bytes(b'\x00\x80' * NUM_PERM, 'little')
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class Fingerprint(NamedTuple):
+    """What the duplicate index knows about a clue"""
+    content_hash: int        # Signed 64-bit, so SQLite stores it as an integer
+    buckets: List[int]       # One LSH bucket key per band
+    shingles: FrozenSet[int]
+    answer: str              # Normalized answer
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase words with punctuation, quotes and markup stripped"""
+    return ' '.join(_WORD.findall((text or '').lower().replace("'", '')))
+
+
+def normalize_answer(answer: Optional[str]) -> str:
+    """
+    Normalized answer, the same form answers.py grades against
+
+    Changing answers.normalize changes the content hashes, so existing
+    databases then need `duplicates --rebuild`.
+    """
+    return _normalize_answer(answer)
+
+
+def shingles(text: Optional[str]) -> FrozenSet[int]:
+    """Hashes of the clue's adjacent word pairs (single words for one-word clues)"""
+    return _word_pairs(normalize(text))
+
+
+def _word_pairs(normalized: str) -> FrozenSet[int]:
+    words = normalized.split()
+    if len(words) > 1:
+        words = [f"{first} {second}" for first, second in zip(words, words[1:])]
+    return frozenset(zlib.crc32(word.encode()) for word in words)
+
+
+def similarity(first: FrozenSet[int], second: FrozenSet[int]) -> float:
+    """Jaccard similarity of two shingle sets"""
+    if not first or not second:
+        return 0.0
+    overlap = len(first & second)
+    return overlap / (len(first) + len(second) - overlap)
+
+
+def content_hash(clue: Optional[str], answer: Optional[str]) -> int:
+    """Hash of the normalized clue and answer"""
+    return _content_hash(normalize(clue), normalize_answer(answer))
+
+
+def _content_hash(normalized_clue: str, normalized_answer: str) -> int:
+    key = f"{normalized_clue}\x1f{normalized_answer}".encode()
+    return int.from_bytes(blake2b(key, digest_size=8).digest(), 'big', signed=True)
+
+
+def minhash(shingle_set: FrozenSet[int]) -> bytes:
+    """
+    MinHash signature: the smallest value of each hash function over the set
+
+    A shingle's 32 hash values are 15-bit slices of one BLAKE2b digest,
+    held in the 16-bit lanes of a single integer. The spare top bit of
+    each lane is a guard: in (best | guards) - value it stays set exactly
+    in the lanes where best >= value, without borrowing from the next
+    lane. That mask updates all 32 minima with a handful of big-integer
+    operations per shingle instead of 32 comparisons.
+
+    Returns:
+        The 32 minima as little-endian 16-bit values
+    """
+    best = _VALUES
+    for shingle in shingle_set:
+        digest = blake2b(shingle.to_bytes(4, 'little'), digest_size=2 * NUM_PERM).digest()
+        value = int.from_bytes(digest, 'little') & _VALUES
+        smaller = (((best | _GUARDS) - value) & _GUARDS) >> 15
+        best ^= (best ^ value) & (smaller * 0x7fff)
+    return best.to_bytes(2 * NUM_PERM, 'little')
+
+
+def band_keys(signature: bytes) -> List[int]:
+    """
+    LSH bucket key of each band
+
+    The band number seeds the hash, so equal rows in different bands land
+    in different buckets. Keys are 31-bit; the rare collision only adds a
+    candidate that fails verification.
+    """
+    width = 2 * ROWS
+    return [
+        zlib.crc32(signature[band * width:(band + 1) * width], band) & 0x7fffffff
+        for band in range(BANDS)
+    ]
+
+
+def fingerprint(clue: Optional[str], answer: Optional[str], lsh: bool = True) -> Optional[Fingerprint]:
+    """
+    Fingerprint a clue
+
+    Args:
+        clue: Clue text
+        answer: Correct response
+        lsh: Compute the LSH bucket keys. Without them (buckets is empty)
+            the fingerprint is only good for is_duplicate, at a fraction
+            of the cost
+
+    Returns:
+        The Fingerprint, or None for a clue without any words (media-only
+        clues), which can't be told apart by text
+    """
+    text = normalize(clue)
+    shingle_set = _word_pairs(text)
+    if not shingle_set:
+        return None
+    answer = normalize_answer(answer)
+    return Fingerprint(
+        content_hash=_content_hash(text, answer),
+        buckets=band_keys(minhash(shingle_set)) if lsh else [],
+        shingles=shingle_set,
+        answer=answer
+    )
+
+
+def is_duplicate(first: Fingerprint, second: Fingerprint, threshold: float = SIMILARITY) -> bool:
+    """True if two fingerprinted clues are the same clue, possibly reworded"""
+    if first.content_hash == second.content_hash:
+        return True
+    return first.answer == second.answer and similarity(first.shingles, second.shingles) >= threshold
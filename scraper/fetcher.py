@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP fetcher for J-Archive pages with conditional GET support
+"""
+
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+try:
+    from .throttle import AdaptiveRateLimiter, CircuitBreaker, backoff_delay, parse_retry_after
+except ImportError:
+    # Imported as a top-level module (e.g. from run_scraper.py)
+    from throttle import AdaptiveRateLimiter, CircuitBreaker, backoff_delay, parse_retry_after
+
+
+DEFAULT_TIMEOUT = (5.0, 30.0)
+USER_AGENT = "jeopardy-studying-scraper/1.0"
+
+# Answers that mean "try again later" rather than "this page is broken"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchedPage(NamedTuple):
+    """A downloaded page and the validators to revalidate it with next time"""
+    content: Optional[bytes]    # None if the server answered 304 Not Modified
+    validators: Dict[str, str]  # 'etag' and/or 'last_modified' as the server sent them
+
+
+class JArchiveFetcher:
+    """
+    Reusable HTTP client shared by the scraper and the batch runner
+
+    Keeps one `requests.Session` with a connection pool so consecutive
+    requests reuse keep-alive connections, advertises every content encoding
+    urllib3 can decode (gzip/deflate, plus brotli when installed), and
+    can send the ETag/Last-Modified of an earlier download so re-scrapes
+    are conditional. Storing the validators is up to the caller, so they
+    are only kept once the page has been parsed and stored.
+
+    429/5xx answers and connection errors are retried with jittered
+    exponential backoff (at least as long as any Retry-After header asks).
+    """
+
+    def __init__(
+        self,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        retry_base: float = 1.0,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Initialize the fetcher
+
+        Args:
+            timeout: Request timeout in seconds, or a (connect, read) tuple
+            pool_size: Maximum number of pooled connections per host
+            max_retries: Retries after a 429/5xx answer or connection error
+            retry_base: Backoff bound in seconds for the first retry; it
+                doubles with every further retry
+            rate_limiter: Adaptive limiter that paces every request and is
+                told how each one went
+            breaker: Circuit breaker that pauses requests while the host
+                keeps failing
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding'],
+            'Connection': 'keep-alive'
+        })
+
+    def fetch(self, url: str, validators: Optional[Dict[str, str]] = None) -> FetchedPage:
+        """
+        Download a page
+
+        Args:
+            url: Page URL
+            validators: ETag/Last-Modified of an earlier download (as
+                returned in FetchedPage.validators). When given, they are
+                sent as If-None-Match/If-Modified-Since
+
+        Returns:
+            FetchedPage with the decoded response body (None if the server
+            answered 304 Not Modified) and the page's new validators
+        """
+        headers = {}
+        if validators:
+            if 'etag' in validators:
+                headers['If-None-Match'] = validators['etag']
+            if 'last_modified' in validators:
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        response = self._get(url, headers)
+
+        if response.status_code == 304:
+            return FetchedPage(None, dict(validators))
+        response.raise_for_status()
+
+        fresh = {}
+        if response.headers.get('ETag'):
+            fresh['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            fresh['last_modified'] = response.headers['Last-Modified']
+
+        return FetchedPage(response.content, fresh)
+
+    def _get(self, url: str, headers: Dict[str, str]) -> requests.Response:
+        """GET with pacing, retries and circuit breaking (the last response is returned as-is)"""
+        for attempt in range(self.max_retries + 1):
+            if self.breaker is not None:
+                self.breaker.wait()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            start = time.monotonic()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record_failure()
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(backoff_delay(attempt, self.retry_base))
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                # Any other answer (404 included) means the host is healthy
+                if self.rate_limiter is not None:
+                    self.rate_limiter.record_success(time.monotonic() - start)
+                if self.breaker is not None:
+                    self.breaker.record_success()
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            self._record_failure(retry_after)
+            if attempt == self.max_retries:
+                return response
+
+            delay = backoff_delay(attempt, self.retry_base)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            print(f"  HTTP {response.status_code} for {url}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def _record_failure(self, retry_after: Optional[float] = None):
+        """Tell the rate limiter and breaker that a request failed"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_throttled(retry_after)
+        if self.breaker is not None:
+            self.breaker.record_failure()
+
+    def close(self):
+        """Release pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+
+
+_default_fetcher = None
+_default_lock = threading.Lock()
+
+
+def get_default_fetcher() -> JArchiveFetcher:
+    """Return the process-wide fetcher used when callers don't pass their own"""
+    global _default_fetcher
+
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = JArchiveFetcher()
+        return _default_fetcher
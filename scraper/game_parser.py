@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+HTML parsing for J-Archive game pages
+
+`parse_game_html` turns a downloaded showgame.php page into the game
+dictionary used throughout the project. Two backends are available:
+
+    stream  Single-pass parser built on the standard library's HTMLParser.
+            Extracts clues while tokenizing, without building a tree (default)
+    bs4     The original BeautifulSoup implementation, kept as a reference
+
+The stream backend only understands the showgame.php markup the bs4
+backend reads, and gives the same result on it:
+
+    <title>                 "Show #N, aired YYYY-MM-DD"
+    table.round             one per board round, in page order; its direct
+                            <tr> children are the board rows
+      td.category           (first row) the first td.category_name inside
+                            is the category name
+      td.clue               (later rows) the first td.clue_text inside is
+                            the clue, the first em.correct_response the
+                            answer; clue_value_daily_double anywhere in
+                            the cell's markup marks a Daily Double
+    table.final_round       the first div.category_name, the first
+                            td.clue_text and the first div[onmouseover]
+                            holding the correct response
+
+Like BeautifulSoup on html.parser it closes void elements (<br>, <img>)
+at once (dropping a later </br> for each <br>), lets an end tag close
+every element opened inside it, ignores end tags without an open
+element, skips script/style text and turns whitespace-only text into a
+single space or newline. Anything else about the page (other elements,
+malformed or control-character references, CDATA, a comment or tag left
+open at the end of the page) is not looked at, so pages far from
+J-Archive's layout may parse differently.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Union
+
+try:
+    from .board import board_values
+except ImportError:
+    # Imported as a top-level module (e.g. from run_scraper.py)
+    from board import board_values
+
+
+DEFAULT_BACKEND = 'stream'
+
+DAILY_DOUBLE_MARKER = 'clue_value_daily_double'
+
+
+def parse_game_html(
+    html: Union[bytes, str],
+    game_id: int,
+    url: Optional[str] = None,
+    backend: str = DEFAULT_BACKEND
+) -> Dict:
+    """
+    Parse a J-Archive game page
+
+    Args:
+        html: Raw page content as downloaded (bytes) or already decoded
+        game_id: The game ID the page belongs to
+        url: Page URL stored in the result. Defaults to the J-Archive URL
+        backend: Parser backend name, one of PARSER_BACKENDS
+
+    Returns:
+        Dictionary containing all game data
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{backend}'. Choose from: {', '.join(PARSER_BACKENDS)}")
+
+    if url is None:
+        url = f"https://j-archive.com/showgame.php?game_id={game_id}"
+
+    return PARSER_BACKENDS[backend](html, game_id, url)
+
+
+def _new_game(game_id: int, url: str, game_title: str) -> Dict:
+    """Build the game dictionary skeleton from the page title"""
+    # Extract show number from title (e.g., "J! Archive - Show #9426, aired 2025-11-03")
+    show_number = None
+    show_match = re.search(r'Show #(\d+)', game_title)
+    if show_match:
+        show_number = int(show_match.group(1))
+
+    # Extract air date from title (e.g., "aired 2025-11-03")
+    air_date = None
+    date_match = re.search(r'aired (\d{4}-\d{2}-\d{2})', game_title)
+    if date_match:
+        air_date = date_match.group(1)
+
+    return {
+        'game_id': game_id,
+        'show_number': show_number,
+        'title': game_title,
+        'url': url,
+        'air_date': air_date,
+        # Category names in board order (left to right) for each round
+        'categories': {'jeopardy_round': [], 'double_jeopardy_round': []},
+        'jeopardy_round': [],
+        'double_jeopardy_round': [],
+        'final_jeopardy': None
+    }
+
+
+def _final_answer(mouseover: Optional[str]) -> Optional[str]:
+    """Pull the Final Jeopardy response out of an onmouseover handler"""
+    if mouseover is None:
+        return None
+    answer_match = re.search(r'correct_response[^>]*>([^<]+)<', mouseover)
+    if answer_match:
+        return answer_match.group(1).strip()
+    return None
+
+
+# ---------------------------------------------------------------------------
+# BeautifulSoup backend
+# ---------------------------------------------------------------------------
+
+def _parse_bs4(html: Union[bytes, str], game_id: int, url: str) -> Dict:
+    """Reference implementation: build a BeautifulSoup tree and query it"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extract game metadata
+    game_title = soup.find('title').text.strip() if soup.find('title') else "Unknown Game"
+
+    game_data = _new_game(game_id, url, game_title)
+
+    # Find all rounds
+    rounds = soup.find_all('table', class_='round')
+
+    for round_idx, round_table in enumerate(rounds):
+        round_name = 'jeopardy_round' if round_idx == 0 else 'double_jeopardy_round'
+
+        # Extract categories - use find_all with recursive=False to get only direct children
+        all_rows = round_table.find_all('tr', recursive=False)
+        categories = []
+        if all_rows:
+            category_row = all_rows[0]
+            category_cells = category_row.find_all('td', class_='category', recursive=False)
+            categories = [cat.find('td', class_='category_name').text.strip()
+                         for cat in category_cells if cat.find('td', class_='category_name')]
+
+        game_data['categories'][round_name] = categories
+        values = board_values(round_name, game_data['air_date'])
+
+        # Extract clues - skip first row (categories)
+        clue_rows = all_rows[1:]
+
+        for row_idx, row in enumerate(clue_rows):
+            value = values[row_idx] if row_idx < len(values) else 'Unknown'
+            clue_cells = row.find_all('td', class_='clue', recursive=False)
+
+            for cat_idx, cell in enumerate(clue_cells):
+                if cat_idx >= len(categories):
+                    continue
+
+                # Find clue text - it's a nested <td> with class clue_text
+                clue_text_td = cell.find('td', class_='clue_text')
+                if not clue_text_td:
+                    continue
+
+                clue_text = clue_text_td.text.strip()
+
+                # Find answer - it's in a hidden <td> element with the correct_response class
+                answer = None
+                correct_response_em = cell.find('em', class_='correct_response')
+                if correct_response_em:
+                    answer = correct_response_em.get_text(strip=True)
+
+                # Check if it's a Daily Double
+                daily_double = DAILY_DOUBLE_MARKER in str(cell)
+
+                clue_data = {
+                    'category': categories[cat_idx],
+                    'value': value,
+                    'clue': clue_text,
+                    'answer': answer,
+                    'daily_double': daily_double,
+                    'row': row_idx,
+                    'column': cat_idx
+                }
+
+                game_data[round_name].append(clue_data)
+
+    # Extract Final Jeopardy
+    final_round = soup.find('table', class_='final_round')
+    if final_round:
+        category_div = final_round.find('div', class_='category_name')
+        clue_text_td = final_round.find('td', class_='clue_text')
+
+        if category_div and clue_text_td:
+            onmouseover = final_round.find('div', onmouseover=True)
+
+            game_data['final_jeopardy'] = {
+                'category': category_div.text.strip(),
+                'clue': clue_text_td.text.strip(),
+                'answer': _final_answer(onmouseover.get('onmouseover') if onmouseover else None)
+            }
+
+    return game_data
+
+
+# ---------------------------------------------------------------------------
+# Streaming backend
+# ---------------------------------------------------------------------------
+
+# Elements BeautifulSoup closes as soon as they open
+_VOID_TAGS = frozenset([
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed',
+    'frame', 'hr', 'image', 'img', 'input', 'isindex', 'keygen', 'link',
+    'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr'
+])
+# Their text is not part of an element's text in BeautifulSoup
+_NON_TEXT_TAGS = frozenset(['rt', 'rp', 'style', 'script', 'template'])
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+class _Frame:
+    """An open element on the parser stack"""
+
+    __slots__ = ('tag', 'role', 'on_close')
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.role = None
+        self.on_close: List[Callable[[], None]] = []
+
+
+class _ClueCell:
+    """State for one `td.clue` cell of a round table"""
+
+    __slots__ = ('clue_text', 'answer', 'daily_double', 'seen_text', 'seen_answer')
+
+    def __init__(self):
+        self.clue_text: Optional[str] = None
+        self.answer: Optional[str] = None
+        self.daily_double = False
+        self.seen_text = False
+        self.seen_answer = False
+
+
+class _GameHTMLParser(HTMLParser):
+    """Extracts game data in a single pass over the token stream"""
+
+    def __init__(self):
+        super().__init__()
+        self.title: Optional[str] = None
+        self.rounds: List[Dict] = []
+        self.final: Optional[Dict] = None
+
+        self._stack: List[_Frame] = []
+        self._pending: List[str] = []
+        self._captures: List[List[str]] = []
+        self._non_text_depth = 0
+        self._open_cells: List[_ClueCell] = []
+        self._open_categories: List[Dict] = []
+        self._open_final: Optional[Dict] = None
+        # Void elements opened as <br>; BeautifulSoup drops one later </br> for each
+        self._closed_void: List[str] = []
+
+    # -- HTMLParser callbacks ---------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs)
+        if tag in _VOID_TAGS:
+            self._end(tag)
+            self._closed_void.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs)
+        self._end(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._closed_void:
+            # Not even the current text run ends
+            self._closed_void.remove(tag)
+            return
+        self._end(tag)
+
+    def handle_data(self, data):
+        self._pending.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+        if self._open_cells and DAILY_DOUBLE_MARKER in data:
+            self._mark_daily_double()
+
+    def close(self):
+        super().close()
+        self._flush()
+        while self._stack:
+            self._pop()
+
+    # -- text and element stack -------------------------------------------
+
+    def _flush(self):
+        """End the current text run; whitespace-only runs shrink as in BeautifulSoup"""
+        if not self._pending:
+            return
+
+        data = ''.join(self._pending)
+        self._pending = []
+        if self._open_cells and DAILY_DOUBLE_MARKER in data:
+            self._mark_daily_double()
+        if not data.strip(_ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+
+        if not self._non_text_depth:
+            for strings in self._captures:
+                strings.append(data)
+
+    def _mark_daily_double(self):
+        """The bs4 backend finds the marker anywhere in a cell's markup"""
+        for cell in self._open_cells:
+            cell.daily_double = True
+
+    def _capture(self, frame: _Frame, done: Callable[[List[str]], None]):
+        """Collect the text strings inside `frame` and hand them to `done` when it closes"""
+        strings: List[str] = []
+        self._captures.append(strings)
+
+        def close():
+            # By identity: two captures may hold equal strings
+            self._captures = [open_strings for open_strings in self._captures if open_strings is not strings]
+            done(strings)
+
+        frame.on_close.append(close)
+
+    def _start(self, tag: str, attrs):
+        self._flush()
+        frame = _Frame(tag)
+        if tag in ('title', 'table', 'tr', 'td', 'em', 'div'):
+            self._extract(tag, dict(attrs), frame)
+        if self._open_cells and (
+            DAILY_DOUBLE_MARKER in tag or
+            any(DAILY_DOUBLE_MARKER in name or DAILY_DOUBLE_MARKER in (value or '') for name, value in attrs)
+        ):
+            self._mark_daily_double()
+
+        self._stack.append(frame)
+        if tag in _NON_TEXT_TAGS:
+            self._non_text_depth += 1
+
+    def _end(self, tag: str):
+        self._flush()
+        # Close everything up to the matching element; stray end tags are ignored
+        if not any(frame.tag == tag for frame in self._stack):
+            return
+        while self._pop().tag != tag:
+            pass
+
+    def _pop(self) -> _Frame:
+        frame = self._stack.pop()
+        if frame.tag in _NON_TEXT_TAGS:
+            self._non_text_depth -= 1
+        for close in frame.on_close:
+            close()
+        return frame
+
+    # -- extraction -------------------------------------------------------
+
+    def _extract(self, tag: str, attrs: Dict, frame: _Frame):
+        """Attach extraction state to elements that can hold game data"""
+        parent = self._stack[-1] if self._stack else None
+        classes = (attrs.get('class') or '').split()
+
+        if tag == 'title' and self.title is None:
+            self.title = ''
+            self._capture(frame, lambda strings: setattr(self, 'title', ''.join(strings)))
+
+        elif tag == 'table' and 'round' in classes:
+            round_data = {'category_cells': [], 'rows': []}
+            self.rounds.append(round_data)
+            frame.role = ('round', round_data)
+
+        elif tag == 'table' and 'final_round' in classes and self.final is None:
+            self.final = {'category': None, 'clue': None, 'mouseover': None}
+            self._open_final = self.final
+            frame.on_close.append(lambda: setattr(self, '_open_final', None))
+
+        elif tag == 'tr' and parent and parent.role and parent.role[0] == 'round':
+            round_data = parent.role[1]
+            round_data['rows'].append([])
+            frame.role = ('row', round_data, len(round_data['rows']) - 1)
+
+        elif tag == 'td' and parent and parent.role and parent.role[0] == 'row':
+            _, round_data, row_idx = parent.role
+            if row_idx == 0 and 'category' in classes:
+                category = {'name': None, 'seen': False}
+                round_data['category_cells'].append(category)
+                self._open_categories.append(category)
+                frame.on_close.append(lambda: self._open_categories.remove(category))
+            elif row_idx > 0 and 'clue' in classes:
+                cell = _ClueCell()
+                round_data['rows'][row_idx].append(cell)
+                self._open_cells.append(cell)
+                frame.on_close.append(lambda: self._open_cells.remove(cell))
+
+        # First-descendant lookups of the open containers
+        if tag == 'td' and 'category_name' in classes:
+            for category in self._open_categories:
+                if not category['seen']:
+                    category['seen'] = True
+                    self._capture(frame, lambda s, category=category: category.__setitem__('name', ''.join(s).strip()))
+
+        if tag == 'td' and 'clue_text' in classes:
+            for cell in self._open_cells:
+                if not cell.seen_text:
+                    cell.seen_text = True
+                    self._capture(frame, lambda s, cell=cell: setattr(cell, 'clue_text', ''.join(s).strip()))
+
+        if tag == 'em' and 'correct_response' in classes:
+            for cell in self._open_cells:
+                if not cell.seen_answer:
+                    cell.seen_answer = True
+                    # get_text(strip=True): every string stripped, empty ones dropped
+                    self._capture(frame, lambda s, cell=cell: setattr(cell, 'answer', ''.join(p.strip() for p in s)))
+
+        final = self._open_final
+        if final is not None:
+            if tag == 'div' and 'category_name' in classes and 'seen_category' not in final:
+                final['seen_category'] = True
+                self._capture(frame, lambda s: final.__setitem__('category', ''.join(s).strip()))
+            if tag == 'td' and 'clue_text' in classes and 'seen_clue' not in final:
+                final['seen_clue'] = True
+                self._capture(frame, lambda s: final.__setitem__('clue', ''.join(s).strip()))
+            if tag == 'div' and 'onmouseover' in attrs and final['mouseover'] is None:
+                final['mouseover'] = attrs['onmouseover'] or ''
+
+
+def _decode(html: Union[bytes, str]) -> str:
+    """Decode page bytes, honouring a declared charset when there is one"""
+    if isinstance(html, str):
+        return html
+
+    declared = re.search(rb'<meta[^>]+charset=["\']?([\w-]+)', html[:2048], re.IGNORECASE)
+    if declared:
+        try:
+            return html.decode(declared.group(1).decode('ascii'), errors='replace')
+        except LookupError:
+            pass
+
+    try:
+        return html.decode('utf-8')
+    except UnicodeDecodeError:
+        return html.decode('windows-1252', errors='replace')
+
+
+def _parse_stream(html: Union[bytes, str], game_id: int, url: str) -> Dict:
+    """Fast path: tokenize once and assemble the game from collected state"""
+    parser = _GameHTMLParser()
+    parser.feed(_decode(html))
+    parser.close()
+
+    game_title = parser.title.strip() if parser.title is not None else "Unknown Game"
+    game_data = _new_game(game_id, url, game_title)
+
+    for round_idx, round_data in enumerate(parser.rounds):
+        round_name = 'jeopardy_round' if round_idx == 0 else 'double_jeopardy_round'
+
+        categories = [cat['name'] for cat in round_data['category_cells'] if cat['seen']]
+        game_data['categories'][round_name] = categories
+        values = board_values(round_name, game_data['air_date'])
+
+        # First row holds the categories; clue values follow the row position
+        for row_idx, row in enumerate(round_data['rows'][1:]):
+            value = values[row_idx] if row_idx < len(values) else 'Unknown'
+
+            for cat_idx, cell in enumerate(row):
+                if cat_idx >= len(categories) or not cell.seen_text:
+                    continue
+
+                game_data[round_name].append({
+                    'category': categories[cat_idx],
+                    'value': value,
+                    'clue': cell.clue_text,
+                    'answer': cell.answer if cell.seen_answer else None,
+                    'daily_double': cell.daily_double,
+                    'row': row_idx,
+                    'column': cat_idx
+                })
+
+    final = parser.final
+    if final and final.get('seen_category') and final.get('seen_clue'):
+        game_data['final_jeopardy'] = {
+            'category': final['category'],
+            'clue': final['clue'],
+            'answer': _final_answer(final['mouseover'])
+        }
+
+    return game_data
+
+
+PARSER_BACKENDS = {
+    'stream': _parse_stream,
+    'bs4': _parse_bs4,
+}
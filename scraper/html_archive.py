@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Append-only archive of raw J-Archive pages
+
+Pages are zlib-compressed and appended to a single pack file. A companion
+index file records where each game's latest copy lives, so any page can be
+read back at random (through mmap) and re-parsed without touching the
+network.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# game_id, offset in pack, compressed length, crc32 of the uncompressed page
+_INDEX_RECORD = struct.Struct('<qQII')
+
+
+class HtmlArchive:
+    """Stores raw game pages in `<name>.pack` with an offset index in `<name>.idx`"""
+
+    def __init__(self, path: str, compression_level: int = 6):
+        """
+        Open (or create) an archive
+
+        Args:
+            path: Path to the pack file. The index is stored next to it
+                with an .idx suffix
+            compression_level: zlib level used for new pages
+        """
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix('.idx')
+        self.compression_level = compression_level
+
+        self._lock = threading.Lock()
+        self._index: Dict[int, Tuple[int, int, int]] = {}
+        self._pack_writer = None
+        self._index_writer = None
+        self._reader = None
+        self._mmap = None
+
+        self._load_index()
+
+    def _load_index(self):
+        """Read the index, letting later records for a game replace earlier ones"""
+        if not self.index_path.exists():
+            return
+
+        pack_size = self.path.stat().st_size if self.path.exists() else 0
+        with open(self.index_path, 'rb') as f:
+            data = f.read()
+
+        # A partially written trailing record (e.g. after a crash) is ignored
+        usable = len(data) - len(data) % _INDEX_RECORD.size
+        for game_id, offset, length, crc in _INDEX_RECORD.iter_unpack(data[:usable]):
+            if offset + length <= pack_size:
+                self._index[game_id] = (offset, length, crc)
+
+    def add(self, game_id: int, html: bytes) -> bool:
+        """
+        Append a page to the archive
+
+        Returns:
+            True if the page was written, False if the latest stored copy
+            is already identical
+        """
+        crc = zlib.crc32(html)
+        data = zlib.compress(html, self.compression_level)
+
+        with self._lock:
+            existing = self._index.get(game_id)
+            if existing is not None and existing[2] == crc:
+                return False
+
+            if self._pack_writer is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._pack_writer = open(self.path, 'ab')
+                self._index_writer = open(self.index_path, 'ab')
+
+            # Page bytes go down before the index entry that points at them
+            self._pack_writer.seek(0, os.SEEK_END)
+            offset = self._pack_writer.tell()
+            self._pack_writer.write(data)
+            self._pack_writer.flush()
+
+            self._index_writer.write(_INDEX_RECORD.pack(game_id, offset, len(data), crc))
+            self._index_writer.flush()
+
+            self._index[game_id] = (offset, len(data), crc)
+
+        return True
+
+    def get(self, game_id: int) -> Optional[bytes]:
+        """Return the latest stored page for a game, or None if it isn't archived"""
+        with self._lock:
+            entry = self._index.get(game_id)
+            if entry is None:
+                return None
+
+            offset, length, crc = entry
+            if self._mmap is None or len(self._mmap) < offset + length:
+                self._remap()
+            data = self._mmap[offset:offset + length]
+
+        html = zlib.decompress(data)
+        if zlib.crc32(html) != crc:
+            raise ValueError(f"Archived page for game {game_id} is corrupt")
+        return html
+
+    def _remap(self):
+        """(Re)map the pack file after it has grown"""
+        if self._mmap is not None:
+            self._mmap.close()
+        if self._reader is None:
+            self._reader = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._reader.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def game_ids(self) -> List[int]:
+        """IDs of all archived games, in ascending order"""
+        with self._lock:
+            return sorted(self._index)
+
+    def __contains__(self, game_id: int) -> bool:
+        return game_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self):
+        """Close file handles and the memory map"""
+        with self._lock:
+            for handle in (self._mmap, self._reader, self._pack_writer, self._index_writer):
+                if handle is not None:
+                    handle.close()
+            self._mmap = self._reader = self._pack_writer = self._index_writer = None
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
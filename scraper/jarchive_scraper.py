@@ -4,135 +4,111 @@ J-Archive Jeopardy Game Scraper
 Extracts all clues, answers, and metadata from J-Archive game pages
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
-import re
-from typing import Dict, Optional
+from typing import Dict, NamedTuple, Optional
 
+try:
+    from .fetcher import JArchiveFetcher, get_default_fetcher
+    from .game_parser import DEFAULT_BACKEND, parse_game_html
+    from .html_archive import HtmlArchive
+    from .metrics import ScrapeMetrics, timed
+except ImportError:
+    # Imported as a top-level module (e.g. from run_scraper.py)
+    from fetcher import JArchiveFetcher, get_default_fetcher
+    from game_parser import DEFAULT_BACKEND, parse_game_html
+    from html_archive import HtmlArchive
+    from metrics import ScrapeMetrics, timed
 
-def scrape_jarchive_game(game_id: int) -> Dict:
+
+JARCHIVE_BASE_URL = "https://j-archive.com"
+
+
+class ScrapedGame(NamedTuple):
+    """A fetched game and the HTTP validators of its page"""
+    game: Optional[Dict]        # None if the page has not changed since `validators`
+    validators: Dict[str, str]  # Store these only once the game is stored
+
+
+def game_url(game_id: int, base_url: str = JARCHIVE_BASE_URL) -> str:
+    """Build the J-Archive page URL for a game ID"""
+    return f"{base_url.rstrip('/')}/showgame.php?game_id={game_id}"
+
+
+def scrape_jarchive_game(
+    game_id: int,
+    base_url: str = JARCHIVE_BASE_URL,
+    fetcher: Optional[JArchiveFetcher] = None,
+    backend: str = DEFAULT_BACKEND,
+    archive: Optional[HtmlArchive] = None,
+    metrics: Optional[ScrapeMetrics] = None
+) -> Dict:
     """
     Scrape a complete Jeopardy game from J-Archive
 
     Args:
         game_id: The game ID from J-Archive URL
+        base_url: Site to fetch from (override to point at a local mirror)
+        fetcher: HTTP fetcher to use. Defaults to a shared pooled fetcher
+        backend: HTML parser backend (see game_parser.PARSER_BACKENDS)
+        archive: Raw page archive to append the downloaded HTML to, so the
+            game can be re-parsed later without fetching it again
+        metrics: Collects fetch/parse/archive timings and bytes downloaded
 
     Returns:
         Dictionary containing all game data
     """
-    url = f"https://j-archive.com/showgame.php?game_id={game_id}"
+    return fetch_game(game_id, base_url, fetcher, None, backend, archive, metrics).game
+
+
+def fetch_game(
+    game_id: int,
+    base_url: str = JARCHIVE_BASE_URL,
+    fetcher: Optional[JArchiveFetcher] = None,
+    validators: Optional[Dict[str, str]] = None,
+    backend: str = DEFAULT_BACKEND,
+    archive: Optional[HtmlArchive] = None,
+    metrics: Optional[ScrapeMetrics] = None
+) -> ScrapedGame:
+    """
+    Scrape a game, revalidating against an earlier download
+
+    Args:
+        game_id: The game ID from J-Archive URL
+        base_url: Site to fetch from (override to point at a local mirror)
+        fetcher: HTTP fetcher to use. Defaults to a shared pooled fetcher
+        validators: ETag/Last-Modified stored with the game (see
+            JeopardyDatabase.get_page_validators). When given, the request
+            is conditional
+        backend: HTML parser backend (see game_parser.PARSER_BACKENDS)
+        archive: Raw page archive to append the downloaded HTML to
+        metrics: Collects fetch/parse/archive timings and bytes downloaded
+
+    Returns:
+        ScrapedGame with the game (None if the page has not changed) and
+        the page's validators
+    """
+    url = game_url(game_id, base_url)
+    fetcher = fetcher or get_default_fetcher()
 
     print(f"Fetching game {game_id}...")
-    response = requests.get(url)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.content, 'html.parser')
-
-    # Extract game metadata
-    game_title = soup.find('title').text.strip() if soup.find('title') else "Unknown Game"
-
-    # Extract show number from title (e.g., "J! Archive - Show #9426, aired 2025-11-03")
-    show_number = None
-    show_match = re.search(r'Show #(\d+)', game_title)
-    if show_match:
-        show_number = int(show_match.group(1))
-
-    # Extract air date from title (e.g., "aired 2025-11-03")
-    air_date = None
-    date_match = re.search(r'aired (\d{4}-\d{2}-\d{2})', game_title)
-    if date_match:
-        air_date = date_match.group(1)
-
-    game_data = {
-        'game_id': game_id,
-        'show_number': show_number,
-        'title': game_title,
-        'url': url,
-        'air_date': air_date,
-        'jeopardy_round': [],
-        'double_jeopardy_round': [],
-        'final_jeopardy': None
-    }
-
-    # Find all rounds
-    rounds = soup.find_all('table', class_='round')
-
-    for round_idx, round_table in enumerate(rounds):
-        round_name = 'jeopardy_round' if round_idx == 0 else 'double_jeopardy_round'
-
-        # Extract categories - use find_all with recursive=False to get only direct children
-        all_rows = round_table.find_all('tr', recursive=False)
-        categories = []
-        if all_rows:
-            category_row = all_rows[0]
-            category_cells = category_row.find_all('td', class_='category', recursive=False)
-            categories = [cat.find('td', class_='category_name').text.strip()
-                         for cat in category_cells if cat.find('td', class_='category_name')]
-
-        # Extract clues - skip first row (categories)
-        clue_rows = all_rows[1:]
-
-        for row_idx, row in enumerate(clue_rows):
-            value = ['$200', '$400', '$600', '$800', '$1000'][row_idx] if row_idx < 5 else 'Unknown'
-            clue_cells = row.find_all('td', class_='clue', recursive=False)
-
-            for cat_idx, cell in enumerate(clue_cells):
-                if cat_idx >= len(categories):
-                    continue
-
-                # Find clue text - it's a nested <td> with class clue_text
-                clue_text_td = cell.find('td', class_='clue_text')
-                if not clue_text_td:
-                    continue
-
-                clue_text = clue_text_td.text.strip()
-
-                # Find answer - it's in a hidden <td> element with the correct_response class
-                answer = None
-                correct_response_em = cell.find('em', class_='correct_response')
-                if correct_response_em:
-                    answer = correct_response_em.get_text(strip=True)
-
-                # Check if it's a Daily Double
-                daily_double = 'clue_value_daily_double' in str(cell)
-
-                clue_data = {
-                    'category': categories[cat_idx],
-                    'value': value,
-                    'clue': clue_text,
-                    'answer': answer,
-                    'daily_double': daily_double
-                }
-
-                game_data[round_name].append(clue_data)
-
-    # Extract Final Jeopardy
-    final_round = soup.find('table', class_='final_round')
-    if final_round:
-        category_div = final_round.find('div', class_='category_name')
-        clue_text_td = final_round.find('td', class_='clue_text')
-
-        if category_div and clue_text_td:
-            final_category = category_div.text.strip()
-            final_clue = clue_text_td.text.strip()
-
-            # Find Final Jeopardy answer
-            final_answer = None
-            onmouseover = final_round.find('div', onmouseover=True)
-            if onmouseover:
-                mouseover = onmouseover.get('onmouseover')
-                answer_match = re.search(r'correct_response[^>]*>([^<]+)<', mouseover)
-                if answer_match:
-                    final_answer = answer_match.group(1).strip()
-
-            game_data['final_jeopardy'] = {
-                'category': final_category,
-                'clue': final_clue,
-                'answer': final_answer
-            }
-
-    return game_data
+    with timed(metrics, 'fetch'):
+        content, fresh = fetcher.fetch(url, validators)
+
+    if content is None:
+        if metrics is not None:
+            metrics.increment('pages_not_modified')
+        return ScrapedGame(None, fresh)
+
+    if metrics is not None:
+        metrics.increment('pages_downloaded')
+        metrics.increment('bytes_downloaded', len(content))
+
+    if archive is not None:
+        with timed(metrics, 'archive'):
+            archive.add(game_id, content)
+
+    with timed(metrics, 'parse'):
+        return ScrapedGame(parse_game_html(content, game_id, url, backend), fresh)
 
 
 def save_to_json(game_data: Dict, output_dir: str = None) -> str:
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Per-stage timers and counters for scraper runs
+
+A ScrapeMetrics instance is passed down the scrape path and records how
+long each stage (fetch, parse, archive, save_json, insert) takes, bytes
+downloaded and clues per game. At the end of a run it can be dumped as a
+JSON summary or as a Prometheus text file (e.g. for node_exporter's
+textfile collector).
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence
+
+
+# Upper bounds (seconds) of the latency buckets, Prometheus-style
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# A full game has 61 clues (30 + 30 + Final); fewer means unrevealed clues
+CLUE_BUCKETS = (0, 10, 20, 30, 40, 50, 55, 58, 60, 61)
+
+STAGES = ('fetch', 'parse', 'archive', 'save_json', 'insert')
+
+METRIC_PREFIX = 'jeopardy_scraper'
+
+
+class Histogram:
+    """Bucketed distribution with count, sum, min and max"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating within its bucket"""
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else self.min
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def cumulative(self) -> Iterator:
+        """(upper bound, observations <= bound) pairs, ending with +Inf"""
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield bound, total
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
+class ScrapeMetrics:
+    """Thread-safe collection of stage timings and counters for one run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.stages: Dict[str, Histogram] = {stage: Histogram(LATENCY_BUCKETS) for stage in STAGES}
+        self.counters: Dict[str, float] = {}
+        self.clues_per_game = Histogram(CLUE_BUCKETS)
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        """Time the enclosed block as one observation of `stage` (failures included)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+
+    def observe_stage(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe_clues(self, count: int):
+        with self._lock:
+            self.clues_per_game.observe(count)
+
+    def summary(self) -> Dict:
+        """Everything recorded so far as plain JSON-serializable data"""
+        with self._lock:
+            return {
+                'elapsed_seconds': time.perf_counter() - self._started,
+                'stages': {stage: histogram.to_dict() for stage, histogram in self.stages.items()},
+                'counters': dict(self.counters),
+                'clues_per_game': self.clues_per_game.to_dict(),
+            }
+
+    def write_json(self, path: str):
+        """Write summary() as JSON (path '-' prints it instead)"""
+        text = json.dumps(self.summary(), indent=2)
+        if str(path) == '-':
+            print(text)
+        else:
+            _write_atomic(path, text + "\n")
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            name = f"{METRIC_PREFIX}_stage_seconds"
+            lines.append(f"# HELP {name} Time spent in each scraper stage")
+            lines.append(f"# TYPE {name} histogram")
+            for stage, histogram in self.stages.items():
+                lines.extend(_histogram_lines(name, histogram, f'stage="{stage}",'))
+
+            name = f"{METRIC_PREFIX}_clues_per_game"
+            lines.append(f"# HELP {name} Clues stored per scraped game")
+            lines.append(f"# TYPE {name} histogram")
+            lines.extend(_histogram_lines(name, self.clues_per_game, ''))
+
+            for counter, value in sorted(self.counters.items()):
+                name = f"{METRIC_PREFIX}_{counter}_total"
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {value:g}")
+
+            name = f"{METRIC_PREFIX}_run_seconds"
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {time.perf_counter() - self._started:.6f}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write to_prometheus() to a file, replacing it atomically"""
+        _write_atomic(path, self.to_prometheus())
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str):
+    """Bucket, sum and count sample lines for one histogram"""
+    for bound, total in histogram.cumulative():
+        le = '+Inf' if bound == float('inf') else f"{bound:g}"
+        yield f'{name}_bucket{{{labels}le="{le}"}} {total}'
+    label_set = f"{{{labels.rstrip(',')}}}" if labels else ''
+    yield f"{name}_sum{label_set} {histogram.sum:.6f}"
+    yield f"{name}_count{label_set} {histogram.count}"
+
+
+def _write_atomic(path: str, text: str):
+    """Write via a temporary file so readers never see a half-written file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def timed(metrics: Optional[ScrapeMetrics], stage: str):
+    """metrics.time_stage(stage), or a no-op context when metrics is None"""
+    return metrics.time_stage(stage) if metrics is not None else nullcontext()
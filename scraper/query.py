@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Quick read-only queries against the clue database
+
+Unlike run_scraper.py this never imports the HTTP/HTML scraping stack
+(requests, bs4, the fetcher), so a query starts in a few tens of
+milliseconds. The database is opened read-only.
+
+Usage:
+    python scraper/query.py stats
+    python scraper/query.py random --count 3 --from-date 2020-01-01
+    python scraper/query.py show 9426
+    python scraper/query.py category "WORLD CAPITALS" --limit 5
+    python scraper/query.py search "shakesp*" --fields clue
+"""
+
+import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+try:
+    from .database import JeopardyDatabase
+except ImportError:
+    # Run as a script (python scraper/query.py)
+    from database import JeopardyDatabase
+
+
+# Modules a query should never need; --timing reports if any got loaded
+SCRAPING_MODULES = ('requests', 'urllib3', 'bs4', 'fetcher', 'scraper.fetcher')
+
+
+def print_clue(clue: Dict, show_answer: bool = True):
+    """Print a clue dictionary on a few lines"""
+    value = f" {clue['value']}" if clue.get('value') else ''
+    show = f"Show #{clue['show_number']}, " if clue.get('show_number') else ''
+    print(f"{clue['category']}{value} ({show}{clue['round']}, {clue['air_date']})")
+    print(f"  {clue.get('snippet') or clue['clue']}")
+    if show_answer:
+        print(f"  -> {clue['answer']}")
+
+
+def print_board(board: Dict):
+    """Print a game from get_game_board, category by category"""
+    print(board['title'])
+    for key, name in (('jeopardy_round', 'JEOPARDY'), ('double_jeopardy_round', 'DOUBLE JEOPARDY')):
+        board_round = board[key]
+        print(f"\n{name}")
+        for column, category in enumerate(board_round['categories']):
+            print(f"  {category}")
+            for row, value in enumerate(board_round['values']):
+                cell = board_round['clues'][row][column] if column < len(board_round['clues'][row]) else None
+                if cell is None:
+                    print(f"    {value:>6}  (not revealed)")
+                    continue
+                marker = ' DD' if cell['daily_double'] else ''
+                print(f"    {value:>6}{marker}  {cell['clue']} -> {cell['answer']}")
+
+    final = board['final_jeopardy']
+    if final:
+        print(f"\nFINAL JEOPARDY: {final['category']}")
+        print(f"  {final['clue']} -> {final['answer']}")
+
+
+def run_query(db: JeopardyDatabase, args: argparse.Namespace, parser: argparse.ArgumentParser):
+    """Run the subcommand; returns what --json prints"""
+    if args.command == 'stats':
+        result = db.get_stats()
+        result['top_categories'] = db.get_category_counts(limit=args.top)
+        return result
+
+    if args.command == 'random':
+        return db.get_random_clues(
+            args.count, start_date=args.from_date, end_date=args.to_date, dedupe=args.dedupe
+        )
+
+    if args.command == 'show':
+        return db.get_game_board(args.show_number)
+
+    if args.command == 'category':
+        return db.get_clues_by_category(args.category, args.limit)
+
+    if args.command == 'search':
+        if not db.has_search:
+            parser.error("this SQLite build has no FTS5, so search is unavailable")
+        highlight = ('\033[1m', '\033[0m') if sys.stdout.isatty() and not args.json else ('[', ']')
+        return db.search_clues(
+            args.query,
+            fields=args.fields.split(',') if args.fields else None,
+            limit=args.limit,
+            round=args.round,
+            highlight=highlight
+        )
+
+    raise ValueError(f"unknown command {args.command!r}")
+
+
+def print_result(args: argparse.Namespace, result):
+    """Print a query result for a person"""
+    if args.command == 'stats':
+        print(f"Total Games: {result['total_games']}")
+        print(f"Total Clues: {result['total_clues']}")
+        print(f"Unique Categories: {result['unique_categories']}")
+        if result['show_number_range']:
+            print(f"Shows: #{result['show_number_range']['min']} - #{result['show_number_range']['max']}")
+        if result['date_range']:
+            print(f"Aired: {result['date_range']['min']} - {result['date_range']['max']}")
+        if result['top_categories']:
+            print("Top categories:")
+            for row in result['top_categories']:
+                print(f"  {row['clue_count']:>6}  {row['category']}")
+        return
+
+    if args.command == 'show':
+        if result is None:
+            print(f"Show #{args.show_number} is not in the database")
+        else:
+            print_board(result)
+        return
+
+    clues: List[Dict] = result
+    if not clues:
+        print("No clues found")
+    for index, clue in enumerate(clues):
+        if index:
+            print()
+        print_clue(clue, show_answer=not getattr(args, 'hide_answers', False))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='query.py',
+        description='Query the clue database without loading the scraper',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python query.py stats --top 10
+  python query.py random --count 5 --hide-answers
+  python query.py show 9426 --json
+  python query.py search "shakesp*" --round "Double Jeopardy"
+
+Startup cost by module:
+  python -X importtime query.py stats 2>&1 | sort -t'|' -k2 -n | tail
+        """
+    )
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Path to the SQLite database (default: data/jeopardy.db)'
+    )
+    parser.add_argument(
+        '--immutable',
+        action='store_true',
+        help='--db is a snapshot nothing writes to (run_scraper.py snapshot): skip locking, map the whole file'
+    )
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+    parser.add_argument(
+        '--timing',
+        action='store_true',
+        help='Report import, open and query times on stderr'
+    )
+
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    stats = commands.add_parser('stats', help='Database statistics')
+    stats.add_argument('--top', type=int, default=5, help='Largest categories to list (default: 5)')
+
+    random_clues = commands.add_parser('random', help='Random clues')
+    random_clues.add_argument('--count', type=int, default=1, help='Number of clues (default: 1)')
+    random_clues.add_argument('--from-date', type=str, default=None, help='Only games aired on or after YYYY-MM-DD')
+    random_clues.add_argument('--to-date', type=str, default=None, help='Only games aired on or before YYYY-MM-DD')
+    random_clues.add_argument('--hide-answers', action='store_true', help="Don't print the correct responses")
+    random_clues.add_argument('--dedupe', action='store_true', help='Skip reruns and recycled clues')
+
+    show = commands.add_parser('show', help='A whole game, laid out by board')
+    show.add_argument('show_number', type=int, help='Show number (e.g. 9426)')
+
+    category = commands.add_parser('category', help='Clues whose category contains the text')
+    category.add_argument('category', type=str, help='Category text (case-insensitive)')
+    category.add_argument('--limit', type=int, default=10, help='Maximum clues (default: 10)')
+    category.add_argument('--hide-answers', action='store_true', help="Don't print the correct responses")
+
+    search = commands.add_parser('search', help='Full-text search over categories, clues and answers')
+    search.add_argument('query', type=str, help='Words to match; a trailing * matches a prefix')
+    search.add_argument('--fields', type=str, default=None, help='Comma-separated subset of category,clue,answer')
+    search.add_argument('--round', type=str, default=None, help="Only this round (e.g. 'Double Jeopardy')")
+    search.add_argument('--limit', type=int, default=10, help='Maximum results (default: 10)')
+    search.add_argument('--hide-answers', action='store_true', help="Don't print the correct responses")
+
+    return parser
+
+
+def main(argv: List[str] = None):
+    imported = time.perf_counter()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    db_path = Path(args.db) if args.db else Path(__file__).parent.parent / "data" / "jeopardy.db"
+    if not db_path.exists():
+        parser.error(f"database not found: {db_path}")
+
+    with JeopardyDatabase(db_path, read_only=True, immutable=args.immutable) as db:
+        opened = time.perf_counter()
+        result = run_query(db, args, parser)
+        queried = time.perf_counter()
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print_result(args, result)
+
+    if args.command == 'random' and 0 < len(result) < args.count:
+        print(f"Only {len(result)} of {args.count} clues match", file=sys.stderr)
+
+    if args.timing:
+        loaded = [name for name in SCRAPING_MODULES if name in sys.modules]
+        print(
+            f"imports {(imported - _STARTED) * 1000:.1f}ms,"
+            f" open {(opened - imported) * 1000:.1f}ms,"
+            f" query {(queried - opened) * 1000:.1f}ms"
+            f" (scraping modules loaded: {', '.join(loaded) or 'none'})",
+            file=sys.stderr
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+In-process cache for JeopardyDatabase read results
+
+Between scrapes the same show, board and statistics lookups come back
+over and over. QueryCache keeps their results in a bounded LRU, with an
+optional time-to-live, keyed by method name and arguments.
+
+Each JeopardyDatabase handle has its own cache, and the cached() methods
+return a copy of the stored result, so a caller modifying what it got
+back never changes what the next caller sees.
+
+Invalidation goes through a generation counter rather than per-key
+bookkeeping: every write bumps the generation, which empties the cache,
+and a result computed while a write happened is never stored (it was
+read under the old generation). JeopardyDatabase bumps it whenever its
+connection's change count or SQLite's data_version moves, so commits
+made through other connections (the scraper, a DatabasePool writer) are
+caught as well as its own.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class QueryCache:
+    """
+    Bounded LRU of query results with TTL and generation-based invalidation
+
+    Safe to share between threads: bookkeeping happens under a lock, the
+    queries themselves run outside it (two threads missing on the same key
+    at once both run the query; the second result wins).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            max_entries: Results kept before the least recently used is evicted
+            ttl: Seconds a result stays valid, or None to keep it until the
+                next write
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires, value)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def observe(self, version: Hashable):
+        """Invalidate if the data version differs from the last one observed"""
+        with self._lock:
+            if version != self._version:
+                if self._version is not None:
+                    self._invalidate()
+                self._version = version
+
+    def invalidate(self):
+        """Drop every result (start a new generation)"""
+        with self._lock:
+            self._invalidate()
+
+    def _invalidate(self):
+        self.generation += 1
+        self._entries.clear()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        The cached result for `key`, computing and storing it on a miss
+
+        Args:
+            key: Hashable key (method name and arguments)
+            compute: Runs the query
+
+        Returns:
+            The result. Hits return the stored object itself, so callers
+            must not modify it
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            generation = self.generation
+
+        value = compute()
+
+        with self._lock:
+            # A write during the query may have made the result stale already
+            if generation == self.generation:
+                expires = now + self.ttl if self.ttl is not None else None
+                self._entries[key] = (expires, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def stats(self) -> Dict:
+        """Counters: hits, misses, evictions, entries, generation"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'generation': self.generation,
+            }
+
+
+def _copy(value: Any) -> Any:
+    """
+    Copy the dicts and lists of a query result, sharing everything else
+
+    Results are built from dicts, lists and immutable scalars, so this is
+    a full copy at a fraction of copy.deepcopy's cost (no memo, no
+    dispatch through __deepcopy__/__reduce__; flat clue dicts are copied
+    by dict() in C).
+    """
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, dict):
+        copy = dict(value)
+        for key, item in copy.items():
+            if isinstance(item, (dict, list)):
+                copy[key] = _copy(item)
+        return copy
+    return value
+
+
+def cached(method: Callable) -> Callable:
+    """
+    Serve a JeopardyDatabase read method from the handle's QueryCache
+
+    The key is the method name plus its arguments, so the same call made
+    positionally and by keyword are cached separately. Every call gets its
+    own copy of the result (see _copy). Without a cache (the default) the
+    method runs as is.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        cache.observe(self._data_version())
+        key = (name, args, tuple(sorted(kwargs.items()))) if kwargs else (name, args)
+        return _copy(cache.get(key, lambda: method(self, *args, **kwargs)))
+
+    return wrapper
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Compact record types for query results
+
+A `Clue` or `Game` is a NamedTuple: it has attribute access like a small
+class, but each one is a single tuple with no per-instance dictionary.
+That makes it roughly a third of the size of the equivalent dict and
+cheaper to build. JeopardyDatabase's iter_clue_records/iter_game_records
+return them (or, with raw=True, the plain tuples in the same field order).
+The dict-returning methods are built on the same rows, so `record._asdict()`
+gives exactly the dictionary those methods return.
+"""
+
+from typing import NamedTuple, Optional
+
+
+class Clue(NamedTuple):
+    """A clue as returned by the database (fields in CLUE_SELECT order)"""
+    id: int
+    game_id: int
+    show_number: Optional[int]
+    air_date: Optional[str]
+    round: str
+    category: str
+    value: str
+    clue: str
+    answer: Optional[str]
+    daily_double: int
+    game_title: str
+
+
+class Game(NamedTuple):
+    """A game's metadata, without its clues"""
+    game_id: int
+    show_number: Optional[int]
+    title: str
+    url: str
+    air_date: Optional[str]
+
+
+CLUE_FIELDS = Clue._fields
+GAME_FIELDS = Game._fields
@@ -4,15 +4,86 @@ CLI tool to scrape multiple Jeopardy games and store them in the database
 """
 
 import argparse
+import cProfile
+import os
+import pstats
+import sys
 import time
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
-from jarchive_scraper import scrape_jarchive_game, save_to_json
-from database import JeopardyDatabase
+from bulk_io import export_games, import_games, verify_export
+from jarchive_scraper import JARCHIVE_BASE_URL, ScrapedGame, fetch_game, game_url, save_to_json
+from database import SNAPSHOT_PAGE_SIZE, JeopardyDatabase
+from fetcher import DEFAULT_TIMEOUT, JArchiveFetcher
+from game_parser import DEFAULT_BACKEND, PARSER_BACKENDS, parse_game_html
+from html_archive import HtmlArchive
+from metrics import ScrapeMetrics, timed
+from static_bundle import flashcards_from_database, load_flashcard_data, write_bundle
+from throttle import AdaptiveRateLimiter, CircuitBreaker, HostRateLimiter
 
 
-def scrape_game(game_id: int, db: JeopardyDatabase, save_json: bool = True) -> Tuple[bool, str]:
+def store_game(
+    game_data: Dict,
+    db: JeopardyDatabase,
+    save_json: bool = True,
+    metrics: Optional[ScrapeMetrics] = None,
+    replace: bool = False
+) -> Tuple[bool, str]:
+    """
+    Store an already scraped game in the database (and optionally as JSON)
+
+    Args:
+        game_data: Game data dictionary from the scraper
+        db: Database instance
+        save_json: Whether to save JSON debug file
+        metrics: Collects insert/save_json timings and clues per game
+        replace: Replace the stored copy of the game (a refresh)
+
+    Returns:
+        Tuple of (success, message)
+    """
+    # Save to database
+    with timed(metrics, 'insert'):
+        if replace:
+            # Delete and insert in one transaction, so a failed insert keeps
+            # the stored copy (and the review history moves to the new clues)
+            db.replace_game(game_data)
+        else:
+            db.insert_game(game_data)
+
+    # Save JSON for debugging
+    if save_json:
+        with timed(metrics, 'save_json'):
+            json_path = save_to_json(game_data)
+        print(f"  JSON saved: {json_path}")
+
+    # Print summary
+    total_clues = (
+        len(game_data['jeopardy_round']) +
+        len(game_data['double_jeopardy_round']) +
+        (1 if game_data['final_jeopardy'] else 0)
+    )
+    if metrics is not None:
+        metrics.observe_clues(total_clues)
+
+    return True, f"Successfully scraped {total_clues} clues"
+
+
+def scrape_game(
+    game_id: int,
+    db: JeopardyDatabase,
+    save_json: bool = True,
+    base_url: str = JARCHIVE_BASE_URL,
+    fetcher: Optional[JArchiveFetcher] = None,
+    refresh: bool = False,
+    parser_backend: str = DEFAULT_BACKEND,
+    archive: Optional[HtmlArchive] = None,
+    exists: Optional[bool] = None,
+    metrics: Optional[ScrapeMetrics] = None
+) -> Tuple[bool, str]:
     """
     Scrape a single game and store it
 
@@ -20,80 +91,404 @@ def scrape_game(game_id: int, db: JeopardyDatabase, save_json: bool = True) -> T
         game_id: Game ID to scrape
         db: Database instance
         save_json: Whether to save JSON debug file
+        base_url: Site to fetch games from
+        fetcher: Shared HTTP fetcher
+        refresh: Re-fetch games that are already stored, replacing them
+            only if the page changed since the last scrape
+        parser_backend: HTML parser backend name
+        archive: Raw page archive that fetched HTML is appended to
+        exists: Whether the game is already stored, if the caller knows
+            (e.g. from a crawl plan). Looked up when None
+        metrics: Collects per-stage timings and counters
 
     Returns:
         Tuple of (success, message)
     """
     try:
         # Check if already exists
-        if db.game_exists(game_id):
+        if exists is None:
+            exists = db.game_exists(game_id)
+        if exists and not refresh:
             return False, f"Game {game_id} already exists in database"
 
-        # Scrape the game
-        game_data = scrape_jarchive_game(game_id)
+        # Scrape the game (conditionally, if we already have a copy)
+        validators = db.get_page_validators([game_id]).get(game_id) if exists else None
+        scraped = fetch_game(game_id, base_url, fetcher, validators, parser_backend, archive, metrics)
 
-        # Save to database
-        db.insert_game(game_data)
+        return _replace_game(game_id, scraped, exists, db, save_json, metrics)
 
-        # Save JSON for debugging
-        if save_json:
-            json_path = save_to_json(game_data)
-            print(f"  JSON saved: {json_path}")
+    except Exception as e:
+        return False, f"Error: {str(e)}"
 
-        # Print summary
-        total_clues = (
-            len(game_data['jeopardy_round']) +
-            len(game_data['double_jeopardy_round']) +
-            (1 if game_data['final_jeopardy'] else 0)
-        )
 
-        return True, f"Successfully scraped {total_clues} clues"
+def has_clues(game_data: Dict) -> bool:
+    """False for pages without a board (J-Archive answers unknown game IDs with one)"""
+    return bool(game_data['jeopardy_round'] or game_data['double_jeopardy_round'] or game_data['final_jeopardy'])
 
-    except Exception as e:
-        return False, f"Error: {str(e)}"
+
+def _replace_game(
+    game_id: int,
+    scraped: ScrapedGame,
+    exists: bool,
+    db: JeopardyDatabase,
+    save_json: bool,
+    metrics: Optional[ScrapeMetrics] = None
+) -> Tuple[bool, str]:
+    """Store a fetched game, swapping out the stored copy on a refresh"""
+    game_data = scraped.game
+    if game_data is None:
+        return False, f"Game {game_id} not modified since last scrape"
+
+    if not has_clues(game_data):
+        return False, f"Game {game_id} has no clues (empty page)"
+
+    result = store_game(game_data, db, save_json, metrics, replace=exists)
+
+    # Only now that the game is stored may the next refresh get a 304 for it
+    db.save_page_validators(game_id, scraped.validators)
+    return result
+
+
+def _record_result(stats: dict, success: bool, message: str) -> str:
+    """Tally a single game result into the batch statistics and return its crawl status"""
+    if success:
+        stats['success'] += 1
+        status = 'done'
+    elif "no clues" in message:
+        stats['empty'] += 1
+        status = 'empty'
+    elif "already exists" in message or "not modified" in message:
+        stats['skipped'] += 1
+        status = 'done'
+    else:
+        stats['failed'] += 1
+        status = 'failed'
+
+    print(f"  {message}")
+    return status
+
+
+def _checkpoint(db: JeopardyDatabase, stats: dict, game_id: int, success: bool, message: str):
+    """Tally a game result and save it to the crawl_state table"""
+    status = _record_result(stats, success, message)
+    db.record_crawl_attempt(game_id, status, message if status == 'failed' else None)
+
+
+def plan_crawl(
+    db: JeopardyDatabase,
+    game_ids: Optional[List[int]],
+    refresh: bool = False,
+    resume: bool = False
+) -> Tuple[List[Tuple[int, bool]], int]:
+    """
+    Work out which games to fetch and queue them in the crawl_state table
+
+    Stored games are found with one set-based query instead of a lookup
+    per ID. On a resume, games the crawl_state table already records as
+    done or empty are dropped without being checked again.
+
+    Args:
+        db: Database instance
+        game_ids: Requested game IDs (e.g. from parse_game_range). With
+            `resume`, None means every pending or failed game of earlier runs
+        refresh: Keep stored games in the plan (to re-check them)
+        resume: Continue from the crawl_state table
+
+    Returns:
+        Tuple of ([(game_id, already_stored), ...] to fetch, number of
+        games skipped because they are already stored)
+    """
+    if resume:
+        if game_ids is None:
+            game_ids = db.crawl_state_ids(['pending', 'failed'])
+        else:
+            finished = set(db.crawl_state_ids(['done', 'empty'], game_ids))
+            game_ids = [game_id for game_id in game_ids if game_id not in finished]
+
+    # Keep the requested order, without duplicates
+    game_ids = list(dict.fromkeys(game_ids))
+    stored = db.existing_game_ids(game_ids)
+
+    plan = [(game_id, game_id in stored) for game_id in game_ids if refresh or game_id not in stored]
+    if not refresh:
+        db.set_crawl_status([game_id for game_id in game_ids if game_id in stored], 'done')
+    db.set_crawl_status([game_id for game_id, _ in plan], 'pending')
+
+    return plan, len(game_ids) - len(plan)
+
+
+def default_archive_path(db: JeopardyDatabase) -> Path:
+    """Raw page archive kept next to the database it was scraped into"""
+    return db.db_path.parent / "archive" / "pages.pack"
 
 
 def scrape_games_batch(
-    game_ids: List[int],
+    game_ids: Optional[List[int]],
     delay: float = 1.0,
-    save_json: bool = True
+    save_json: bool = True,
+    concurrency: int = 1,
+    rate: Optional[float] = None,
+    db_path: Optional[str] = None,
+    base_url: str = JARCHIVE_BASE_URL,
+    refresh: bool = False,
+    timeout: float = None,
+    parser_backend: str = DEFAULT_BACKEND,
+    save_archive: bool = True,
+    archive_path: Optional[str] = None,
+    resume: bool = False,
+    adaptive: bool = False,
+    max_rate: Optional[float] = None,
+    max_retries: int = 3,
+    metrics: Optional[ScrapeMetrics] = None
 ) -> dict:
     """
     Scrape multiple games with delay between requests
 
+    Every result is checkpointed in the crawl_state table, so an
+    interrupted run can be continued with `resume`.
+
     Args:
-        game_ids: List of game IDs to scrape
+        game_ids: List of game IDs to scrape (None with `resume` to
+            continue every unfinished game)
         delay: Delay in seconds between requests (be respectful!)
         save_json: Whether to save JSON debug files
+        concurrency: Number of games fetched in parallel. 1 keeps the
+            sequential fetch-then-sleep behaviour
+        rate: Maximum requests per second to the host in concurrent mode.
+            Defaults to 1 / delay
+        db_path: Database file to write to (default: data/jeopardy.db)
+        base_url: Site to fetch games from
+        refresh: Re-fetch stored games with conditional requests and
+            replace the ones that changed
+        timeout: HTTP timeout in seconds (default: 5s connect, 30s read)
+        parser_backend: HTML parser backend name
+        save_archive: Append every downloaded page to the raw HTML archive
+        archive_path: Archive pack file (default: data/archive/pages.pack,
+            next to the database)
+        resume: Skip games an earlier run already finished (see plan_crawl)
+        adaptive: Replace the fixed delay/rate with an AdaptiveRateLimiter
+            that starts at `rate` (or 1 / delay) and speeds up or backs
+            off depending on how the host responds
+        max_rate: Ceiling for the adaptive rate (default: twice the
+            starting rate)
+        max_retries: Retries per page after a 429/5xx answer or a
+            connection error
+        metrics: Collects per-stage timings and counters for the batch
 
     Returns:
         Dictionary with statistics
     """
     stats = {
-        'total': len(game_ids),
+        'total': 0,
         'success': 0,
         'failed': 0,
-        'skipped': 0
+        'skipped': 0,
+        'empty': 0
     }
 
-    with JeopardyDatabase() as db:
-        for i, game_id in enumerate(game_ids, 1):
-            print(f"\n[{i}/{len(game_ids)}] Processing game {game_id}...")
+    if rate is None:
+        rate = 1.0 / delay if delay > 0 else None
+
+    limiter = None
+    if adaptive:
+        start_rate = rate or 1.0
+        limiter = AdaptiveRateLimiter(
+            rate=start_rate,
+            min_rate=min(0.1, start_rate),
+            max_rate=max_rate or 2 * start_rate
+        )
+
+    with JeopardyDatabase(db_path) as db:
+        plan, stored = plan_crawl(db, game_ids, refresh, resume)
+        stats['total'] = len(plan) + stored
+        stats['skipped'] = stored
+        if stored:
+            print(f"Skipping {stored} game(s) already in the database")
+
+        fetcher = JArchiveFetcher(
+            timeout=timeout or DEFAULT_TIMEOUT,
+            pool_size=max(concurrency, 1),
+            max_retries=max_retries,
+            rate_limiter=limiter,
+            breaker=CircuitBreaker()
+        )
+
+        archive = None
+        if save_archive:
+            archive = HtmlArchive(archive_path or default_archive_path(db))
+
+        try:
+            with fetcher:
+                if concurrency > 1:
+                    # The adaptive limiter inside the fetcher does the pacing
+                    _scrape_concurrent(
+                        plan, db, stats, save_json, concurrency, None if adaptive else rate,
+                        base_url, fetcher, parser_backend, archive, metrics
+                    )
+                    return stats
+
+                for i, (game_id, exists) in enumerate(plan, 1):
+                    print(f"\n[{i}/{len(plan)}] Processing game {game_id}...")
+
+                    success, message = scrape_game(
+                        game_id, db, save_json, base_url, fetcher, refresh, parser_backend,
+                        archive, exists, metrics
+                    )
+                    _checkpoint(db, stats, game_id, success, message)
+
+                    # Be respectful with delays between requests
+                    if i < len(plan) and not adaptive:
+                        time.sleep(delay)
+        finally:
+            if archive is not None:
+                archive.close()
+            if limiter is not None:
+                print(f"\nAdaptive rate finished at {limiter.rate:.2f} requests/s")
+
+    return stats
+
+
+def _scrape_concurrent(
+    plan: List[Tuple[int, bool]],
+    db: JeopardyDatabase,
+    stats: dict,
+    save_json: bool,
+    concurrency: int,
+    rate: Optional[float],
+    base_url: str,
+    fetcher: JArchiveFetcher,
+    parser_backend: str,
+    archive: Optional[HtmlArchive],
+    metrics: Optional[ScrapeMetrics] = None
+):
+    """
+    Fetch games on a thread pool while this thread does all database writes
+
+    Workers only download and parse; results are handed back through futures
+    so `db` is only ever touched from the calling thread.
+    """
+    limiter = HostRateLimiter(rate)
+    stored = db.get_page_validators([game_id for game_id, exists in plan if exists])
+
+    def fetch(game_id: int, exists: bool) -> ScrapedGame:
+        limiter.acquire(game_url(game_id, base_url))
+        return fetch_game(
+            game_id, base_url, fetcher, stored.get(game_id) if exists else None, parser_backend,
+            archive, metrics
+        )
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(fetch, *item): item for item in plan}
+
+        for i, future in enumerate(as_completed(futures), 1):
+            game_id, exists = futures[future]
+            print(f"\n[{i}/{len(plan)}] Processing game {game_id}...")
+
+            try:
+                success, message = _replace_game(game_id, future.result(), exists, db, save_json, metrics)
+            except Exception as e:
+                success, message = False, f"Error: {str(e)}"
+
+            _checkpoint(db, stats, game_id, success, message)
+
+
+# Archive handle opened once per reparse worker process
+_worker_archive = None
 
-            success, message = scrape_game(game_id, db, save_json)
 
-            if success:
-                stats['success'] += 1
-            elif "already exists" in message:
-                stats['skipped'] += 1
-            else:
-                stats['failed'] += 1
+def _init_reparse_worker(archive_path: str):
+    """Open the archive in a worker process (pages are read through its mmap)"""
+    global _worker_archive
+    _worker_archive = HtmlArchive(archive_path)
 
-            print(f"  {message}")
 
-            # Be respectful with delays between requests
-            if i < len(game_ids):
-                time.sleep(delay)
+def _reparse_one(game_id: int, parser_backend: str) -> Tuple[int, Optional[Dict], Optional[str]]:
+    """Parse one archived page in a worker. Returns (game_id, game_data, error)"""
+    try:
+        html = _worker_archive.get(game_id)
+        if html is None:
+            return game_id, None, f"Game {game_id} is not in the archive"
+        return game_id, parse_game_html(html, game_id, backend=parser_backend), None
+    except Exception as e:
+        return game_id, None, f"Error: {str(e)}"
+
+
+def reparse_archive(
+    game_ids: Optional[List[int]] = None,
+    workers: Optional[int] = None,
+    db_path: Optional[str] = None,
+    archive_path: Optional[str] = None,
+    parser_backend: str = DEFAULT_BACKEND,
+    save_json: bool = False
+) -> dict:
+    """
+    Rebuild games from the raw HTML archive instead of the network
+
+    Pages are parsed on a process pool; results stream back to this process,
+    which bulk-loads them into the database, replacing stored copies.
+
+    Args:
+        game_ids: Games to re-parse (default: everything in the archive)
+        workers: Number of parser processes (default: CPU count)
+        db_path: Database file to write to (default: data/jeopardy.db)
+        archive_path: Archive pack file (default: next to the database)
+        parser_backend: HTML parser backend name
+        save_json: Whether to rewrite JSON debug files
+
+    Returns:
+        Dictionary with statistics
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with JeopardyDatabase(db_path) as db:
+        archive_path = Path(archive_path or default_archive_path(db))
+        if game_ids is None:
+            with HtmlArchive(archive_path) as archive:
+                game_ids = archive.game_ids()
+
+        stats = {
+            'total': len(game_ids),
+            'success': 0,
+            'failed': 0,
+            'skipped': 0,
+            'empty': 0
+        }
+        if not game_ids:
+            return stats
+
+        # Hand out ids in chunks so workers aren't starved by per-task overhead
+        chunksize = max(1, min(32, len(game_ids) // (workers * 4)))
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_reparse_worker,
+            initargs=(str(archive_path),)
+        ) as executor:
+            results = executor.map(
+                partial(_reparse_one, parser_backend=parser_backend),
+                game_ids,
+                chunksize=chunksize
+            )
+
+            def parsed_games():
+                for i, (game_id, game_data, error) in enumerate(results, 1):
+                    if error:
+                        _record_result(stats, False, error)
+                        continue
+                    if not has_clues(game_data):
+                        # Never let a page without a board replace a stored game
+                        _record_result(stats, False, f"Game {game_id} has no clues (empty page)")
+                        continue
+
+                    if save_json:
+                        save_to_json(game_data)
+                    stats['success'] += 1
+                    if i % 100 == 0 or i == len(game_ids):
+                        print(f"  [{i}/{len(game_ids)}] re-parsed")
+                    yield game_data
+
+            # Parsed games stream straight into batched transactions
+            db.insert_games(parsed_games(), replace=True, rebuild_indexes=len(game_ids) >= 1000)
 
     return stats
 
@@ -123,7 +518,546 @@ def parse_game_range(range_str: str) -> List[int]:
     return game_ids
 
 
+def print_db_stats(db_path: Optional[str] = None):
+    """Print a short summary of what's in the database"""
+    print("\n" + "=" * 80)
+    print("DATABASE STATISTICS")
+    with JeopardyDatabase(db_path) as db:
+        db_stats = db.get_stats()
+        print(f"  Total Games: {db_stats['total_games']}")
+        print(f"  Total Clues: {db_stats['total_clues']}")
+        print(f"  Unique Categories: {db_stats['unique_categories']}")
+
+
+def print_stage_timings(metrics: ScrapeMetrics):
+    """Print where the batch spent its time, stage by stage"""
+    summary = metrics.summary()
+
+    print("\n" + "=" * 80)
+    print("STAGE TIMINGS")
+    print(f"  {'stage':<10} {'count':>6} {'total':>9} {'mean':>10} {'p95':>10}")
+    for stage, timing in summary['stages'].items():
+        if not timing['count']:
+            continue
+        print(
+            f"  {stage:<10} {timing['count']:>6} {timing['sum']:>8.2f}s"
+            f" {timing['mean'] * 1000:>8.1f}ms {timing['p95'] * 1000:>8.1f}ms"
+        )
+
+    counters = summary['counters']
+    print(f"  Downloaded: {counters.get('bytes_downloaded', 0) / 1e6:.2f} MB in "
+          f"{counters.get('pages_downloaded', 0):.0f} page(s)")
+    if summary['clues_per_game']['count']:
+        print(f"  Clues per game: {summary['clues_per_game']['mean']:.1f} on average")
+    print(f"  Wall time: {summary['elapsed_seconds']:.1f}s")
+
+
+def maintain_stats(db_path: Optional[str] = None, rebuild: bool = False, check: bool = False):
+    """Rebuild and/or verify the cached statistics tables"""
+    with JeopardyDatabase(db_path) as db:
+        if rebuild:
+            start = time.perf_counter()
+            db.rebuild_stats()
+            print(f"Statistics rebuilt in {time.perf_counter() - start:.1f}s")
+
+        if check:
+            mismatches = db.check_stats()
+            if not mismatches:
+                print("Statistics are consistent with a full recount")
+                return
+
+            print("Statistics are out of date (run with --rebuild-stats to repair):")
+            for name, values in mismatches.items():
+                if name == 'categories':
+                    print(f"  {len(values)} category count(s) differ")
+                else:
+                    print(f"  {name}: cached {values['cached']}, actual {values['actual']}")
+
+
+def reparse_main(argv: List[str]):
+    """`run_scraper.py reparse ...`: rebuild the database from archived pages"""
+    parser = argparse.ArgumentParser(
+        prog='run_scraper.py reparse',
+        description='Re-parse archived J-Archive pages into the database without re-downloading them',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Re-parse every archived game on all cores
+  python run_scraper.py reparse
+
+  # Re-parse a range with 4 worker processes
+  python run_scraper.py reparse 9300-9400 --workers 4
+        """
+    )
+
+    parser.add_argument(
+        'games',
+        type=str,
+        nargs='?',
+        default=None,
+        help='Game ID(s) to re-parse, same format as scraping (default: all archived games)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of parser processes (default: CPU count)'
+    )
+
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Path to the SQLite database (default: data/jeopardy.db)'
+    )
+
+    parser.add_argument(
+        '--archive',
+        type=str,
+        default=None,
+        help='Raw page archive to read (default: archive/pages.pack next to the database)'
+    )
+
+    parser.add_argument(
+        '--parser',
+        choices=sorted(PARSER_BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'HTML parser backend (default: {DEFAULT_BACKEND})'
+    )
+
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Also rewrite JSON debug files'
+    )
+
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Show database statistics after re-parsing'
+    )
+
+    args = parser.parse_args(argv)
+
+    game_ids = None
+    if args.games:
+        try:
+            game_ids = parse_game_range(args.games)
+        except ValueError as e:
+            print(f"Error parsing game IDs: {e}")
+            return
+
+    start = time.perf_counter()
+    stats = reparse_archive(
+        game_ids,
+        workers=args.workers,
+        db_path=args.db,
+        archive_path=args.archive,
+        parser_backend=args.parser,
+        save_json=args.json
+    )
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 80)
+    print("REPARSE COMPLETE")
+    print(f"  Total games processed: {stats['total']}")
+    print(f"  Successfully re-parsed: {stats['success']}")
+    print(f"  Empty pages: {stats['empty']}")
+    print(f"  Failed: {stats['failed']}")
+    print(f"  Elapsed: {elapsed:.1f}s")
+
+    if args.stats:
+        print_db_stats(args.db)
+
+
+def reindex_main(argv: List[str]):
+    """`run_scraper.py reindex ...`: rebuild the full-text search index and the answer index"""
+    parser = argparse.ArgumentParser(
+        prog='run_scraper.py reindex',
+        description='Rebuild the full-text search index over clues, answers and categories, '
+                    'and the normalized answers used for grading'
+    )
+
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Path to the SQLite database (default: data/jeopardy.db)'
+    )
+
+    args = parser.parse_args(argv)
+
+    with JeopardyDatabase(args.db) as db:
+        start = time.perf_counter()
+        db.rebuild_search_index()
+        db.rebuild_answer_index()
+        elapsed = time.perf_counter() - start
+        print(f"Search and answer indexes rebuilt for {db.get_stats()['total_clues']} clues in {elapsed:.1f}s")
+
+
+def duplicates_main(argv: List[str]):
+    """`run_scraper.py duplicates ...`: report (or rebuild) the duplicate clue clusters"""
+    parser = argparse.ArgumentParser(
+        prog='run_scraper.py duplicates',
+        description='Show the largest groups of repeated clues (reruns, recycled clues)'
+    )
+
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Path to the SQLite database (default: data/jeopardy.db)'
+    )
+
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='Fingerprint every clue and recompute the clusters from scratch first'
+    )
+
+    parser.add_argument('--top', type=int, default=10, help='Largest clusters to list (default: 10)')
+
+    args = parser.parse_args(argv)
+
+    with JeopardyDatabase(args.db) as db:
+        if args.rebuild:
+            start = time.perf_counter()
+            db.rebuild_duplicate_index()
+            elapsed = time.perf_counter() - start
+            print(f"Duplicate index rebuilt for {db.get_stats()['total_clues']} clues in {elapsed:.1f}s")
+
+        counts = db.get_duplicate_counts()
+        print(f"{counts['duplicate_clues']} clues repeat another clue ({counts['clusters']} clusters)")
+
+        for cluster in db.get_duplicate_clusters(limit=args.top):
+            first = cluster['clues'][0]
+            shows = ', '.join(str(clue['show_number']) for clue in cluster['clues'])
+            print(f"\n  {cluster['size']}x {first['category']}: {first['clue']}")
+            print(f"     {first['answer']} (shows {shows})")
+
+
+def publish_snapshot(db_path: Optional[str], snapshot_path: Optional[str], page_size: int = SNAPSHOT_PAGE_SIZE):
+    """Build a serving snapshot of the database and swap it in"""
+    with JeopardyDatabase(db_path) as db:
+        start = time.perf_counter()
+        path = db.snapshot(snapshot_path, page_size=page_size)
+        elapsed = time.perf_counter() - start
+    size = path.stat().st_size / 1024 / 1024
+    print(f"Snapshot written to {path} ({size:.1f} MB) in {elapsed:.1f}s")
+
+
+def snapshot_main(argv: List[str]):
+    """`run_scraper.py snapshot ...`: write a read-only serving copy of the database"""
+    parser = argparse.ArgumentParser(
+        prog='run_scraper.py snapshot',
+        description='Write a compacted, analyzed copy of the database for serving, replacing the '
+                    'previous snapshot atomically. Open it with JeopardyDatabase(path, immutable=True) '
+                    'or query.py --immutable'
+    )
+
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Path to the SQLite database (default: data/jeopardy.db)'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Snapshot path (default: <database>-snapshot.db next to the database)'
+    )
+
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        default=SNAPSHOT_PAGE_SIZE,
+        help=f'Page size of the snapshot in bytes (default: {SNAPSHOT_PAGE_SIZE})'
+    )
+
+    args = parser.parse_args(argv)
+    publish_snapshot(args.db, args.output, args.page_size)
+
+
+def migrate_main(argv: List[str]):
+    """`run_scraper.py migrate ...`: upgrade a database to the compact schema"""
+    parser = argparse.ArgumentParser(
+        prog='run_scraper.py migrate',
+        description='Upgrade a database to the current schema and compact the file'
+    )
+
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Path to the SQLite database (default: data/jeopardy.db)'
+    )
+
+    parser.add_argument(
+        '--no-vacuum',
+        action='store_true',
+        help='Skip rewriting the file afterwards (faster, but the file does not shrink)'
+    )
+
+    args = parser.parse_args(argv)
+
+    db_path = Path(args.db) if args.db else Path(__file__).parent.parent / "data" / "jeopardy.db"
+    if not db_path.exists():
+        parser.error(f"database not found: {db_path}")
+
+    size_before = db_path.stat().st_size
+
+    # Opening the database read-write migrates it in place
+    with JeopardyDatabase(db_path) as db:
+        if not args.no_vacuum:
+            print("Compacting database file...")
+            db.vacuum()
+
+    size_after = db_path.stat().st_size
+    print(f"Database size: {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+
+
+def export_main(argv: List[str]):
+    """`run_scraper.py export ...`: stream the database to an NDJSON export"""
+    parser = argparse.ArgumentParser(
+        prog='run_scraper.py export',
+        description='Export games as NDJSON (one game per line) with a checksum manifest',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Whole database, gzip-compressed
+  python run_scraper.py export data/export/jeopardy.ndjson.gz
+
+  # One season, zstd-compressed (needs the zstandard package)
+  python run_scraper.py export season41.ndjson.zst --from-date 2024-09-09 --to-date 2025-07-25
+
+  # Check an export against its manifest
+  python run_scraper.py export data/export/jeopardy.ndjson.gz --verify
+        """
+    )
+
+    parser.add_argument('output', type=str, help='Output file (.ndjson, .ndjson.gz or .ndjson.zst)')
+    parser.add_argument('games', type=str, nargs='?', default=None, help='Game ID(s) to export (default: all)')
+    parser.add_argument('--from-date', type=str, default=None, help='Only games aired on or after YYYY-MM-DD')
+    parser.add_argument('--to-date', type=str, default=None, help='Only games aired on or before YYYY-MM-DD')
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Path to the SQLite database (default: data/jeopardy.db)'
+    )
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='Re-read an existing export and check it against its manifest instead of exporting'
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        result = verify_export(Path(args.output))
+        print(f"{args.output}: {result['games']} games, {result['clues']} clues, sha256 {result['sha256']}")
+        if result['manifest'] is None:
+            print("No manifest found")
+        print("OK" if result['ok'] else "MISMATCH with manifest")
+        if not result['ok']:
+            sys.exit(1)
+        return
+
+    game_ids = None
+    if args.games:
+        try:
+            game_ids = parse_game_range(args.games)
+        except ValueError as e:
+            print(f"Error parsing game IDs: {e}")
+            return
+
+    start = time.perf_counter()
+    with JeopardyDatabase(args.db, read_only=True) as db:
+        try:
+            manifest = export_games(
+                db, Path(args.output), start_date=args.from_date, end_date=args.to_date, game_ids=game_ids
+            )
+        except RuntimeError as e:
+            parser.error(str(e))
+    elapsed = time.perf_counter() - start
+
+    size = Path(args.output).stat().st_size
+    print(
+        f"Exported {manifest['games']} games ({manifest['clues']} clues) to {args.output}"
+        f" in {elapsed:.1f}s, {size / 1e6:.1f} MB"
+    )
+    print(f"sha256 {manifest['sha256']}")
+
+
+def import_main(argv: List[str]):
+    """`run_scraper.py import ...`: load an export or a JSON directory into the database"""
+    parser = argparse.ArgumentParser(
+        prog='run_scraper.py import',
+        description='Bulk-load games from an NDJSON export or a directory of per-game JSON files',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Rebuild a database from an export and check the round trip
+  python run_scraper.py import data/export/jeopardy.ndjson.gz --db rebuilt.db --verify
+
+  # Load the JSON debug files written while scraping
+  python run_scraper.py import data/json
+        """
+    )
+
+    parser.add_argument('source', type=str, help='NDJSON export or directory of jeopardy_game_*.json files')
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Path to the SQLite database (default: data/jeopardy.db)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Decoder processes (default: CPU count)'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=500,
+        help='Games per transaction (default: 500)'
+    )
+    parser.add_argument(
+        '--replace',
+        action='store_true',
+        help='Replace games that are already stored (default: skip them)'
+    )
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='After loading an export, check the imported games against its manifest checksum'
+    )
+
+    args = parser.parse_args(argv)
+    source = Path(args.source)
+    if not source.exists():
+        parser.error(f"not found: {source}")
+
+    start = time.perf_counter()
+    with JeopardyDatabase(args.db) as db:
+        stats = import_games(
+            db,
+            source,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            replace=args.replace,
+            verify=args.verify
+        )
+    elapsed = time.perf_counter() - start
+
+    print(f"Read {stats['read']} games, inserted {stats['inserted']} in {elapsed:.1f}s")
+    if stats['checksum_ok'] is False:
+        print("Warning: the export does not match its manifest (truncated or modified file)")
+
+    if args.verify:
+        if stats['round_trip_ok'] is None:
+            print("Nothing to verify against: no manifest (only exports have one)")
+        else:
+            print(f"Round trip: {'OK' if stats['round_trip_ok'] else 'MISMATCH'}")
+            if not stats['round_trip_ok']:
+                sys.exit(1)
+
+
+def bundle_main(argv: List[str]):
+    """`run_scraper.py bundle ...`: write the sharded static flashcard bundle"""
+    static_dir = Path(__file__).parent.parent / "docs" / "static"
+
+    parser = argparse.ArgumentParser(
+        prog='run_scraper.py bundle',
+        description='Write per-category, content-hashed flashcard chunks and a manifest for the static app',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Shard the current flashcards-data.js into docs/static/flashcards/
+  python run_scraper.py bundle
+
+  # Build cards from the 50 largest categories in the clue database
+  python run_scraper.py bundle --from-db --top 50 --out /tmp/bundle
+        """
+    )
+
+    parser.add_argument(
+        '--source',
+        type=str,
+        default=str(static_dir / "flashcards-data.js"),
+        help='flashcards-data.js or a JSON file with the same structure (default: docs/static/flashcards-data.js)'
+    )
+    parser.add_argument(
+        '--from-db',
+        action='store_true',
+        help='Build the cards from scraped clues instead of --source'
+    )
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Path to the SQLite database for --from-db (default: data/jeopardy.db)'
+    )
+    parser.add_argument(
+        '--category',
+        action='append',
+        default=None,
+        help='Category to include with --from-db (repeatable; default: the --top largest)'
+    )
+    parser.add_argument('--top', type=int, default=25, help='Categories taken with --from-db (default: 25)')
+    parser.add_argument('--limit', type=int, default=500, help='Most cards per category with --from-db (default: 500)')
+    parser.add_argument(
+        '--dedupe',
+        action='store_true',
+        help='With --from-db, one card per clue repeated in reruns or recycled later'
+    )
+    parser.add_argument(
+        '--out',
+        type=str,
+        default=str(static_dir / "flashcards"),
+        help='Bundle directory (default: docs/static/flashcards)'
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.from_db:
+        with JeopardyDatabase(args.db, read_only=True) as db:
+            data = flashcards_from_database(
+                db, categories=args.category, top=args.top, limit=args.limit, dedupe=args.dedupe
+            )
+    else:
+        data = load_flashcard_data(Path(args.source))
+
+    stats = write_bundle(data, Path(args.out))
+    print(
+        f"Bundle in {args.out}: {len(data['categories'])} categories,"
+        f" {stats['written']} chunk(s) written, {stats['unchanged']} unchanged, {stats['removed']} stale file(s) removed"
+        + (", manifest updated" if stats['manifest_changed'] else "")
+    )
+
+
+SUBCOMMANDS = {
+    'reparse': reparse_main,
+    'reindex': reindex_main,
+    'duplicates': duplicates_main,
+    'snapshot': snapshot_main,
+    'migrate': migrate_main,
+    'export': export_main,
+    'import': import_main,
+    'bundle': bundle_main,
+}
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description='Scrape Jeopardy games from J-Archive',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -143,12 +1077,46 @@ Examples:
 
   # Skip JSON files (database only)
   python run_scraper.py 9302 --no-json
+
+  # Fetch 4 games at a time, at most 2 requests per second
+  python run_scraper.py 9300-9400 --concurrency 4 --rate 2
+
+  # Re-check stored games and replace the ones J-Archive has updated
+  python run_scraper.py 9300-9305 --refresh
+
+  # Continue an interrupted crawl (pending and failed games only)
+  python run_scraper.py --resume
+
+  # Let the request rate adapt to J-Archive's responses (0.5 to 2 per second)
+  python run_scraper.py 9300-9400 --concurrency 4 --rate 0.5 --adaptive --max-rate 2
+
+  # Write per-stage metrics (JSON and Prometheus) and a cProfile dump
+  python run_scraper.py 9300-9310 --metrics-json metrics.json --prometheus scraper.prom --profile scrape.pstats
+
+  # Rebuild games from the raw HTML archive (see `reparse --help`)
+  python run_scraper.py reparse
+
+  # Rebuild the full-text search index
+  python run_scraper.py reindex
+
+  # Largest groups of repeated clues (reruns, recycled clues)
+  python run_scraper.py duplicates --top 20
+
+  # Refresh the read-only serving snapshot after the scrape
+  python run_scraper.py 9300-9310 --snapshot data/jeopardy-snapshot.db
+  python run_scraper.py snapshot --output data/jeopardy-snapshot.db
+
+  # Verify (or repair) the cached statistics used by --stats
+  python run_scraper.py --check-stats
+  python run_scraper.py --rebuild-stats
         """
     )
 
     parser.add_argument(
         'games',
         type=str,
+        nargs='?',
+        default=None,
         help='Game ID(s) to scrape. Can be single (9302), range (9300-9305), or comma-separated (9300,9302,9304)'
     )
 
@@ -159,6 +1127,95 @@ Examples:
         help='Delay between requests in seconds (default: 1.0)'
     )
 
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of games to fetch in parallel (default: 1, sequential)'
+    )
+
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=None,
+        help='Max requests per second to J-Archive when --concurrency > 1 (default: 1 / delay)'
+    )
+
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Adapt the request rate to the host: start at --rate (or 1 / delay), speed up while '
+             'responses are fast, back off on 429/5xx answers or rising latency'
+    )
+
+    parser.add_argument(
+        '--max-rate',
+        type=float,
+        default=None,
+        help='Upper bound for the --adaptive request rate (default: twice the starting rate)'
+    )
+
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=3,
+        help='Retries per page after a 429/5xx answer or connection error, with jittered backoff (default: 3)'
+    )
+
+    parser.add_argument(
+        '--db',
+        type=str,
+        default=None,
+        help='Path to the SQLite database (default: data/jeopardy.db)'
+    )
+
+    parser.add_argument(
+        '--base-url',
+        type=str,
+        default=JARCHIVE_BASE_URL,
+        help=f'Site to fetch games from, e.g. a local mirror (default: {JARCHIVE_BASE_URL})'
+    )
+
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help='HTTP timeout in seconds (default: 5s connect, 30s read)'
+    )
+
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Re-fetch games already in the database with conditional requests, replacing changed ones'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue where the last crawl stopped: fetch pending and failed games, skip ones already '
+             'recorded as done or empty. Without game IDs, resumes every unfinished game'
+    )
+
+    parser.add_argument(
+        '--parser',
+        choices=sorted(PARSER_BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'HTML parser backend (default: {DEFAULT_BACKEND})'
+    )
+
+    parser.add_argument(
+        '--archive',
+        type=str,
+        default=None,
+        help='Raw page archive to append fetched HTML to (default: archive/pages.pack next to the database)'
+    )
+
+    parser.add_argument(
+        '--no-archive',
+        action='store_true',
+        help='Do not keep the raw HTML of fetched pages'
+    )
+
     parser.add_argument(
         '--no-json',
         action='store_true',
@@ -171,44 +1228,151 @@ Examples:
         help='Show database statistics after scraping'
     )
 
+    parser.add_argument(
+        '--metrics-json',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help="Write per-stage timings and counters as JSON ('-' prints them)"
+    )
+
+    parser.add_argument(
+        '--prometheus',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Write the same metrics in Prometheus text format (e.g. for a textfile collector)'
+    )
+
+    parser.add_argument(
+        '--profile',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Profile the batch with cProfile and write pstats data to PATH '
+             '(worker threads of --concurrency are not profiled)'
+    )
+
+    parser.add_argument(
+        '--snapshot',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='When the scrape finishes, rebuild the serving snapshot at PATH and swap it in '
+             '(see `snapshot --help`)'
+    )
+
+    parser.add_argument(
+        '--rebuild-stats',
+        action='store_true',
+        help='Recompute the cached database statistics from scratch'
+    )
+
+    parser.add_argument(
+        '--check-stats',
+        action='store_true',
+        help='Verify the cached database statistics against a full recount'
+    )
+
     args = parser.parse_args()
 
+    if args.rebuild_stats or args.check_stats:
+        maintain_stats(args.db, rebuild=args.rebuild_stats, check=args.check_stats)
+        if args.games is None and not args.resume:
+            if args.stats:
+                print_db_stats(args.db)
+            return
+    elif args.games is None and not args.resume:
+        parser.error("the following arguments are required: games")
+
     # Parse game IDs
-    try:
-        game_ids = parse_game_range(args.games)
-    except ValueError as e:
-        print(f"Error parsing game IDs: {e}")
-        return
+    game_ids = None
+    if args.games is not None:
+        try:
+            game_ids = parse_game_range(args.games)
+        except ValueError as e:
+            print(f"Error parsing game IDs: {e}")
+            return
 
-    print(f"Planning to scrape {len(game_ids)} game(s)")
-    print(f"Delay between requests: {args.delay}s")
+    if game_ids is None:
+        print("Resuming unfinished games from earlier crawls")
+    elif args.resume:
+        print(f"Resuming crawl of {len(game_ids)} game(s)")
+    else:
+        print(f"Planning to scrape {len(game_ids)} game(s)")
+    if args.adaptive:
+        rate = args.rate if args.rate else (1.0 / args.delay if args.delay > 0 else 1.0)
+        print(f"Concurrency: {args.concurrency}")
+        print(f"Adaptive requests per second: starting at {rate}, at most {args.max_rate or 2 * rate}")
+    elif args.concurrency > 1:
+        rate = args.rate if args.rate else (1.0 / args.delay if args.delay > 0 else None)
+        print(f"Concurrency: {args.concurrency}")
+        print(f"Max requests per second: {rate or 'unlimited'}")
+    else:
+        print(f"Delay between requests: {args.delay}s")
     print(f"Save JSON files: {not args.no_json}")
     print("=" * 80)
 
+    metrics = ScrapeMetrics()
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+
     # Scrape games
     stats = scrape_games_batch(
         game_ids,
         delay=args.delay,
-        save_json=not args.no_json
+        save_json=not args.no_json,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        db_path=args.db,
+        base_url=args.base_url,
+        refresh=args.refresh,
+        timeout=args.timeout,
+        parser_backend=args.parser,
+        save_archive=not args.no_archive,
+        archive_path=args.archive,
+        resume=args.resume,
+        adaptive=args.adaptive,
+        max_rate=args.max_rate,
+        max_retries=args.retries,
+        metrics=metrics
     )
 
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
     # Print summary
     print("\n" + "=" * 80)
     print("SCRAPING COMPLETE")
     print(f"  Total games processed: {stats['total']}")
     print(f"  Successfully scraped: {stats['success']}")
-    print(f"  Skipped (already exists): {stats['skipped']}")
+    print(f"  Skipped (already exists or unchanged): {stats['skipped']}")
+    print(f"  Empty pages: {stats['empty']}")
     print(f"  Failed: {stats['failed']}")
+    if stats['failed']:
+        print("  (run again with --resume to retry failed games)")
+
+    for outcome in ('success', 'skipped', 'empty', 'failed'):
+        metrics.increment(f"games_{outcome}", stats[outcome])
+    print_stage_timings(metrics)
+
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+    if args.prometheus:
+        metrics.write_prometheus(args.prometheus)
+        print(f"  Prometheus metrics written to {args.prometheus}")
+    if profiler is not None:
+        print(f"\nProfile written to {args.profile}; top functions by cumulative time:")
+        pstats.Stats(args.profile).sort_stats('cumulative').print_stats(15)
+
+    if args.snapshot:
+        publish_snapshot(args.db, args.snapshot)
 
     # Show database stats if requested
     if args.stats:
-        print("\n" + "=" * 80)
-        print("DATABASE STATISTICS")
-        with JeopardyDatabase() as db:
-            db_stats = db.get_stats()
-            print(f"  Total Games: {db_stats['total_games']}")
-            print(f"  Total Clues: {db_stats['total_clues']}")
-            print(f"  Unique Categories: {db_stats['unique_categories']}")
+        print_db_stats(args.db)
 
 
 if __name__ == "__main__":
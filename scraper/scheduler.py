@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+SM-2 spaced-repetition scheduling
+
+Each review is graded 0-5 (SuperMemo's scale: 5 perfect, 3 correct with
+difficulty, below 3 a miss). A correct answer pushes the next review out
+by a growing interval; a miss starts the card over at one day. The ease
+factor moves with each grade and sets how fast intervals grow.
+JeopardyDatabase stores the resulting state per user and clue (see
+record_reviews and next_due_clues).
+"""
+
+from typing import NamedTuple, Optional
+
+
+DAY = 86400  # seconds
+NEW_EASE = 2.5
+MIN_EASE = 1.3
+PASSING_GRADE = 3
+GRADES = range(6)
+
+
+class ReviewState(NamedTuple):
+    """Where a card stands for one user"""
+    due: int            # Unix time of the next review
+    interval: float     # Days between the last review and `due`
+    ease: float
+    repetitions: int    # Correct answers in a row
+    lapses: int         # Times the card was missed after being learned
+    last_review: int    # Unix time
+
+
+def sm2(state: Optional[ReviewState], grade: int, reviewed_at: float) -> ReviewState:
+    """
+    The state after one review
+
+    Args:
+        state: Current state, or None for a card never reviewed
+        grade: 0-5
+        reviewed_at: Unix time of the review
+
+    Returns:
+        The new ReviewState
+    """
+    if grade not in GRADES:
+        raise ValueError(f"grade must be an integer from 0 to 5, not {grade!r}")
+
+    interval = state.interval if state else 0.0
+    ease = state.ease if state else NEW_EASE
+    repetitions = state.repetitions if state else 0
+    lapses = state.lapses if state else 0
+
+    if grade >= PASSING_GRADE:
+        if repetitions == 0:
+            interval = 1.0
+        elif repetitions == 1:
+            interval = 6.0
+        else:
+            interval = round(interval * ease, 2)
+        repetitions += 1
+    else:
+        if repetitions:
+            lapses += 1
+        repetitions = 0
+        interval = 1.0
+
+    miss = 5 - grade
+    ease = max(MIN_EASE, round(ease + 0.1 - miss * (0.08 + miss * 0.02), 4))
+
+    reviewed_at = int(reviewed_at)
+    return ReviewState(
+        due=reviewed_at + int(interval * DAY),
+        interval=interval,
+        ease=ease,
+        repetitions=repetitions,
+        lapses=lapses,
+        last_review=reviewed_at
+    )
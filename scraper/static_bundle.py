@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Sharded static flashcard bundle for the GitHub Pages app
+
+Instead of one FLASHCARD_DATA literal holding every card, the bundle is a
+directory with one JSON chunk per category plus a small manifest.json:
+
+    flashcards/
+        manifest.json                          # categories, counts, chunk names
+        american-politics.3f9a0c1b2d4e.json    # {"name": ..., "flashcards": [...]}
+        american-politics.3f9a0c1b2d4e.json.gz
+        american-politics.3f9a0c1b2d4e.json.br # when the brotli package is installed
+
+Chunk names carry a hash of their content, so they can be cached forever
+and a regeneration only rewrites (and only busts caches for) the
+categories that changed. Chunks no longer referenced by the manifest are
+removed. The page fetches the manifest and then only the chunks it shows.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from .database import JeopardyDatabase
+except ImportError:
+    # Imported as a top-level module (e.g. from run_scraper.py)
+    from database import JeopardyDatabase
+
+
+MANIFEST_NAME = 'manifest.json'
+HASH_LENGTH = 12
+
+# <slug>.<hash>.json plus its compressed variants
+_CHUNK_NAME = re.compile(r'^[a-z0-9-]+\.[0-9a-f]{%d}\.json(\.gz|\.br)?$' % HASH_LENGTH)
+
+
+def category_slug(name: str) -> str:
+    """File-name-safe form of a category name ('U.S. History' -> 'u-s-history')"""
+    slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')[:40].rstrip('-')
+    return slug or 'category'
+
+
+def _canonical(data: Dict) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Write via a temporary file so the server never sees a half-written file"""
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _compressed_variants(data: bytes) -> Dict[str, bytes]:
+    """Pre-compressed copies of a file, keyed by suffix"""
+    # mtime=0 keeps the .gz bytes identical for identical content
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return variants
+
+
+def load_flashcard_data(path: Path) -> Dict:
+    """
+    Read flashcards from flashcards-data.js (the FLASHCARD_DATA literal) or
+    from a JSON file with the same {"categories": [...]} structure
+    """
+    text = Path(path).read_text(encoding='utf-8')
+    if Path(path).suffix == '.js':
+        start = text.index('{', text.index('FLASHCARD_DATA'))
+        end = text.rindex('}') + 1
+        text = text[start:end]
+    return json.loads(text)
+
+
+def flashcards_from_database(
+    db: JeopardyDatabase,
+    categories: Optional[Iterable[str]] = None,
+    top: int = 25,
+    limit: int = 500,
+    dedupe: bool = False
+) -> Dict:
+    """
+    Build flashcard data straight from scraped clues
+
+    Each J! category becomes a bundle category and each clue a card (the
+    clue is the question, the correct response the answer).
+
+    Args:
+        db: Database to read
+        categories: Category names to include (default: the `top` largest)
+        top: Number of categories when none are named
+        limit: Most cards per category
+        dedupe: One card per clue repeated across games (see
+            JeopardyDatabase.find_duplicates)
+
+    Returns:
+        Dictionary in the FLASHCARD_DATA shape
+    """
+    if categories is None:
+        categories = [row['category'] for row in db.get_category_counts(limit=top)]
+
+    data = {'metadata': {'title': 'Jeopardy Study Flashcards', 'description': 'Clues from J! Archive'}, 'categories': []}
+    for name in categories:
+        cards = []
+        for clue in db.iter_clue_records({'category': name, 'dedupe': dedupe}):
+            # The category filter matches substrings; keep the exact category only
+            if clue.category != name or not clue.answer:
+                continue
+            cards.append({
+                'question': clue.clue,
+                'answer': clue.answer,
+                'jeopardyCategory': clue.category,
+            })
+            if len(cards) >= limit:
+                break
+        if cards:
+            data['categories'].append({'name': name, 'flashcards': cards})
+    return data
+
+
+def write_bundle(data: Dict, out_dir: Path) -> Dict:
+    """
+    Write (or update) a sharded bundle from FLASHCARD_DATA-shaped data
+
+    Args:
+        data: {"metadata": {...}, "categories": [{"name", "flashcards"}, ...]}
+        out_dir: Bundle directory (created if needed)
+
+    Returns:
+        Dictionary with the number of chunks written, unchanged and removed,
+        and whether the manifest changed
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stats = {'written': 0, 'unchanged': 0, 'removed': 0, 'manifest_changed': False}
+
+    entries = []
+    keep = {MANIFEST_NAME}
+    for category in data['categories']:
+        chunk = {'name': category['name'], 'flashcards': category['flashcards']}
+        payload = _canonical(chunk)
+        digest = hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+        filename = f"{category_slug(category['name'])}.{digest}.json"
+
+        variants = _compressed_variants(payload)
+        files = {filename: payload}
+        files.update({filename + suffix: body for suffix, body in variants.items()})
+
+        written = False
+        for name, body in files.items():
+            keep.add(name)
+            # Same name means same content; only missing files are written
+            if not (out_dir / name).exists():
+                _write_atomic(out_dir / name, body)
+                written = True
+        stats['written' if written else 'unchanged'] += 1
+
+        entries.append({
+            'name': category['name'],
+            'count': len(category['flashcards']),
+            'file': filename,
+            'bytes': len(payload),
+            'encodings': sorted(suffix.lstrip('.') for suffix in variants),
+        })
+
+    metadata = dict(data.get('metadata') or {})
+    metadata['totalCards'] = sum(entry['count'] for entry in entries)
+    metadata['categories'] = len(entries)
+    manifest = json.dumps({'metadata': metadata, 'categories': entries}, ensure_ascii=False, indent=2) + "\n"
+
+    manifest_path = out_dir / MANIFEST_NAME
+    if not manifest_path.exists() or manifest_path.read_text(encoding='utf-8') != manifest:
+        _write_atomic(manifest_path, manifest.encode('utf-8'))
+        stats['manifest_changed'] = True
+
+    # Chunks the new manifest no longer references
+    for path in out_dir.iterdir():
+        if path.name not in keep and _CHUNK_NAME.match(path.name):
+            path.unlink()
+            stats['removed'] += 1
+
+    return stats
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Rate limiting helpers for polite scraping of J-Archive
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Thread-safe token bucket that limits how often an action may happen"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second (i.e. sustained requests per second)
+            capacity: Maximum number of tokens that can accumulate (burst size)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, blocking until they are available
+
+        Tokens are reserved under the lock and the wait happens outside of it,
+        so concurrent callers queue up in order instead of racing each other.
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host so each host gets its own request budget"""
+
+    def __init__(self, rate: Optional[float], capacity: float = 1.0):
+        """
+        Args:
+            rate: Requests per second allowed per host. None or 0 disables limiting
+            capacity: Burst size for each host
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to the host of `url` is allowed"""
+        if not self.rate:
+            return 0.0
+
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.capacity)
+                self._buckets[host] = bucket
+
+        return bucket.acquire()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header into seconds to wait
+
+    Accepts both forms the header may take: a number of seconds or an
+    HTTP date. Returns None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based)
+
+    Uses "full jitter": a uniform draw below the exponential bound, so
+    clients that failed together don't all retry at the same moment.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveRateLimiter:
+    """
+    Request rate that adapts to how the host is coping (AIMD)
+
+    The rate grows additively while responses come back quickly and is cut
+    multiplicatively on 429/5xx answers or when latency climbs well above
+    the best level seen so far. A Retry-After header pauses every caller
+    until it has passed.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        min_rate: float = 0.1,
+        max_rate: float = 4.0,
+        increase: float = 0.1,
+        backoff: float = 0.5,
+        latency_factor: float = 2.0
+    ):
+        """
+        Args:
+            rate: Starting requests per second
+            min_rate: The rate never drops below this
+            max_rate: The rate never grows above this
+            increase: Requests per second added after each healthy response
+            backoff: Factor the rate is multiplied by when backing off
+            latency_factor: Back off when smoothed latency exceeds this
+                multiple of the lowest smoothed latency seen
+        """
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError("rates must satisfy 0 < min_rate <= rate <= max_rate")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_factor = latency_factor
+
+        self._bucket = TokenBucket(rate)
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._last_backoff = 0.0
+        self._latency = None
+        self._baseline = None
+
+    @property
+    def rate(self) -> float:
+        """Current requests per second"""
+        return self._bucket.rate
+
+    def acquire(self) -> float:
+        """
+        Block until the next request may be sent
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        waited = self._bucket.acquire()
+
+        # Checked after the bucket too: a Retry-After may arrive while waiting
+        while True:
+            with self._lock:
+                pause = self._paused_until - time.monotonic()
+            if pause <= 0:
+                return waited
+            time.sleep(pause)
+            waited += pause
+
+    def record_success(self, latency: float):
+        """Feed back a successful response and how long it took"""
+        with self._lock:
+            # Exponentially weighted moving average smooths out single slow pages
+            self._latency = latency if self._latency is None else 0.7 * self._latency + 0.3 * latency
+            self._baseline = self._latency if self._baseline is None else min(self._baseline, self._latency)
+
+            if self._latency > self._baseline * self.latency_factor:
+                self._back_off()
+            else:
+                self._set_rate(self.rate + self.increase)
+
+    def record_throttled(self, retry_after: Optional[float] = None):
+        """Feed back a 429/5xx answer (or a failed connection)"""
+        with self._lock:
+            self._back_off()
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def _back_off(self):
+        """Cut the rate, at most once per second so one burst of errors counts once"""
+        now = time.monotonic()
+        if now - self._last_backoff >= 1.0:
+            self._last_backoff = now
+            self._set_rate(self.rate * self.backoff)
+
+    def _set_rate(self, rate: float):
+        self._bucket.rate = min(self.max_rate, max(self.min_rate, rate))
+
+
+class CircuitBreaker:
+    """
+    Stops all requests for a while when a host keeps failing
+
+    Closed, the breaker lets everything through. After `failure_threshold`
+    consecutive failures it opens and `wait()` blocks callers for
+    `cooldown` seconds. Then it is half-open: the first caller goes ahead
+    as a trial request and everyone else keeps waiting until the trial is
+    recorded. Success closes the breaker; failure reopens it with the
+    cooldown doubled (up to `max_cooldown`).
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        max_cooldown: float = 600.0,
+        trial_timeout: float = 60.0
+    ):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            cooldown: Seconds to pause the first time it opens
+            max_cooldown: Upper bound for the growing pause
+            trial_timeout: Seconds to wait for the trial request's outcome
+                before letting another trial through (in case it was never
+                recorded)
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.trial_timeout = trial_timeout
+
+        self._lock = threading.Lock()
+        self._trial_done = threading.Condition(self._lock)
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._trial_started = None
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half-open'"""
+        with self._lock:
+            if self._trial_started is not None or (self._trips and time.monotonic() >= self._open_until):
+                return 'half-open'
+            if self._trips:
+                return 'open'
+            return 'closed'
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == 'open'
+
+    def wait(self) -> float:
+        """
+        Block while the breaker is open, or half-open with a trial in flight
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if not self._trips:
+                    return waited
+
+                if self._trial_started is None:
+                    pause = self._open_until - now
+                    if pause <= 0:
+                        # Cooldown over: this caller is the trial request
+                        self._trial_started = now
+                        return waited
+                else:
+                    pending = self._trial_started + self.trial_timeout - now
+                    if pending <= 0:
+                        # The trial's outcome never came back; send another
+                        self._trial_started = now
+                        return waited
+                    self._trial_done.wait(pending)
+                    waited += max(0.0, time.monotonic() - now)
+                    continue
+
+            time.sleep(pause)
+            waited += pause
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trips = 0
+            self._trial_started = None
+            self._trial_done.notify_all()
+
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._trips and self._trial_started is None:
+                # A request already in flight when the breaker opened
+                return
+
+            if not self._trips:
+                self._failures += 1
+                if self._failures < self.failure_threshold:
+                    return
+
+            # Opening, or the trial request after a pause failed: wait longer each time
+            pause = min(self.max_cooldown, self.cooldown * (2 ** self._trips))
+            self._trips += 1
+            self._open_until = now + pause
+            self._trial_started = None
+            self._trial_done.notify_all()
+
+        print(f"Host looks unavailable; pausing requests for {pause:.0f}s")
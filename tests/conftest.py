@@ -0,0 +1,118 @@
+"""
+Test setup: the scraper modules import each other as top-level modules
+(the way run_scraper.py runs), so scraper/ goes on sys.path.
+"""
+
+import hashlib
+import io
+import json
+import re
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = ROOT / 'tests' / 'fixtures'
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'scraper'))
+
+from database import JeopardyDatabase  # noqa: E402
+
+# A showgame.php page in J-Archive's markup (game 9302, Show #9425)
+SHOWGAME_PAGE = (FIXTURES / 'showgame_9302.html').read_bytes()
+
+
+def show_page(game_id: int) -> bytes:
+    """The fixture page renumbered as Show #<game_id>, so every game stores separately"""
+    return SHOWGAME_PAGE.replace(b'Show #9425', f'Show #{game_id}'.encode())
+
+
+def load_game(game_id: int) -> dict:
+    """
+    A scraped game from data/json (9302-9306), with the show_number and
+    air_date the scraper takes from the title (the files predate them)
+    """
+    game = json.loads((ROOT / 'data' / 'json' / f'jeopardy_game_{game_id}.json').read_text())
+    game['show_number'] = int(re.search(r'Show #(\d+)', game['title']).group(1))
+    game['air_date'] = re.search(r'aired (\d{4}-\d{2}-\d{2})', game['title']).group(1)
+    return game
+
+
+@pytest.fixture
+def db(tmp_path):
+    """An empty database in a temporary directory"""
+    with redirect_stdout(io.StringIO()):
+        database = JeopardyDatabase(tmp_path / 'jeopardy.db')
+    yield database
+    database.close()
+
+
+class StubJArchive:
+    """
+    Serves showgame.php pages on 127.0.0.1
+
+    Pages carry an ETag of their content and If-None-Match is honoured.
+    Every request is recorded as (arrival time, game_id, request headers).
+    """
+
+    def __init__(self):
+        self.pages = {}  # game_id -> page bytes, overriding show_page()
+        self.requests = []
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                stub.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def page(self, game_id: int) -> bytes:
+        return self.pages.get(game_id) or show_page(game_id)
+
+    def handle(self, handler: BaseHTTPRequestHandler):
+        game_id = int(parse_qs(urlparse(handler.path).query)['game_id'][0])
+        with self._lock:
+            self.requests.append((time.monotonic(), game_id, dict(handler.headers)))
+
+        body = self.page(game_id)
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        if handler.headers.get('If-None-Match') == etag:
+            handler.send_response(304)
+            handler.send_header('ETag', etag)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+            return
+
+        handler.send_response(200)
+        handler.send_header('ETag', etag)
+        handler.send_header('Content-Type', 'text/html; charset=utf-8')
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def jarchive():
+    """A local stand-in for j-archive.com (pass `jarchive.base_url` as base_url)"""
+    stub = StubJArchive()
+    yield stub
+    stub.close()
@@ -0,0 +1,71 @@
+"""Answer normalization, aliases and bulk grading"""
+
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from answers import aliases, edit_distance, normalize
+from conftest import load_game
+
+
+def test_responses_and_answers_normalize_alike():
+    assert normalize('What is <i>the</i> Café Procope?') == 'cafe procope'
+    assert normalize("who's Ender's Game") == 'enders game'
+    assert normalize('Rock & Roll') == 'rock and roll'
+
+
+def test_parentheses_become_aliases():
+    assert aliases('(George) Washington') == ['washington', 'george washington']
+    assert aliases('Burma (or Myanmar)') == ['burma', 'myanmar']
+    assert aliases('') == []
+
+
+def test_edit_distance_gives_up_past_the_limit():
+    assert edit_distance('washington', 'washingtin', 1) == 1
+    assert edit_distance('kitten', 'sitting', 3) == 3
+    assert edit_distance('kitten', 'sitting', 2) is None
+    assert edit_distance('nile', 'amazon', 2) is None
+
+
+@pytest.fixture
+def loaded(db):
+    game = load_game(9302)
+    game['jeopardy_round'][0]['answer'] = '(George) Washington'
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(game)
+    return db
+
+
+def test_grade_responses_in_one_call(loaded):
+    clue_id = loaded.conn.execute("SELECT MIN(id) FROM clues").fetchone()[0]
+    grades = loaded.grade_responses([
+        (clue_id, 'Who is George Washington?'),
+        (clue_id, 'washingtin'),
+        (clue_id, 'Jefferson'),
+        (clue_id, ''),
+    ])
+    assert [grade.correct for grade in grades] == [True, True, False, False]
+    assert grades[0].score == 1.0 and grades[0].alias == 'george washington'
+    assert 0 < grades[1].score < 1
+
+    with pytest.raises(ValueError):
+        loaded.grade_responses([(10 ** 9, 'anything')])
+
+
+def test_answer_index_follows_replace_and_rebuild(loaded):
+    changed = load_game(9302)
+    changed['jeopardy_round'][0]['answer'] = 'Thomas Jefferson'
+    with redirect_stdout(io.StringIO()):
+        loaded.replace_game(changed)
+    clue_id = loaded.conn.execute("SELECT MIN(id) FROM clues").fetchone()[0]
+    assert loaded.grade_responses([(clue_id, 'Jefferson')])[0].correct is False
+    assert loaded.grade_responses([(clue_id, 'Thomas Jefferson')])[0].correct
+
+    before = [tuple(row) for row in loaded.conn.execute("SELECT * FROM answer_index ORDER BY clue_id")]
+    loaded.rebuild_answer_index()
+    assert [tuple(row) for row in loaded.conn.execute("SELECT * FROM answer_index ORDER BY clue_id")] == before
+    orphaned = loaded.conn.execute(
+        "SELECT COUNT(*) FROM answer_index WHERE clue_id NOT IN (SELECT id FROM clues)"
+    ).fetchone()[0]
+    assert orphaned == 0
@@ -0,0 +1,61 @@
+"""NDJSON export/import with checksum manifests"""
+
+import gzip
+import io
+import json
+from contextlib import redirect_stdout
+
+import pytest
+
+from bulk_io import database_checksum, export_games, import_games, verify_export
+from conftest import load_game
+from database import JeopardyDatabase
+
+GAMES = [load_game(game_id) for game_id in range(9302, 9307)]
+
+
+@pytest.fixture
+def loaded(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_games(GAMES)
+    return db
+
+
+@pytest.mark.parametrize('name', ['jeopardy.ndjson', 'jeopardy.ndjson.gz'])
+def test_export_round_trips_through_import(loaded, tmp_path, name):
+    path = tmp_path / 'export' / name
+    manifest = export_games(loaded, path)
+    clues = sum(len(game['jeopardy_round']) + len(game['double_jeopardy_round']) for game in GAMES)
+    assert (manifest['games'], manifest['clues']) == (5, clues)
+    assert verify_export(path)['ok']
+
+    with redirect_stdout(io.StringIO()), JeopardyDatabase(tmp_path / 'copy.db') as copy:
+        stats = import_games(copy, path, workers=1, verify=True)
+        assert stats == {'read': 5, 'inserted': 5, 'checksum_ok': True, 'round_trip_ok': True}
+        assert database_checksum(copy) == database_checksum(loaded)
+
+
+def test_filtered_export_and_truncation(loaded, tmp_path):
+    path = tmp_path / 'slice.ndjson.gz'
+    manifest = export_games(loaded, path, start_date=GAMES[1]['air_date'], end_date=GAMES[2]['air_date'])
+    assert manifest['games'] == 2
+    assert manifest['compression'] == 'gzip'
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        first_line = f.readline()
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(first_line)
+    assert not verify_export(path)['ok']
+
+
+def test_import_from_json_directory_skips_stored_games(loaded, tmp_path):
+    directory = tmp_path / 'json'
+    directory.mkdir()
+    for game in GAMES + [dict(load_game(9302), game_id=1)]:
+        (directory / f"jeopardy_game_{game['game_id']}.json").write_text(json.dumps(game))
+
+    with redirect_stdout(io.StringIO()):
+        stats = import_games(loaded, directory, workers=1)
+    assert stats['read'] == 6 and stats['inserted'] == 1
+    assert stats['checksum_ok'] is None
+    assert loaded.game_exists(1)
@@ -0,0 +1,103 @@
+"""insert_games: the batched bulk-load path"""
+
+import io
+import sqlite3
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import load_game
+from database import SEARCH_TRIGGERS, SECONDARY_INDEXES, STATS_TRIGGERS, JeopardyDatabase
+
+GAME_IDS = range(9302, 9307)
+
+
+def schema_names(db):
+    return {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master")}
+
+
+def all_clues(db):
+    return [tuple(row) for row in db.conn.execute("SELECT * FROM clue_details ORDER BY game_id, id")]
+
+
+def failing_games():
+    yield load_game(9302)
+    broken = load_game(9303)
+    broken['jeopardy_round'][0]['clue'] = object()  # not bindable
+    yield broken
+
+
+def test_bulk_load_matches_per_game_inserts(db, tmp_path):
+    games = [load_game(game_id) for game_id in GAME_IDS]
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(games[0])
+        # The stored game is skipped, and a repeat within the input is written once
+        assert db.insert_games(games + [games[-1]], batch_size=2, rebuild_indexes=True) == len(games) - 1
+
+        with JeopardyDatabase(tmp_path / 'reference.db') as reference:
+            for game in games:
+                reference.insert_game(game)
+            expected = all_clues(reference)
+
+    assert all_clues(db) == expected
+    assert set(SECONDARY_INDEXES) <= schema_names(db)
+
+
+def test_replace_swaps_in_the_new_copy(db):
+    game = load_game(9302)
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(game)
+        game['final_jeopardy'] = None
+        assert db.insert_games([game], replace=True) == 1
+
+    assert db.get_stats()['total_clues'] == len(game['jeopardy_round']) + len(game['double_jeopardy_round'])
+
+
+def test_failed_load_restores_indexes_and_reraises(db, monkeypatch):
+    def must_not_run(*args, **kwargs):
+        raise AssertionError("rebuild ran after a failed load")
+
+    for name in ('rebuild_search_index', 'rebuild_stats'):
+        monkeypatch.setattr(db, name, must_not_run)
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        with redirect_stdout(io.StringIO()):
+            db.insert_games(failing_games(), batch_size=1, rebuild_indexes=True)
+
+    assert set(SECONDARY_INDEXES) <= schema_names(db)
+    assert set(SEARCH_TRIGGERS) <= schema_names(db)
+    assert set(STATS_TRIGGERS) <= schema_names(db)
+    # The first batch committed before the error
+    assert db.game_exists(9302) and not db.game_exists(9303)
+
+
+def test_bulk_load_indexes_only_new_clues_like_per_game_inserts(db, tmp_path, monkeypatch):
+    games = [load_game(game_id) for game_id in GAME_IDS]
+    # A rerun of the first game, so the duplicate index has something to find
+    rerun = dict(load_game(9302), game_id=1, show_number=1)
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(games[0])
+        reference = JeopardyDatabase(tmp_path / 'reference.db')
+        for game in games + [rerun]:
+            reference.insert_game(game)
+        reference.insert_games([rerun], replace=True)
+
+        for name in ('rebuild_duplicate_index', 'rebuild_answer_index'):
+            monkeypatch.setattr(db, name, lambda *args, **kwargs: pytest.fail("full rebuild"))
+        db.insert_games(games[1:] + [rerun], batch_size=2, rebuild_indexes=True)
+        # Replacing takes the old copy out of the indexes and adds the new one
+        db.insert_games([rerun], replace=True, rebuild_indexes=True)
+
+    def contents(database):
+        answers = database.conn.execute("SELECT * FROM answer_index ORDER BY clue_id")
+        duplicates = database.conn.execute("SELECT * FROM clue_duplicates ORDER BY clue_id")
+        return {
+            'clues': all_clues(database),
+            'stats': database.get_stats(),
+            'answers': [tuple(row) for row in answers],
+            'duplicates': [tuple(row) for row in duplicates],
+        }
+
+    assert contents(db)['duplicates']
+    assert contents(db) == contents(reference)
+    reference.close()
@@ -0,0 +1,56 @@
+"""Concurrent scraping: per-host pacing across threads, database writes on the calling thread"""
+
+import functools
+import inspect
+import io
+import threading
+from contextlib import redirect_stdout
+
+from database import JeopardyDatabase
+from run_scraper import scrape_games_batch
+
+GAME_IDS = list(range(1, 9))
+CLUES_PER_GAME = 59  # one clue of the fixture board went unrevealed
+
+
+def record_threads(monkeypatch):
+    """Patch every JeopardyDatabase method to log (method name, calling thread)"""
+    calls = []
+    for name, method in list(vars(JeopardyDatabase).items()):
+        if name.startswith('__') or not inspect.isfunction(method):  # leaves staticmethods alone
+            continue
+
+        def wrapper(*args, _name=name, _method=method, **kwargs):
+            calls.append((_name, threading.current_thread()))
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(JeopardyDatabase, name, functools.wraps(method)(wrapper))
+    return calls
+
+
+def test_concurrent_scrape_paces_the_host_and_writes_on_the_main_thread(jarchive, tmp_path, monkeypatch):
+    calls = record_threads(monkeypatch)
+    db_path = tmp_path / 'jeopardy.db'
+
+    with redirect_stdout(io.StringIO()):
+        stats = scrape_games_batch(
+            GAME_IDS, concurrency=4, rate=10.0, db_path=str(db_path), base_url=jarchive.base_url,
+            save_json=False
+        )
+
+    assert stats['success'] == len(GAME_IDS) and stats['failed'] == 0
+
+    # One token bucket for the host, shared by all four workers
+    arrivals = sorted(at for at, _, _ in jarchive.requests)
+    assert sorted(game_id for _, game_id, _ in jarchive.requests) == GAME_IDS
+    gaps = [later - earlier for earlier, later in zip(arrivals, arrivals[1:])]
+    assert min(gaps) >= 0.07
+    assert arrivals[-1] - arrivals[0] >= 0.6
+
+    assert 'insert_game' in {name for name, _ in calls}
+    assert {thread for _, thread in calls} == {threading.main_thread()}
+
+    monkeypatch.undo()
+    with JeopardyDatabase(db_path) as db:
+        for game_id in GAME_IDS:
+            assert len(db.get_clues_by_show_number(game_id)) == CLUES_PER_GAME
@@ -0,0 +1,59 @@
+"""Crawl planning and resumable checkpoints in the crawl_state table"""
+
+import io
+from contextlib import redirect_stdout
+
+from database import JeopardyDatabase
+from run_scraper import scrape_games_batch
+
+NO_GAME_PAGE = b"<html><head><title>J! Archive</title></head><body><p>ERROR: No game 3 in database.</p></body></html>"
+
+
+def scrape(jarchive, db_path, game_ids, **kwargs):
+    with redirect_stdout(io.StringIO()):
+        return scrape_games_batch(
+            game_ids, delay=0, save_json=False, db_path=str(db_path), base_url=jarchive.base_url,
+            save_archive=False, **kwargs
+        )
+
+
+def test_crawl_checkpoints_every_game_and_resumes_unfinished_ones(jarchive, tmp_path, monkeypatch):
+    db_path = tmp_path / 'jeopardy.db'
+    jarchive.pages[3] = NO_GAME_PAGE
+    scrape(jarchive, db_path, [1])
+
+    insert_game = JeopardyDatabase.insert_game
+
+    def fail_game_4(db, game_data):
+        if game_data['game_id'] == 4:
+            raise RuntimeError("disk full")
+        return insert_game(db, game_data)
+
+    monkeypatch.setattr(JeopardyDatabase, 'insert_game', fail_game_4)
+    stats = scrape(jarchive, db_path, [1, 2, 3, 4, 2])
+    assert stats == {'total': 4, 'success': 1, 'failed': 1, 'skipped': 1, 'empty': 1}
+    assert [game_id for _, game_id, _ in jarchive.requests] == [1, 2, 3, 4]
+
+    with JeopardyDatabase(db_path) as db:
+        assert db.get_crawl_counts() == {'pending': 0, 'done': 2, 'failed': 1, 'empty': 1}
+        assert db.existing_game_ids([1, 2, 3, 4]) == {1, 2}
+        assert db.conn.execute("SELECT attempts, last_error FROM crawl_state WHERE game_id = 4").fetchone()[1] == "Error: disk full"
+
+    # Only the failed game is fetched again
+    monkeypatch.undo()
+    stats = scrape(jarchive, db_path, None, resume=True)
+    assert stats['success'] == 1 and stats['total'] == 1
+    assert [game_id for _, game_id, _ in jarchive.requests][4:] == [4]
+
+    # With a range, games already done or empty are not checked again
+    stats = scrape(jarchive, db_path, [1, 2, 3, 4, 5], resume=True)
+    assert stats['total'] == 1 and stats['success'] == 1
+    assert [game_id for _, game_id, _ in jarchive.requests][5:] == [5]
+
+    with JeopardyDatabase(db_path) as db:
+        assert db.get_crawl_counts() == {'pending': 0, 'done': 4, 'failed': 0, 'empty': 1}
+        assert db.conn.execute("SELECT attempts FROM crawl_state WHERE game_id = 4").fetchone()[0] == 2
+
+
+def test_existing_game_ids_takes_any_number_of_ids(db):
+    assert db.existing_game_ids(range(100000)) == set()
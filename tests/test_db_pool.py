@@ -0,0 +1,66 @@
+"""DatabasePool: per-thread read-only handles and one serialized writer"""
+
+import io
+import sqlite3
+import threading
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import load_game
+from db_pool import DatabasePool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    with redirect_stdout(io.StringIO()):
+        pool = DatabasePool(tmp_path / 'jeopardy.db')
+    yield pool
+    pool.close()
+
+
+def test_each_thread_reads_through_its_own_handle(pool):
+    with pool.writer() as db, redirect_stdout(io.StringIO()):
+        db.insert_game(load_game(9302))
+
+    handles, clues = [], []
+
+    def read():
+        handles.append(pool.reader())
+        assert pool.reader() is handles[-1]
+        clues.append(pool.reader().get_random_clue())
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(handle) for handle in handles}) == 4
+    assert all(handle.read_only for handle in handles)
+    assert all(clue['game_id'] == 9302 for clue in clues)
+
+
+def test_readers_refuse_writes_and_see_committed_games(pool):
+    reader = pool.reader()
+    assert reader.get_random_clue() is None
+
+    with pytest.raises(sqlite3.OperationalError):
+        reader.conn.execute("DELETE FROM clues")
+
+    with pool.writer() as db, redirect_stdout(io.StringIO()):
+        db.insert_game(load_game(9303))
+    assert reader.game_exists(9303)
+
+
+def test_closed_pool_closes_its_handles(pool):
+    reader = pool.reader()
+    pool.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        reader.conn.execute("SELECT 1")
+    with pytest.raises(RuntimeError):
+        pool.reader()
+    with pytest.raises(RuntimeError):
+        with pool.writer():
+            pass
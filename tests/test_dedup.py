@@ -0,0 +1,69 @@
+"""Duplicate and near-duplicate clue detection"""
+
+import io
+from contextlib import redirect_stdout
+
+from answers import normalize
+from conftest import load_game
+from dedup import content_hash, fingerprint, is_duplicate, normalize_answer
+
+SPELLINGS = (
+    'the Café Procope',
+    '<i>Cafe</i> Procope',
+    'What is Café Procope?',
+    'CAFE PROCOPE',
+)
+
+CLUE = 'In 1686 this coffeehouse opened on the Left Bank and still serves customers in Paris today'
+
+
+def test_rewordings_match_and_different_answers_do_not():
+    original = fingerprint(CLUE, 'Café Procope')
+    assert is_duplicate(original, fingerprint(CLUE.upper() + '!', 'the Café Procope'))
+    assert is_duplicate(original, fingerprint(CLUE.replace('today', 'to this day'), 'Café Procope'))
+    assert not is_duplicate(original, fingerprint(CLUE, 'Les Deux Magots'))
+    assert not is_duplicate(original, fingerprint('A different clue about Paris entirely', 'Café Procope'))
+    assert content_hash(CLUE, 'Café Procope') == content_hash(f'"{CLUE}"', 'Café Procope')
+    assert fingerprint('', 'Café Procope') is None
+
+
+def rerun(game_id, show_number, reword=False):
+    game = dict(load_game(9302), game_id=game_id, show_number=show_number)
+    if reword:
+        game['jeopardy_round'] = [dict(clue, clue=clue['clue'] + ' indeed') for clue in game['jeopardy_round']]
+    return game
+
+
+def test_reruns_form_clusters_that_follow_deletes(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_games([load_game(9302), load_game(9303)])
+        db.insert_game(rerun(1, 1, reword=True))
+        db.insert_games([rerun(2, 2)])
+
+    first = db.conn.execute("SELECT MIN(id) FROM clues WHERE game_id = 9302").fetchone()[0]
+    copies = db.find_duplicates(first)
+    assert [clue['game_id'] for clue in copies] == [1, 2]
+    assert [clue['exact'] for clue in copies] == [False, True]
+
+    # Every board clue of the original, its reworded rerun and its exact rerun
+    board_clues = len(load_game(9302)['jeopardy_round']) + len(load_game(9302)['double_jeopardy_round'])
+    assert db.get_duplicate_counts() == {'clusters': board_clues, 'duplicate_clues': 2 * board_clues}
+    assert {cluster['size'] for cluster in db.get_duplicate_clusters()} == {3}
+
+    sampled = db.get_random_clues(1000, dedupe=True)
+    representatives = {clue['id'] for clue in sampled}
+    assert not representatives & {row[0] for row in db.conn.execute("SELECT clue_id FROM clue_duplicates")}
+
+    db.delete_game(9302)
+    assert {cluster['size'] for cluster in db.get_duplicate_clusters()} == {2}
+
+
+def test_normalize_answer_matches_grading():
+    for answer in SPELLINGS + ('Rock & Roll', "Ender's Game", ''):
+        assert normalize_answer(answer) == normalize(answer)
+
+
+def test_answer_spellings_are_exact_repeats():
+    clue = 'This Paris coffeehouse opened in 1686'
+    assert len({content_hash(clue, answer) for answer in SPELLINGS}) == 1
+    assert {fingerprint(clue, answer).answer for answer in SPELLINGS} == {'cafe procope'}
@@ -0,0 +1,62 @@
+"""Game dictionaries from parsers that predate board positions"""
+
+import io
+from contextlib import redirect_stdout
+
+from benchmarks.synthetic import synthetic_game
+from board import ROUND_VALUES
+from bulk_io import import_games
+from conftest import ROOT
+from database import JeopardyDatabase
+
+BOARD_KEYS = ('jeopardy_round', 'double_jeopardy_round')
+
+
+def legacy(game):
+    """The game as the parser before board positions wrote it"""
+    game = {key: value for key, value in game.items() if key not in ('show_number', 'air_date', 'categories')}
+    for key in BOARD_KEYS:
+        game[key] = [
+            {name: value for name, value in dict(clue, value=ROUND_VALUES[clue['row']]).items()
+             if name not in ('row', 'column')}
+            for clue in game[key]
+        ]
+    return game
+
+
+def board_clues(db):
+    return [tuple(row) for row in db.conn.execute("""
+        SELECT game_id, round_id, board_row, board_column, value, clue FROM clues
+        WHERE round_id IN (1, 2) ORDER BY game_id, round_id, board_row, board_column
+    """)]
+
+
+def test_legacy_games_get_positions_and_values(db, tmp_path):
+    # Game 1 aired before values were doubled, game 6000 after
+    games = [synthetic_game(1), synthetic_game(6000)]
+    with redirect_stdout(io.StringIO()):
+        reference = JeopardyDatabase(tmp_path / 'reference.db')
+        reference.insert_games(games)
+        db.insert_games([legacy(game) for game in games])
+
+    assert board_clues(db) == board_clues(reference)
+    assert db.get_game_board(6000) == reference.get_game_board(6000)
+    reference.close()
+
+
+def test_importing_the_json_files_lays_out_boards(db):
+    with redirect_stdout(io.StringIO()):
+        import_games(db, ROOT / 'data' / 'json', workers=1)
+
+    values = {row[0] for row in db.conn.execute("SELECT value FROM clues WHERE round_id = 2")}
+    assert values == {400, 800, 1200, 1600, 2000}
+    unplaced = db.conn.execute(
+        "SELECT COUNT(*) FROM clues WHERE round_id IN (1, 2) AND (board_row IS NULL OR board_column IS NULL)"
+    ).fetchone()[0]
+    assert unplaced == 0
+
+    show = db.conn.execute("SELECT show_number FROM games WHERE game_id = 9302").fetchone()[0]
+    assert show == 9425
+    board = db.get_game_board(show)
+    assert board['double_jeopardy_round']['values'] == ['$400', '$800', '$1200', '$1600', '$2000']
+    assert all(cell for row in board['jeopardy_round']['clues'] for cell in row)
@@ -0,0 +1,65 @@
+"""Per-stage scraper metrics and their JSON/Prometheus output"""
+
+import io
+import json
+from contextlib import redirect_stdout
+
+from conftest import SHOWGAME_PAGE
+from metrics import Histogram, ScrapeMetrics
+from run_scraper import scrape_games_batch
+
+CLUES_PER_GAME = 59
+
+
+def test_batch_records_every_stage(jarchive, tmp_path):
+    metrics = ScrapeMetrics()
+    with redirect_stdout(io.StringIO()):
+        stats = scrape_games_batch(
+            [1, 2, 3], delay=0, save_json=False, db_path=str(tmp_path / 'jeopardy.db'),
+            base_url=jarchive.base_url, metrics=metrics
+        )
+        scrape_games_batch(
+            [1], delay=0, save_json=False, db_path=str(tmp_path / 'jeopardy.db'),
+            base_url=jarchive.base_url, refresh=True, metrics=metrics
+        )
+    assert stats['success'] == 3
+
+    summary = metrics.summary()
+    assert {stage: summary['stages'][stage]['count'] for stage in ('fetch', 'parse', 'archive', 'insert')} == {
+        'fetch': 4, 'parse': 3, 'archive': 3, 'insert': 3
+    }
+    assert summary['stages']['save_json']['count'] == 0
+    assert summary['counters']['pages_downloaded'] == 3
+    assert summary['counters']['pages_not_modified'] == 1
+    assert summary['counters']['bytes_downloaded'] >= 3 * len(SHOWGAME_PAGE) - 100
+    assert summary['clues_per_game']['count'] == 3
+    assert summary['clues_per_game']['mean'] == CLUES_PER_GAME
+
+
+def test_histogram_quantiles_stay_within_observed_values():
+    histogram = Histogram((1, 2, 5))
+    for value in (0.5, 1.5, 1.5, 3, 4):
+        histogram.observe(value)
+
+    assert histogram.quantile(0) >= 0.5
+    assert 1 <= histogram.quantile(0.5) <= 2
+    assert histogram.quantile(1) == 4
+    assert list(histogram.cumulative()) == [(1, 1), (2, 3), (5, 5), (float('inf'), 5)]
+
+
+def test_outputs_are_written_atomically(tmp_path):
+    metrics = ScrapeMetrics()
+    metrics.observe_stage('fetch', 0.02)
+    metrics.increment('pages_downloaded')
+    metrics.observe_clues(61)
+
+    metrics.write_json(tmp_path / 'metrics.json')
+    assert json.loads((tmp_path / 'metrics.json').read_text())['stages']['fetch']['count'] == 1
+
+    metrics.write_prometheus(tmp_path / 'scraper.prom')
+    text = (tmp_path / 'scraper.prom').read_text()
+    assert 'jeopardy_scraper_stage_seconds_bucket{stage="fetch",le="0.025"} 1' in text
+    assert 'jeopardy_scraper_stage_seconds_count{stage="fetch"} 1' in text
+    assert 'jeopardy_scraper_pages_downloaded_total 1' in text
+    assert 'jeopardy_scraper_clues_per_game_bucket{le="61"} 1' in text
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['metrics.json', 'scraper.prom']
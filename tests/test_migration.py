@@ -0,0 +1,83 @@
+"""Migrating databases from the text-column layout to lookup ids"""
+
+import io
+import sqlite3
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import load_game
+from database import JeopardyDatabase
+
+GAMES = [load_game(game_id) for game_id in (9302, 9303)]
+
+# The schema before lookup tables (PRAGMA user_version 0)
+OLD_SCHEMA = """
+    CREATE TABLE games (
+        game_id INTEGER PRIMARY KEY,
+        show_number INTEGER,
+        title TEXT NOT NULL,
+        url TEXT NOT NULL,
+        air_date TEXT,
+        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE clues (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_id INTEGER NOT NULL,
+        round TEXT NOT NULL,
+        category TEXT NOT NULL,
+        value TEXT NOT NULL,
+        clue TEXT NOT NULL,
+        answer TEXT,
+        daily_double BOOLEAN DEFAULT 0,
+        FOREIGN KEY (game_id) REFERENCES games(game_id)
+    );
+"""
+
+
+def old_database(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(OLD_SCHEMA)
+    for game in GAMES:
+        conn.execute(
+            "INSERT INTO games (game_id, show_number, title, url, air_date) VALUES (?, ?, ?, ?, ?)",
+            (game['game_id'], game['show_number'], game['title'], game['url'], game['air_date'])
+        )
+        for round_name, key in (('Jeopardy', 'jeopardy_round'), ('Double Jeopardy', 'double_jeopardy_round')):
+            conn.executemany(
+                "INSERT INTO clues (game_id, round, category, value, clue, answer, daily_double) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (game['game_id'], round_name, clue['category'], clue['value'], clue['clue'], clue['answer'], clue['daily_double'])
+                    for clue in game[key]
+                ]
+            )
+    conn.commit()
+    conn.close()
+
+
+def contents(db):
+    return {
+        'clues': list(db.iter_clues()),
+        'shows': [db.get_clues_by_show_number(game['show_number']) for game in GAMES],
+        'stats': db.get_stats(),
+    }
+
+
+def test_migrated_database_returns_what_a_new_one_does(tmp_path):
+    old_database(tmp_path / 'old.db')
+    with pytest.raises(RuntimeError, match='migrate'):
+        JeopardyDatabase(tmp_path / 'old.db', read_only=True)
+
+    with redirect_stdout(io.StringIO()):
+        with JeopardyDatabase(tmp_path / 'new.db') as new:
+            new.insert_games(GAMES)
+            expected = contents(new)
+
+        with JeopardyDatabase(tmp_path / 'old.db') as migrated:
+            assert contents(migrated) == expected
+            assert migrated.check_stats() == {}
+            if migrated.has_search:
+                assert migrated.search_clues('bugliosi')[0]['answer'] == 'Helter Skelter'
+
+    with JeopardyDatabase(tmp_path / 'old.db', read_only=True) as reader:
+        assert contents(reader) == expected
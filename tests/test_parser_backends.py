@@ -0,0 +1,59 @@
+"""The stream parser must produce exactly what the BeautifulSoup reference does"""
+
+import json
+
+import pytest
+
+from conftest import FIXTURES, ROOT
+from game_parser import parse_game_html
+
+pytest.importorskip('bs4')
+
+ROUNDS = ('jeopardy_round', 'double_jeopardy_round')
+PAGES = ['showgame_9302.html', 'showgame_9303_toggle_layout.html']
+
+
+def assert_backends_agree(html, game_id: int):
+    stream = parse_game_html(html, game_id, backend='stream')
+    reference = parse_game_html(html, game_id, backend='bs4')
+    assert stream == reference
+    return stream
+
+
+@pytest.mark.parametrize('name', PAGES)
+def test_backends_agree_on_archived_markup(name):
+    """Scripts, comments, entities, <br />, media links and empty cells as J-Archive serves them"""
+    html = (FIXTURES / name).read_bytes()
+    game_id = int(name.split('_')[1].split('.')[0])
+    parsed = assert_backends_agree(html, game_id)
+    assert len(parsed['jeopardy_round']) == 29  # one clue left unrevealed
+    assert len(parsed['double_jeopardy_round']) == 30
+    assert sum(clue['daily_double'] for round_key in ROUNDS for clue in parsed[round_key]) == 3
+
+
+@pytest.mark.parametrize('marker', [
+    '<!-- clue_value_daily_double -->',
+    '<span>clue_value_daily_double</span>',
+    '<script>clue_value_daily_double</script>',
+])
+def test_backends_agree_on_daily_double_marker_outside_attributes(marker):
+    html = (FIXTURES / 'showgame_9302.html').read_text()
+    cell = html.index('<td class="clue">', html.index('\n<table class="round">'))
+    cell = html.index('>', cell) + 1
+    parsed = assert_backends_agree(html[:cell] + marker + html[cell:], 9302)
+    assert parsed['jeopardy_round'][0]['daily_double']
+
+
+def test_archived_page_matches_the_scraped_game():
+    parsed = parse_game_html((FIXTURES / 'showgame_9302.html').read_bytes(), 9302)
+    game = json.loads((ROOT / 'data' / 'json' / 'jeopardy_game_9302.json').read_text())
+    assert parsed['show_number'] == 9425 and parsed['air_date'] == '2025-10-31'
+    for round_key in ROUNDS:
+        expected = [(clue['category'], clue['answer'], clue['daily_double']) for clue in game[round_key]]
+        # The unrevealed clue is the last cell of the board
+        assert [(clue['category'], clue['answer'], clue['daily_double']) for clue in parsed[round_key]] == expected[:len(parsed[round_key])]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        parse_game_html(b'', 1, backend='lxml')
@@ -0,0 +1,59 @@
+"""The read-only query CLI"""
+
+import io
+import json
+import subprocess
+import sys
+from contextlib import redirect_stdout
+
+import pytest
+
+from benchmarks.synthetic import synthetic_game
+from conftest import ROOT
+from database import JeopardyDatabase
+from query import main
+
+
+@pytest.fixture
+def three_days(db):
+    """Games 1-3, aired 1984-09-10 to 1984-09-12"""
+    with redirect_stdout(io.StringIO()):
+        for game_id in (1, 2, 3):
+            db.insert_game(synthetic_game(game_id))
+    return db
+
+
+def query(db, *argv):
+    out = io.StringIO()
+    with redirect_stdout(out):
+        main(['--db', str(db.db_path), '--json', *argv])
+    return json.loads(out.getvalue())
+
+
+def test_random_by_date_draws_distinct_clues_in_one_query(three_days, monkeypatch, capsys):
+    monkeypatch.setattr(JeopardyDatabase, 'get_random_clue_by_date', None)  # no per-clue lookups
+    in_range = three_days.conn.execute("""
+        SELECT COUNT(*) FROM clues JOIN games USING (game_id)
+        WHERE air_date BETWEEN '1984-09-11' AND '1984-09-12' AND round_id <> 3
+    """).fetchone()[0]
+
+    clues = query(three_days, 'random', '--count', '40', '--from-date', '1984-09-11', '--to-date', '1984-09-12')
+    assert len(clues) == 40
+    assert len({clue['id'] for clue in clues}) == 40
+    assert {clue['air_date'] for clue in clues} <= {'1984-09-11', '1984-09-12'}
+
+    clues = query(three_days, 'random', '--count', str(in_range + 10), '--from-date', '1984-09-11')
+    assert len(clues) == in_range
+    assert f"Only {in_range} of {in_range + 10} clues match" in capsys.readouterr().err
+
+
+def test_database_code_does_not_load_the_scraping_stack(tmp_path):
+    script = (
+        "import sys\n"
+        "from scraper import JeopardyDatabase\n"
+        f"JeopardyDatabase({str(tmp_path / 'jeopardy.db')!r}).close()\n"
+        "from scraper.query import SCRAPING_MODULES\n"
+        "print([name for name in SCRAPING_MODULES if name in sys.modules])\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
@@ -0,0 +1,72 @@
+"""Query result cache: copies, invalidation, eviction and per-reader caches"""
+
+import io
+import threading
+from contextlib import redirect_stdout
+
+from benchmarks.synthetic import synthetic_game
+from database import JeopardyDatabase
+from db_pool import DatabasePool
+from query_cache import QueryCache
+
+
+def test_cached_results_are_copies(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(synthetic_game(1))
+    show_number = synthetic_game(1)['show_number']
+
+    with JeopardyDatabase(db.db_path, read_only=True, cache_size=16) as reader:
+        clues = reader.get_clues_by_show_number(show_number)
+        expected = [dict(clue) for clue in clues]
+        clues[0]['answer'] = 'tampered'
+        clues.clear()
+
+        board = reader.get_game_board(show_number)
+        board['jeopardy_round']['clues'][0][0] = None
+
+        assert reader.get_clues_by_show_number(show_number) == expected
+        assert reader.get_game_board(show_number)['jeopardy_round']['clues'][0][0] is not None
+        assert reader.cache.stats()['hits'] == 2
+
+
+def test_pool_readers_cache_separately(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(synthetic_game(1))
+
+    with DatabasePool(db.db_path, cache_size=16) as pool:
+        readers = []
+
+        def read():
+            reader = pool.reader()
+            reader.get_stats()
+            reader.get_stats()
+            readers.append(reader)
+
+        for _ in range(2):
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+
+        assert readers[0].cache is not readers[1].cache
+        assert [reader.cache.stats()['hits'] for reader in readers] == [1, 1]
+
+
+def test_commits_from_another_connection_invalidate(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(synthetic_game(1))
+
+    with JeopardyDatabase(db.db_path, read_only=True, cache_size=16) as reader:
+        assert reader.get_stats()['total_games'] == 1
+        with redirect_stdout(io.StringIO()):
+            db.insert_game(synthetic_game(2))
+        assert reader.get_stats()['total_games'] == 2
+        assert reader.cache.stats()['generation'] == 1
+
+
+def test_least_recently_used_results_are_evicted():
+    cache = QueryCache(max_entries=2)
+    for key in ('a', 'b', 'a', 'c'):
+        cache.get(key, lambda: key.upper())
+    assert cache.get('a', lambda: 'recomputed') == 'A'
+    assert cache.get('b', lambda: 'recomputed') == 'recomputed'
+    assert cache.stats()['evictions'] == 2
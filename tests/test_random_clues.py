@@ -0,0 +1,86 @@
+"""Random clue sampling by id probing"""
+
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import load_game
+
+GAMES = [load_game(game_id) for game_id in range(9302, 9307)]
+# The archived games have no Final Jeopardy clue
+GAMES[0]['final_jeopardy'] = {'category': 'FINAL', 'value': 'Final', 'clue': 'A final clue', 'answer': 'an answer'}
+
+
+@pytest.fixture
+def loaded(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_games(GAMES)
+    return db
+
+
+def test_random_clue_skips_final_jeopardy(loaded):
+    rounds = {loaded.get_random_clue()['round'] for _ in range(200)}
+    assert rounds == {'Jeopardy', 'Double Jeopardy'}
+    assert 'Final Jeopardy' in {loaded.get_random_clue(exclude_final=False)['round'] for _ in range(2000)}
+
+
+def test_random_clue_by_date_stays_in_range(loaded):
+    air_date = GAMES[2]['air_date']
+    for _ in range(50):
+        clue = loaded.get_random_clue_by_date(air_date, air_date)
+        assert clue['air_date'] == air_date and clue['round'] != 'Final Jeopardy'
+
+    assert loaded.get_random_clue_by_date('1900-01-01', '1900-12-31') is None
+
+
+def test_clues_by_category_are_distinct_matches(loaded):
+    category = GAMES[0]['jeopardy_round'][0]['category']
+    matching = {
+        (game['game_id'], clue['clue'])
+        for game in GAMES
+        for clue in game['jeopardy_round'] + game['double_jeopardy_round']
+        if category.lower() in clue['category'].lower()
+    }
+
+    clues = loaded.get_clues_by_category(category, limit=100)
+    assert len(clues) == len({clue['id'] for clue in clues}) == len(matching)
+    assert {(clue['game_id'], clue['clue']) for clue in clues} == matching
+    assert len(loaded.get_clues_by_category(category, limit=2)) == 2
+
+
+def test_sampling_finds_a_lone_match_among_gaps(loaded):
+    # Leave one clue between large holes in the id range
+    keep = loaded.conn.execute("SELECT MAX(id) - 7 FROM clues").fetchone()[0]
+    loaded.conn.execute(
+        "DELETE FROM clues WHERE id NOT IN ((SELECT MIN(id) FROM clues), ?, (SELECT MAX(id) FROM clues))",
+        (keep,)
+    )
+    loaded.conn.commit()
+    category = loaded.conn.execute("SELECT category FROM clue_details WHERE id = ?", (keep,)).fetchone()[0]
+
+    assert [clue['id'] for clue in loaded.get_clues_by_category(category, limit=5)] == [keep]
+
+
+def test_random_clues_are_distinct_and_filtered(loaded):
+    show = GAMES[1]
+    clues = loaded.get_random_clues(20, round='Double Jeopardy', show_number=show['show_number'])
+    assert len(clues) == len({clue['id'] for clue in clues}) == 20
+    assert {(clue['round'], clue['show_number']) for clue in clues} == {('Double Jeopardy', show['show_number'])}
+
+    everything = loaded.get_random_clues(1000, show_number=show['show_number'])
+    assert len(everything) == len(show['jeopardy_round']) + len(show['double_jeopardy_round'])
+
+
+def test_iter_clues_streams_in_id_order_beside_other_queries(loaded):
+    total = loaded.get_stats()['total_clues']
+    seen = []
+    for clue in loaded.iter_clues(chunk_size=7):
+        seen.append(clue['id'])
+        if len(seen) == 10:
+            loaded.get_random_clue()  # the shared cursor is free while streaming
+    assert len(seen) == total and seen == sorted(seen)
+
+    final = list(loaded.iter_clues({'round': 'Final Jeopardy'}))
+    assert [clue['category'] for clue in final] == ['FINAL']
+    assert list(loaded.iter_clues({'exclude_final': True, 'round': 'Final Jeopardy'})) == []
@@ -0,0 +1,43 @@
+"""Clue/Game NamedTuple records and the tuple fast path"""
+
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import load_game
+from records import CLUE_FIELDS, GAME_FIELDS, Clue, Game
+
+GAMES = [load_game(game_id) for game_id in range(9302, 9307)]
+
+
+@pytest.fixture
+def loaded(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_games(GAMES)
+    return db
+
+
+@pytest.mark.parametrize('filters', [None, {'round': 'Double Jeopardy'}, {'category': 'WORDS'}])
+def test_clue_records_match_the_dictionaries(loaded, filters):
+    records = list(loaded.iter_clue_records(filters, chunk_size=7))
+    assert records and all(isinstance(record, Clue) for record in records)
+    assert [record._asdict() for record in records] == list(loaded.iter_clues(filters))
+    assert list(loaded.iter_clue_records(filters, raw=True)) == [tuple(record) for record in records]
+
+
+def test_game_records_match_the_games(loaded):
+    start, end = GAMES[1]['air_date'], GAMES[3]['air_date']
+    records = list(loaded.iter_game_records(start_date=start, end_date=end))
+    assert all(isinstance(record, Game) for record in records)
+
+    games = list(loaded.iter_games(start_date=start, end_date=end))
+    assert [record._asdict() for record in records] == [
+        {field: game[field] for field in GAME_FIELDS} for game in games
+    ]
+    assert list(loaded.iter_game_records(game_ids=[9303], raw=True)) == [tuple(records[0])]
+
+
+def test_sampled_clues_have_the_record_fields(loaded):
+    assert tuple(loaded.get_random_clue()) == CLUE_FIELDS
+    assert all(tuple(clue) == CLUE_FIELDS for clue in loaded.get_random_clues(5))
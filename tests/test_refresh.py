@@ -0,0 +1,127 @@
+"""Replacing a stored game when a refresh finds a changed page"""
+
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import load_game
+from database import JeopardyDatabase
+from fetcher import JArchiveFetcher
+from jarchive_scraper import ScrapedGame
+from run_scraper import _replace_game, scrape_game
+
+SHOW = 9425  # game 9302
+
+
+def store(db, game):
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(game)
+
+
+def replace(db, game):
+    with redirect_stdout(io.StringIO()):
+        return _replace_game(game['game_id'], ScrapedGame(game, {}), True, db, save_json=False)
+
+
+def test_refresh_replaces_the_game(db):
+    store(db, load_game(9302))
+    changed = load_game(9302)
+    changed['jeopardy_round'][0]['answer'] = 'Something New'
+
+    success, _ = replace(db, changed)
+
+    assert success
+    assert db.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 1
+    answers = [clue['answer'] for clue in db.get_clues_by_show_number(SHOW)]
+    assert 'Something New' in answers
+    assert len(answers) == 60
+
+
+def test_failed_refresh_keeps_the_stored_game(db):
+    store(db, load_game(9302))
+    before = db.get_clues_by_show_number(SHOW)
+
+    broken = load_game(9302)
+    broken['double_jeopardy_round'][-1]['clue'] = object()  # not bindable: the insert fails
+    with pytest.raises(Exception):
+        replace(db, broken)
+
+    assert db.get_clues_by_show_number(SHOW) == before
+
+
+def test_validators_are_kept_only_once_the_game_is_stored(db, jarchive, monkeypatch):
+    def refresh():
+        with redirect_stdout(io.StringIO()), JArchiveFetcher() as fetcher:
+            return scrape_game(7, db, save_json=False, base_url=jarchive.base_url, fetcher=fetcher, refresh=True)
+
+    game = load_game(9302)
+    game['game_id'] = 7
+    store(db, game)
+    db.save_page_validators(7, {'etag': '"old"'})
+
+    # The changed page downloads but can't be stored: its ETag must not be kept
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk full")
+    with monkeypatch.context() as patch:
+        patch.setattr(db, 'replace_game', fail)
+        success, message = refresh()
+    assert not success and 'disk full' in message
+    assert db.get_page_validators([7]) == {7: {'etag': '"old"'}}
+
+    # So the next refresh downloads it again, and only then is it current
+    success, _ = refresh()
+    assert success
+    new_etag = db.get_page_validators([7])[7]['etag']
+    assert new_etag != '"old"'
+
+    success, message = refresh()
+    assert not success and 'not modified' in message
+    assert [headers.get('If-None-Match') for _, _, headers in jarchive.requests] == ['"old"', '"old"', new_etag]
+
+
+def test_reviews_survive_a_refresh(db):
+    store(db, load_game(9302))
+    reviewed = db.conn.execute("""
+        SELECT id, round_id, board_row, board_column FROM clues
+        WHERE board_row IS NOT NULL ORDER BY id LIMIT 5
+    """).fetchall()
+    db.record_reviews('alice', [(row[0], 4) for row in reviewed])
+
+    success, _ = replace(db, load_game(9302))
+
+    assert success
+    positions = db.conn.execute("""
+        SELECT c.round_id, c.board_row, c.board_column FROM review_state rs
+        JOIN clues c ON c.id = rs.clue_id ORDER BY c.id
+    """).fetchall()
+    assert [tuple(row) for row in positions] == [tuple(row[1:]) for row in reviewed]
+    orphaned = db.conn.execute(
+        "SELECT COUNT(*) FROM review_log WHERE clue_id NOT IN (SELECT id FROM clues)"
+    ).fetchone()[0]
+    assert orphaned == 0
+
+
+def test_moving_review_history_uses_the_clue_index(db):
+    store(db, load_game(9302))
+    clue_ids = [row[0] for row in db.conn.execute("SELECT id FROM clues ORDER BY id LIMIT 3")]
+    db.record_reviews('alice', [(clue_id, 4) for clue_id in clue_ids])
+
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    replace(db, load_game(9302))
+    db.conn.set_trace_callback(None)
+
+    update = next(sql for sql in statements if 'UPDATE review_log' in sql)
+    plan = ' '.join(row[3] for row in db.conn.execute("EXPLAIN QUERY PLAN " + update))
+    assert 'USING INDEX idx_review_log_clue' in plan
+
+
+def test_older_databases_get_the_review_log_index(db):
+    db.conn.execute("DROP INDEX idx_review_log_clue")
+    db.conn.commit()
+    with redirect_stdout(io.StringIO()):
+        reopened = JeopardyDatabase(db.db_path)
+    with reopened:
+        names = {row[0] for row in reopened.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'idx_review_log_clue' in names
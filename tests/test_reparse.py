@@ -0,0 +1,65 @@
+"""Rebuilding games from the raw page archive"""
+
+import io
+from contextlib import redirect_stdout
+
+from conftest import show_page
+from database import JeopardyDatabase
+from game_parser import parse_game_html
+from html_archive import HtmlArchive
+from run_scraper import reparse_archive, scrape_games_batch
+
+NO_GAME_PAGE = b"<html><head><title>J! Archive</title></head><body><p>ERROR: No game 5 in database.</p></body></html>"
+
+
+def test_archive_keeps_the_latest_copy_of_each_page(tmp_path):
+    path = tmp_path / 'pages.pack'
+    with HtmlArchive(path) as archive:
+        assert archive.add(1, show_page(1))
+        assert archive.add(2, show_page(2))
+        size = path.stat().st_size
+        assert not archive.add(1, show_page(1))  # identical re-download
+        assert path.stat().st_size == size
+        assert archive.add(1, show_page(3))
+
+    with HtmlArchive(path) as archive:
+        assert archive.game_ids() == [1, 2]
+        assert archive.get(1) == show_page(3)
+        assert archive.get(2) == show_page(2)
+        assert archive.get(4) is None
+
+
+def test_scraped_pages_can_be_reparsed(jarchive, tmp_path):
+    db_path, archive_path = tmp_path / 'jeopardy.db', tmp_path / 'pages.pack'
+    with redirect_stdout(io.StringIO()):
+        scrape_games_batch(
+            [1, 2], delay=0, save_json=False, db_path=str(db_path), base_url=jarchive.base_url,
+            archive_path=str(archive_path)
+        )
+        with JeopardyDatabase(db_path) as db:
+            db.delete_game(1)
+        stats = reparse_archive(workers=1, db_path=str(db_path), archive_path=str(archive_path))
+
+    assert stats == {'total': 2, 'success': 2, 'failed': 0, 'skipped': 0, 'empty': 0}
+    assert len(jarchive.requests) == 2
+    with JeopardyDatabase(db_path) as db:
+        assert len(db.get_clues_by_show_number(1)) == len(db.get_clues_by_show_number(2)) == 59
+
+
+def test_reparse_skips_empty_pages(db, tmp_path):
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(parse_game_html(show_page(5), 5))
+    stored = db.get_clues_by_show_number(5)
+
+    archive_path = tmp_path / 'pages.pack'
+    with HtmlArchive(archive_path) as archive:
+        archive.add(5, NO_GAME_PAGE)
+        archive.add(6, show_page(6))
+
+    with redirect_stdout(io.StringIO()):
+        stats = reparse_archive(workers=1, db_path=str(db.db_path), archive_path=str(archive_path))
+
+    assert stats == {'total': 2, 'success': 1, 'failed': 0, 'skipped': 0, 'empty': 1}
+    assert db.get_clues_by_show_number(5) == stored
+    assert len(db.get_clues_by_show_number(6)) == 59
+
@@ -0,0 +1,64 @@
+"""SM-2 scheduling and the per-user due queue"""
+
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import load_game
+from scheduler import DAY, MIN_EASE, sm2
+
+T0 = 1_700_000_000
+
+
+def test_sm2_intervals_grow_and_reset_on_a_miss():
+    state = None
+    intervals = []
+    for grade in (5, 5, 5, 2, 4):
+        state = sm2(state, grade, T0)
+        intervals.append(state.interval)
+
+    assert intervals[:3] == [1.0, 6.0, round(6.0 * sm2(sm2(None, 5, T0), 5, T0).ease, 2)]
+    assert intervals[3:] == [1.0, 1.0]
+    assert (state.repetitions, state.lapses) == (1, 1)
+    assert state.due == T0 + DAY
+
+
+def test_ease_never_drops_below_the_floor():
+    state = None
+    for _ in range(10):
+        state = sm2(state, 0, T0)
+    assert state.ease == MIN_EASE
+    with pytest.raises(ValueError):
+        sm2(None, 6, T0)
+
+
+@pytest.fixture
+def clue_ids(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(load_game(9302))
+    return [row[0] for row in db.conn.execute("SELECT id FROM clues ORDER BY id")]
+
+
+def test_due_cards_come_most_overdue_first_then_new_ones(db, clue_ids):
+    # Answered one, two and three days ago, so due again since 0-2 days;
+    # the fourth was answered just now and is due tomorrow
+    db.record_reviews('alice', [(clue_id, 4, T0 - days * DAY) for days, clue_id in enumerate(clue_ids[:3], 1)])
+    db.record_reviews('alice', [(clue_ids[3], 4, T0)])
+
+    cards = db.next_due_clues('alice', n=5, now=T0)
+    assert [card['id'] for card in cards[:3]] == [clue_ids[2], clue_ids[1], clue_ids[0]]
+    assert [card['review'] is None for card in cards] == [False, False, False, True, True]
+    assert not {card['id'] for card in cards[3:]} & set(clue_ids[:4])
+
+    assert [card['id'] for card in db.next_due_clues('alice', n=5, now=T0, include_new=False)] == clue_ids[2::-1]
+    assert all(card['review'] is None for card in db.next_due_clues('bob', n=3, now=T0))
+
+
+def test_a_bad_batch_is_rolled_back(db, clue_ids):
+    with pytest.raises(ValueError):
+        db.record_reviews('alice', [(clue_ids[0], 5), (10 ** 9, 5)])
+    assert db.conn.execute("SELECT COUNT(*) FROM review_log").fetchone()[0] == 0
+
+    assert db.record_reviews('alice', [(clue_ids[0], 5), (clue_ids[0], 5)]) == 2
+    assert db.conn.execute("SELECT repetitions FROM review_state").fetchone()[0] == 2
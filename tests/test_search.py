@@ -0,0 +1,56 @@
+"""Full-text search over categories, clues and answers"""
+
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import load_game
+
+GAMES = [load_game(game_id) for game_id in range(9302, 9307)]
+
+
+@pytest.fixture
+def loaded(db):
+    if not db.has_search:
+        pytest.skip("SQLite without FTS5")
+    with redirect_stdout(io.StringIO()):
+        db.insert_games(GAMES)
+    return db
+
+
+def test_search_ranks_and_highlights_matches(loaded):
+    results = loaded.search_clues('bugliosi')
+    assert [clue['answer'] for clue in results] == ['Helter Skelter']
+    assert '<mark>Bugliosi</mark>' in results[0]['snippet']
+
+    assert {clue['answer'] for clue in loaded.search_clues('kilt', fields=['answer'])} == {'a kilt'}
+    assert loaded.search_clues('kilt', fields=['category']) == []
+    assert 'Helter Skelter' in {clue['answer'] for clue in loaded.search_clues('buglio*')}
+
+
+def test_search_filters_by_round_and_date(loaded):
+    show = GAMES[0]
+    results = loaded.search_clues('the', limit=500, round='Jeopardy', date_range=(show['air_date'], show['air_date']))
+    assert results
+    assert {(clue['round'], clue['air_date']) for clue in results} == {('Jeopardy', show['air_date'])}
+
+
+@pytest.mark.parametrize('query', ['"', 'kilt OR', 'NEAR(', 'answer:kilt', '*', '-'])
+def test_search_input_is_not_fts_syntax(loaded, query):
+    loaded.search_clues(query)
+
+
+def test_index_follows_replacements_and_bulk_loads(loaded):
+    game = load_game(9302)
+    game['jeopardy_round'][0]['answer'] = 'Zyzzyva'
+    with redirect_stdout(io.StringIO()):
+        loaded.replace_game(game)
+    assert loaded.search_clues('bugliosi')[0]['answer'] == 'Zyzzyva'
+
+    loaded.delete_game(9302)
+    assert loaded.search_clues('bugliosi') == []
+
+    with redirect_stdout(io.StringIO()):
+        loaded.insert_games([load_game(9302)], rebuild_indexes=True)
+    assert loaded.search_clues('bugliosi')[0]['answer'] == 'Helter Skelter'
@@ -0,0 +1,59 @@
+"""Read-only serving snapshots and their atomic swap"""
+
+import io
+import sqlite3
+from contextlib import redirect_stdout
+
+import pytest
+
+from conftest import load_game
+from database import SNAPSHOT_PAGE_SIZE, JeopardyDatabase
+from db_pool import DatabasePool
+
+
+@pytest.fixture
+def loaded(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_games([load_game(9302), load_game(9303)])
+    return db
+
+
+def test_snapshot_serves_the_same_data(loaded, tmp_path):
+    path = loaded.snapshot(tmp_path / 'serving.db')
+    assert not path.with_name(path.name + '.tmp').exists()
+
+    with JeopardyDatabase(path, immutable=True) as snapshot:
+        assert snapshot.read_only
+        assert snapshot.get_stats() == loaded.get_stats()
+        assert list(snapshot.iter_clues()) == list(loaded.iter_clues())
+        assert snapshot.conn.execute("PRAGMA page_size").fetchone()[0] == SNAPSHOT_PAGE_SIZE
+        assert snapshot.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+        with pytest.raises(sqlite3.OperationalError):
+            snapshot.conn.execute("DELETE FROM clues")
+
+
+def test_snapshot_refuses_to_replace_its_source(loaded, tmp_path):
+    with pytest.raises(ValueError):
+        loaded.snapshot(loaded.db_path)
+    with JeopardyDatabase(loaded.db_path, read_only=True) as reader, pytest.raises(RuntimeError):
+        reader.snapshot(tmp_path / 'serving.db')
+
+
+def test_pool_readers_pick_up_a_published_snapshot(tmp_path):
+    with redirect_stdout(io.StringIO()):
+        pool = DatabasePool(tmp_path / 'jeopardy.db', snapshot=tmp_path / 'serving.db')
+    try:
+        reader = pool.reader()
+        assert reader.immutable
+        assert reader.get_random_clue() is None
+
+        with pool.writer() as db, redirect_stdout(io.StringIO()):
+            db.insert_game(load_game(9302))
+        # Still the old snapshot until a new one is published
+        assert pool.reader().get_random_clue() is None
+
+        pool.publish_snapshot()
+        assert pool.reader() is not reader
+        assert pool.reader().get_random_clue()['game_id'] == 9302
+    finally:
+        pool.close()
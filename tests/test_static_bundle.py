@@ -0,0 +1,74 @@
+"""Sharded, content-hashed flashcard bundle"""
+
+import gzip
+import io
+import json
+from contextlib import redirect_stdout
+
+from conftest import ROOT, load_game
+from static_bundle import MANIFEST_NAME, category_slug, flashcards_from_database, load_flashcard_data, write_bundle
+
+DATA = {
+    'metadata': {'title': 'Test'},
+    'categories': [
+        {'name': 'U.S. History', 'flashcards': [{'question': 'First president?', 'answer': 'Washington'}]},
+        {'name': 'Opera', 'flashcards': [{'question': 'Verdi opera set in Egypt?', 'answer': 'Aida'}]},
+    ],
+}
+
+
+def chunk_files(out_dir):
+    return sorted(path.name for path in out_dir.iterdir() if path.name != MANIFEST_NAME)
+
+
+def test_only_changed_categories_are_rewritten(tmp_path):
+    out_dir = tmp_path / 'flashcards'
+    stats = write_bundle(DATA, out_dir)
+    assert (stats['written'], stats['manifest_changed']) == (2, True)
+
+    manifest = json.loads((out_dir / MANIFEST_NAME).read_text())
+    assert manifest['metadata']['totalCards'] == 2
+    entry = manifest['categories'][0]
+    assert entry['file'].startswith('u-s-history.')
+    chunk = (out_dir / entry['file']).read_bytes()
+    assert gzip.decompress((out_dir / (entry['file'] + '.gz')).read_bytes()) == chunk
+    assert json.loads(chunk)['flashcards'] == DATA['categories'][0]['flashcards']
+
+    before = chunk_files(out_dir)
+    assert write_bundle(DATA, out_dir) == {'written': 0, 'unchanged': 2, 'removed': 0, 'manifest_changed': False}
+    assert chunk_files(out_dir) == before
+
+    changed = json.loads(json.dumps(DATA))
+    changed['categories'][1]['flashcards'][0]['answer'] = 'Aïda'
+    stats = write_bundle(changed, out_dir)
+    assert (stats['written'], stats['unchanged'], stats['manifest_changed']) == (1, 1, True)
+    assert stats['removed'] == len([name for name in before if name.startswith('opera.')])
+    assert [name for name in chunk_files(out_dir) if name.startswith('u-s-history.')] == \
+        [name for name in before if name.startswith('u-s-history.')]
+
+
+def test_category_slugs_are_file_name_safe():
+    assert category_slug('U.S. History') == 'u-s-history'
+    assert category_slug('"B" IN BIOLOGY') == 'b-in-biology'
+    assert category_slug('???') == 'category'
+
+
+def test_cards_from_the_database_keep_exact_categories(db):
+    game = load_game(9302)
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(game)
+    name = game['jeopardy_round'][0]['category']
+
+    data = flashcards_from_database(db, [name, 'NO SUCH CATEGORY'])
+    assert [category['name'] for category in data['categories']] == [name]
+    expected = [clue for clue in game['jeopardy_round'] + game['double_jeopardy_round'] if clue['category'] == name]
+    assert [card['answer'] for card in data['categories'][0]['flashcards']] == [clue['answer'] for clue in expected]
+
+
+def test_bundle_in_the_repo_matches_flashcards_data(tmp_path):
+    data = load_flashcard_data(ROOT / 'docs' / 'static' / 'flashcards-data.js')
+    write_bundle(data, tmp_path)
+    committed = json.loads((ROOT / 'docs' / 'static' / 'flashcards' / MANIFEST_NAME).read_text())
+    generated = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    # Encodings depend on whether brotli is installed; the chunk names don't
+    assert [entry['file'] for entry in generated['categories']] == [entry['file'] for entry in committed['categories']]
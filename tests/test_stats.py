@@ -0,0 +1,78 @@
+"""Trigger-maintained statistics tables"""
+
+import io
+from contextlib import redirect_stdout
+
+from conftest import load_game
+from database import STATS_TRIGGERS, JeopardyDatabase
+
+GAMES = [load_game(game_id) for game_id in range(9302, 9307)]
+
+
+def recount(db):
+    clues = [row[0] for row in db.conn.execute("SELECT category_id FROM clues")]
+    return {
+        'total_games': db.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0],
+        'total_clues': len(clues),
+        'unique_categories': len(set(clues)),
+    }
+
+
+def test_cached_stats_follow_every_write(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_game(GAMES[0])
+        db.insert_games(GAMES[1:3])
+        db.insert_games(GAMES[3:], rebuild_indexes=True)
+
+        changed = load_game(9303)
+        changed['jeopardy_round'] = changed['jeopardy_round'][:3]
+        db.replace_game(changed)
+        db.delete_game(9304)
+    db.conn.execute("INSERT INTO categories (name) VALUES ('RENAMED')")
+    db.conn.execute("""
+        UPDATE clues SET category_id = (SELECT category_id FROM categories WHERE name = 'RENAMED')
+        WHERE id = (SELECT MIN(id) FROM clues)
+    """)
+    db.conn.commit()
+
+    stats = db.get_stats()
+    assert {name: stats[name] for name in recount(db)} == recount(db)
+    assert db.check_stats() == {}
+    assert stats['date_range'] == {
+        'min': min(game['air_date'] for game in GAMES if game['game_id'] != 9304),
+        'max': max(game['air_date'] for game in GAMES if game['game_id'] != 9304),
+    }
+
+    counts = db.get_category_counts()
+    assert sum(row['clue_count'] for row in counts) == stats['total_clues']
+    assert {'category': 'RENAMED', 'clue_count': 1} in counts
+    assert db.get_category_counts(limit=2) == counts[:2]
+
+
+def test_check_and_rebuild_repair_a_drifted_cache(db):
+    with redirect_stdout(io.StringIO()):
+        db.insert_games(GAMES)
+    db.conn.execute("UPDATE stats SET value = value + 1 WHERE name = 'total_clues'")
+    db.conn.execute("UPDATE category_counts SET clue_count = 0 WHERE rowid = 1")
+    db.conn.commit()
+
+    mismatches = db.check_stats()
+    assert set(mismatches) == {'total_clues', 'categories'}
+    db.rebuild_stats()
+    assert db.check_stats() == {}
+
+
+def test_read_only_handle_counts_without_the_cache(tmp_path):
+    path = tmp_path / 'jeopardy.db'
+    with redirect_stdout(io.StringIO()), JeopardyDatabase(path) as db:
+        db.insert_games(GAMES)
+        expected = recount(db)
+        # As in a database written before the statistics tables existed
+        for name in STATS_TRIGGERS:
+            db.conn.execute(f"DROP TRIGGER {name}")
+        db.conn.execute("DROP TABLE stats")
+        db.conn.commit()
+
+    with JeopardyDatabase(path, read_only=True) as db:
+        stats = db.get_stats()
+    assert {name: stats[name] for name in expected} == expected
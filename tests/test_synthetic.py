@@ -0,0 +1,40 @@
+"""The benchmark suite's synthetic corpus"""
+
+import io
+from contextlib import redirect_stdout
+
+import pytest
+
+from benchmarks.suite import compare
+from benchmarks.synthetic import SyntheticCorpus, build_database, game_count
+from game_parser import PARSER_BACKENDS, parse_game_html
+
+
+def test_same_seed_gives_the_same_corpus():
+    assert SyntheticCorpus(3).game(7) == SyntheticCorpus(3).game(7)
+    assert SyntheticCorpus(3).page(7) == SyntheticCorpus(3).page(7)
+    assert SyntheticCorpus(3).game(7) != SyntheticCorpus(4).game(7)
+
+
+@pytest.mark.parametrize('backend', PARSER_BACKENDS)
+def test_pages_parse_back_to_their_games(backend):
+    corpus = SyntheticCorpus()
+    for game_id in range(1, 6):
+        game = corpus.game(game_id)
+        assert parse_game_html(corpus.page(game_id).encode('utf-8'), game_id, game['url'], backend) == game
+
+
+def test_database_holds_about_the_requested_clues(tmp_path):
+    with redirect_stdout(io.StringIO()):
+        db = build_database(tmp_path / 'synthetic.db', 1000)
+    with db:
+        stats = db.get_stats()
+    assert stats['total_games'] == game_count(1000)
+    assert 900 <= stats['total_clues'] <= 1100
+
+
+def test_compare_flags_slower_medians():
+    previous = {'meta': {'timestamp': 'then'}, 'results': {'a': {'median_ms': 1.0}, 'b': {'median_ms': 1.0}}}
+    current = {'results': {'a': {'median_ms': 1.5}, 'b': {'median_ms': 1.1}, 'c': {'median_ms': 9.0}}}
+    with redirect_stdout(io.StringIO()):
+        assert compare(current, previous, threshold=0.2) == ['a']
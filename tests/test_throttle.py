@@ -0,0 +1,189 @@
+"""Retry-After handling, retries, the circuit breaker and the adaptive rate"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+import throttle
+from benchmarks.fetch_resilience import FakeJArchive
+from fetcher import JArchiveFetcher
+from throttle import AdaptiveRateLimiter, CircuitBreaker, parse_retry_after
+
+
+class FakeClock:
+    """Stands in for the time module inside throttle; sleeping advances it"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(throttle, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def fake_server():
+    servers = []
+
+    def start(behaviour):
+        server = FakeJArchive(behaviour)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def test_parse_retry_after_seconds_and_dates():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after(' 1.5 ') == 1.5
+    assert parse_retry_after('-3') == 0.0
+
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 28 <= parse_retry_after(later) <= 30
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert parse_retry_after(earlier) == 0.0
+
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('soon') is None
+
+
+def test_fetcher_waits_out_retry_after(fake_server):
+    fake = fake_server(lambda i, t: (429, 0.0, 1) if i == 0 else (200, 0.0, None))
+    with JArchiveFetcher(timeout=(2.0, 5.0), max_retries=2, retry_base=0.01) as fetcher:
+        start = time.monotonic()
+        assert fetcher.fetch(f"{fake.base_url}/showgame.php?game_id=1").content
+        elapsed = time.monotonic() - start
+
+    assert elapsed >= 1.0
+    assert fake.requests == 2
+    assert fake.early_requests == 0
+
+
+def test_fetcher_retries_5xx_then_returns_the_last_answer(fake_server):
+    fake = fake_server(lambda i, t: (503 if i < 3 else 502, 0.0, None))
+    with JArchiveFetcher(timeout=(2.0, 5.0), max_retries=3, retry_base=0.01) as fetcher:
+        with pytest.raises(requests.HTTPError) as error:
+            fetcher.fetch(f"{fake.base_url}/showgame.php?game_id=1")
+
+    assert error.value.response.status_code == 502
+    assert fake.requests == 4
+
+
+def test_circuit_breaker_opens_and_doubles_its_cooldown(clock):
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=10.0, max_cooldown=25.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.is_open
+    assert breaker.wait() == 0.0
+
+    breaker.record_failure()
+    assert breaker.is_open
+    assert breaker.wait() == 10.0
+    assert not breaker.is_open
+
+    # The trial request fails: each reopening waits twice as long, up to the cap
+    breaker.record_failure()
+    assert breaker.wait() == 20.0
+    breaker.record_failure()
+    assert breaker.wait() == 25.0
+
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.is_open
+
+
+def test_half_open_breaker_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0.2, max_cooldown=1.0)
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    events = []
+    lock = threading.Lock()
+
+    def request():
+        breaker.wait()
+        with lock:
+            events.append(('pass', time.monotonic()))
+            trial = sum(1 for kind, _ in events if kind == 'pass')
+        if trial > 2:
+            return
+        # The first trial fails and the breaker reopens; the second one succeeds
+        time.sleep(0.1)
+        with lock:
+            if trial == 1:
+                events.append(('fail', time.monotonic()))
+                breaker.record_failure()
+            else:
+                events.append(('success', time.monotonic()))
+                breaker.record_success()
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    kinds = [kind for kind, _ in events]
+    assert kinds == ['pass', 'fail', 'pass', 'success'] + ['pass'] * 4
+    times = dict(zip(['first', 'fail', 'second', 'success'], [at for _, at in events[:4]]))
+    # The reopened breaker waits out the doubled cooldown before the next trial
+    assert times['second'] - times['fail'] >= 0.35
+    assert breaker.state == 'closed'
+
+
+def test_adaptive_rate_backs_off_and_recovers(clock):
+    limiter = AdaptiveRateLimiter(rate=4.0, min_rate=0.5, max_rate=4.0, increase=0.5, backoff=0.5)
+
+    limiter.record_throttled()
+    assert limiter.rate == 2.0
+    # A burst of errors within a second counts once
+    limiter.record_throttled()
+    assert limiter.rate == 2.0
+
+    clock.sleep(1.0)
+    limiter.record_throttled()
+    assert limiter.rate == 1.0
+    clock.sleep(1.0)
+    limiter.record_throttled()
+    clock.sleep(1.0)
+    limiter.record_throttled()
+    assert limiter.rate == 0.5
+
+    for _ in range(4):
+        limiter.record_success(0.1)
+    assert limiter.rate == 2.5
+    for _ in range(10):
+        limiter.record_success(0.1)
+    assert limiter.rate == 4.0
+
+    # A latency spike backs off without any error
+    clock.sleep(1.0)
+    limiter.record_success(1.0)
+    assert limiter.rate == 2.0
+
+
+def test_adaptive_rate_pauses_for_retry_after(clock):
+    limiter = AdaptiveRateLimiter(rate=1.0, min_rate=0.5, max_rate=4.0)
+    limiter.acquire()
+    limiter.record_throttled(retry_after=5.0)
+
+    start = clock.now
+    limiter.acquire()
+    assert clock.now - start >= 5.0